@@ -1,4 +1,126 @@
 import re
+from functools import lru_cache
+
+import safe_regex
+from deadline import check_deadline
+
+# 🌍 COMPREHENSIVE LANGUAGE MAPPING
+LANGUAGES = {
+    '.py': 'Python', '.js': 'JavaScript', '.java': 'Java', '.cpp': 'C++', '.c': 'C',
+    '.cs': 'C#', '.php': 'PHP', '.rb': 'Ruby', '.go': 'Go', '.rs': 'Rust',
+    '.kt': 'Kotlin', '.swift': 'Swift', '.ts': 'TypeScript', '.scala': 'Scala',
+    '.dart': 'Dart', '.r': 'R', '.m': 'Objective-C', '.pl': 'Perl', '.sh': 'Shell',
+    '.sql': 'SQL', '.html': 'HTML', '.css': 'CSS', '.jsx': 'React JSX', '.vue': 'Vue.js'
+}
+
+# Longest parameter list the function patterns scan for the closing ')' (keeps unclosed '(' linear)
+MAX_PARAMS = r'{0,1000}'
+
+# 🏗️ CLASS DETECTION (Language-specific patterns, compiled once)
+# Type lists are written as words separated by whitespace instead of [\w,\s]+ followed by \s*,
+# which matches the same text without the ambiguous backtracking
+CLASS_PATTERNS = {
+    '.java': [r'(?:public\s+|private\s+|protected\s+)?class\s+(\w+)(?:\s+extends\s+\w+)?(?:\s+implements\s+[\w,]+(?:\s+[\w,]+)*)?\s*{'],
+    '.py': [r'class\s+(\w+)(?:\([^)]*\))?\s*:'],
+    '.cpp': [r'class\s+(\w+)(?:\s*:\s*(?:public|private|protected)\s+\w+)?\s*{', r'struct\s+(\w+)\s*{'],
+    '.c': [r'struct\s+(\w+)\s*{', r'typedef\s+struct\s*{[^}]*}\s*(\w+)'],
+    '.cs': [r'(?:public\s+|private\s+|internal\s+)?(?:abstract\s+|sealed\s+)?class\s+(\w+)(?:\s*:\s*\w+)?\s*{'],
+    '.js': [r'class\s+(\w+)(?:\s+extends\s+\w+)?\s*{'],
+    '.ts': [r'(?:export\s+)?(?:abstract\s+)?class\s+(\w+)(?:<[^>]*>)?(?:\s+extends\s+\w+)?(?:\s+implements\s+[\w,]+(?:\s+[\w,]+)*)?\s*{']
+}
+
+# 🔧 FUNCTION DETECTION (Language-specific patterns, compiled once)
+# Patterns that open with an identifier start at a word boundary, so a long word isn't rescanned from every letter
+FUNCTION_PATTERNS = {
+    '.java': [
+        r'\b(?:public\s+|private\s+|protected\s+)?(?:static\s+)?(?:final\s+)?(\w+)\s+(\w+)\s*\([^)]' + MAX_PARAMS + r'\)\s*(?:throws\s+[\w,]+(?:\s+[\w,]+)*)?\s*{',
+        r'\b(?:public\s+|private\s+|protected\s+)?(?:static\s+)?(void)\s+(\w+)\s*\([^)]' + MAX_PARAMS + r'\)\s*(?:throws\s+[\w,]+(?:\s+[\w,]+)*)?\s*{'
+    ],
+    '.py': [r'def\s+(\w+)\s*\([^)]' + MAX_PARAMS + r'\)\s*(?:->\s*[\w\[\],]+(?:\s+[\w\[\],]+)*)?\s*:'],
+    '.cpp': [r'\b(?:inline\s+)?(?:virtual\s+)?(?:static\s+)?(\w+(?:\s*\*)?)\s+(\w+)\s*\([^)]' + MAX_PARAMS + r'\)\s*(?:const\s*)?{'],
+    '.c': [r'\b(\w+(?:\s*\*)?)\s+(\w+)\s*\([^)]' + MAX_PARAMS + r'\)\s*{'],
+    '.cs': [r'\b(?:public\s+|private\s+|protected\s+|internal\s+)?(?:static\s+)?(?:virtual\s+|override\s+)?(\w+)\s+(\w+)\s*\([^)]' + MAX_PARAMS + r'\)\s*{'],
+    '.js': [r'function\s+(\w+)\s*\([^)]' + MAX_PARAMS + r'\)\s*{', r'(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?\([^)]' + MAX_PARAMS + r'\)\s*=>\s*{?', r'\b(\w+)\s*:\s*(?:async\s+)?function\s*\([^)]' + MAX_PARAMS + r'\)\s*{'],
+    '.ts': [r'(?:export\s+)?(?:async\s+)?function\s+(\w+)(?:<[^>]*>)?\s*\([^)]' + MAX_PARAMS + r'\)\s*(?::\s*[\w\[\]<>,|]+(?:\s+[\w\[\]<>,|]+)*)?\s*{']
+}
+
+CLASS_PATTERNS = {ext: [safe_regex.compile(p, re.IGNORECASE | re.MULTILINE) for p in patterns] for ext, patterns in CLASS_PATTERNS.items()}
+FUNCTION_PATTERNS = {ext: [safe_regex.compile(p, re.IGNORECASE | re.MULTILINE) for p in patterns] for ext, patterns in FUNCTION_PATTERNS.items()}
+
+CLASS_COUNT_PATTERN = re.compile(r'class\s+\w+', re.IGNORECASE)
+
+# Number of a 'for' loop's first bound: the first digits after 'for' on the same line
+LOOP_COUNT_PATTERN = safe_regex.compile(r'for[^\d\n]*(\d+)')
+
+# 🔤 SOURCE TOKENIZERS (comments skipped, string literals indexed separately)
+HASH_COMMENT_EXTENSIONS = {'.py', '.rb', '.sh', '.pl', '.r'}
+
+C_STYLE_TOKENS = re.compile(r"""
+    (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`)
+  | (?P<word>[A-Za-z_$][\w$]*)
+  | (?P<number>\d[\w.]*)
+  | (?P<symbol>->|=>|@|\[)
+""", re.VERBOSE | re.DOTALL)
+
+HASH_COMMENT_TOKENS = re.compile(r"""
+    (?P<comment>\#[^\n]*)
+  | (?P<string>[rRbBuUfF]{0,2}(?:\"\"\".*?(?:\"\"\"|\Z)|'''.*?(?:'''|\Z)|"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'))
+  | (?P<word>[A-Za-z_$][\w$]*)
+  | (?P<number>\d[\w.]*)
+  | (?P<symbol>->|=>|@|\[)
+""", re.VERBOSE | re.DOTALL)
+
+SUBWORD_PATTERN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+LITERAL_WORD_PATTERN = re.compile(r'[a-z]+')
+
+
+def identifier_terms(identifier: str) -> set:
+    """An identifier plus every run of its camelCase/snake_case parts ('bubbleSortArray' -> 'bubblesort', 'sort', ...)"""
+    terms = {identifier.lower()}
+    parts = [part.lower() for part in SUBWORD_PATTERN.findall(identifier)][:8]
+    for start in range(len(parts)):
+        for end in range(start + 1, len(parts) + 1):
+            terms.add(''.join(parts[start:end]))
+    return terms
+
+
+class SourceIndex:
+    """
+    Identifier and keyword index built by tokenizing the source once
+    Detectors query it in O(1); comments never match and 'for' no longer
+    matches inside 'format'. Words inside string literals are kept apart
+    for checks about what the program prints or queries.
+    """
+
+    def __init__(self, code: str, file_extension: str):
+        tokenizer = HASH_COMMENT_TOKENS if file_extension in HASH_COMMENT_EXTENSIONS else C_STYLE_TOKENS
+        identifiers = set()
+        self.literal_words = set()
+        self.symbols = set()
+        for match in tokenizer.finditer(code):
+            kind = match.lastgroup
+            if kind == 'word':
+                identifiers.add(match.group())
+            elif kind == 'string':
+                self.literal_words.update(LITERAL_WORD_PATTERN.findall(match.group().lower()))
+            elif kind == 'symbol':
+                self.symbols.add(match.group())
+
+        self.words = set()
+        for identifier in identifiers:
+            self.words.update(identifier_terms(identifier))
+
+    def has(self, *words) -> bool:
+        """True if any of the words appears in code (identifiers and keywords)"""
+        return any(word in self.words for word in words)
+
+    def mentions(self, *words) -> bool:
+        """True if any of the words appears in code or inside a string literal"""
+        return any(word in self.words or word in self.literal_words for word in words)
+
+    def has_symbol(self, *symbols) -> bool:
+        return any(symbol in self.symbols for symbol in symbols)
 
 def analyze_code_advanced_universal(code: str, file_extension: str) -> str:
     """
@@ -7,28 +129,21 @@ def analyze_code_advanced_universal(code: str, file_extension: str) -> str:
     Supports: Java, Python, JavaScript, C++, C, C#, PHP, Ruby, Go, Rust, TypeScript, etc.
     """
     
-    # 🌍 COMPREHENSIVE LANGUAGE MAPPING
-    languages = {
-        '.py': 'Python', '.js': 'JavaScript', '.java': 'Java', '.cpp': 'C++', '.c': 'C',
-        '.cs': 'C#', '.php': 'PHP', '.rb': 'Ruby', '.go': 'Go', '.rs': 'Rust',
-        '.kt': 'Kotlin', '.swift': 'Swift', '.ts': 'TypeScript', '.scala': 'Scala',
-        '.dart': 'Dart', '.r': 'R', '.m': 'Objective-C', '.pl': 'Perl', '.sh': 'Shell',
-        '.sql': 'SQL', '.html': 'HTML', '.css': 'CSS', '.jsx': 'React JSX', '.vue': 'Vue.js'
-    }
-    
-    language = languages.get(file_extension, 'Programming')
-    code_lower = code.lower()
+    language = LANGUAGES.get(file_extension, 'Programming')
+    # Tokenize the source once and share the index with every detector
+    index = SourceIndex(code, file_extension)
     lines = [l.strip() for l in code.split('\n') if l.strip()]
     
     explanation = []
     
     # 🧠 STEP 1: INTELLIGENT PROGRAM TYPE DETECTION
-    program_type = detect_program_type(code, code_lower, language)
+    program_type = detect_program_type(code, index, language)
     
     explanation.append(f"🎯 WHAT THIS CODE DOES:")
     explanation.append(program_type['description'])
     
     # 🔍 STEP 2: SYNTAX-AWARE ANALYSIS
+    check_deadline()
     syntax_analysis = analyze_syntax_patterns(code, file_extension, language)
     
     if syntax_analysis['classes']:
@@ -42,21 +157,22 @@ def analyze_code_advanced_universal(code: str, file_extension: str) -> str:
             explanation.append(f"{i}. {func_info}")
     
     # 🎓 STEP 3: CONCEPT EXPLANATION
-    concepts = detect_programming_concepts(code, code_lower, language)
+    check_deadline()
+    concepts = detect_programming_concepts(code, index, language)
     if concepts:
         explanation.append(f"\n💡 KEY PROGRAMMING CONCEPTS:")
         for concept in concepts:
             explanation.append(f"• {concept}")
     
     # 📊 STEP 4: ALGORITHM ANALYSIS
-    algorithms = detect_algorithms(code, code_lower)
+    algorithms = detect_algorithms(code, index)
     if algorithms:
         explanation.append(f"\n⚡ ALGORITHMS IMPLEMENTED:")
         for algo in algorithms:
             explanation.append(f"• {algo}")
     
     # 🎯 STEP 5: LANGUAGE-SPECIFIC FEATURES
-    lang_features = analyze_language_features(code, file_extension, language)
+    lang_features = analyze_language_features(code, file_extension, language, index)
     if lang_features:
         explanation.append(f"\n🌟 {language.upper()} SPECIFIC FEATURES:")
         for feature in lang_features:
@@ -92,16 +208,33 @@ def analyze_code_advanced_universal(code: str, file_extension: str) -> str:
     return final_text
 
 
-def detect_program_type(code: str, code_lower: str, language: str) -> dict:
+def loop_count(code: str):
+    """
+    Digits after the first 'for' that has digits later on its line, like re.search(r'for.*?(\d+)')
+    Only the first 'for' of each line is tried: if it has no digits after it, no later one on
+    that line has either. So each line is scanned once, even one full of 'for's.
+    """
+    position = code.find('for')
+    while position >= 0:
+        match = LOOP_COUNT_PATTERN.match(code, position)
+        if match:
+            return match.group(1)
+        line_end = code.find('\n', position)
+        if line_end < 0:
+            return None
+        position = code.find('for', line_end)
+    return None
+
+
+def detect_program_type(code: str, index: SourceIndex, language: str) -> dict:
     """Intelligently detects what type of program this is"""
     
     # 🎯 SPECIFIC PROGRAM PATTERNS
     
-    # Hello World Detection
-    if 'hello' in code_lower and 'world' in code_lower:
-        loop_match = re.search(r'for.*?(\d+)', code)
-        if loop_match:
-            times = loop_match.group(1)
+    # Hello World Detection (the greeting usually lives in a string literal)
+    if index.mentions('hello') and index.mentions('world'):
+        times = loop_count(code)
+        if times:
             return {
                 'type': 'hello_world_loop',
                 'description': f"This is a {language} program that prints 'Hello World' {times} times using a loop."
@@ -112,17 +245,17 @@ def detect_program_type(code: str, code_lower: str, language: str) -> dict:
         }
     
     # String Manipulation Programs
-    if any(pattern in code_lower for pattern in ['palindrome', 'paligdron', 'substring', 'compress', 'uppercase']):
+    if index.has('palindrome', 'paligdron', 'substring', 'compress', 'uppercase'):
         operations = []
-        if 'palindrome' in code_lower or 'paligdron' in code_lower:
+        if index.has('palindrome') or index.has('paligdron'):
             operations.append("palindrome checking (reads same forwards/backwards)")
-        if 'substring' in code_lower:
+        if index.has('substring'):
             operations.append("substring extraction")
-        if 'compress' in code_lower:
+        if index.has('compress'):
             operations.append("string compression (run-length encoding)")
-        if 'uppercase' in code_lower or 'titlecase' in code_lower:
+        if index.has('uppercase') or index.has('titlecase'):
             operations.append("text case conversion")
-        if 'shortestpath' in code_lower:
+        if index.has('shortestpath'):
             operations.append("shortest path calculation using coordinates")
         
         return {
@@ -131,30 +264,30 @@ def detect_program_type(code: str, code_lower: str, language: str) -> dict:
         }
     
     # Mathematical Programs
-    if any(pattern in code_lower for pattern in ['factorial', 'fibonacci', 'prime', 'even', 'odd']):
-        if 'factorial' in code_lower:
+    if index.has('factorial', 'fibonacci', 'prime', 'even', 'odd'):
+        if index.has('factorial'):
             return {'type': 'factorial', 'description': f"This {language} program calculates factorial (n! = n × (n-1) × ... × 1)."}
-        if 'fibonacci' in code_lower:
+        if index.has('fibonacci'):
             return {'type': 'fibonacci', 'description': f"This {language} program generates Fibonacci sequence (each number = sum of previous two)."}
-        if 'prime' in code_lower:
+        if index.has('prime'):
             return {'type': 'prime', 'description': f"This {language} program checks if numbers are prime (only divisible by 1 and themselves)."}
-        if 'even' in code_lower or 'odd' in code_lower:
+        if index.has('even') or index.has('odd'):
             return {'type': 'even_odd', 'description': f"This {language} program determines if numbers are even or odd using modulo operator."}
     
     # Data Structure Programs
-    if any(ds in code_lower for ds in ['linkedlist', 'queue', 'stack', 'tree', 'graph', 'heap']):
+    if index.has('linkedlist', 'queue', 'stack', 'tree', 'graph', 'heap'):
         structures = []
-        if 'linkedlist' in code_lower or 'node' in code_lower:
+        if index.has('linkedlist') or index.has('node'):
             structures.append("Linked Lists")
-        if 'queue' in code_lower:
+        if index.has('queue'):
             structures.append("Queues (FIFO)")
-        if 'stack' in code_lower:
+        if index.has('stack'):
             structures.append("Stacks (LIFO)")
-        if 'tree' in code_lower:
+        if index.has('tree'):
             structures.append("Trees")
-        if 'graph' in code_lower:
+        if index.has('graph'):
             structures.append("Graphs")
-        if 'heap' in code_lower:
+        if index.has('heap'):
             structures.append("Heaps")
         
         return {
@@ -163,19 +296,19 @@ def detect_program_type(code: str, code_lower: str, language: str) -> dict:
         }
     
     # Algorithm Programs
-    if any(algo in code_lower for algo in ['sort', 'search', 'merge', 'quick', 'bubble']):
+    if index.has('sort', 'search', 'merge', 'quick', 'bubble'):
         algorithms = []
-        if 'sort' in code_lower:
-            if 'bubble' in code_lower:
+        if index.has('sort'):
+            if index.has('bubble'):
                 algorithms.append("Bubble Sort")
-            elif 'merge' in code_lower:
+            elif index.has('merge'):
                 algorithms.append("Merge Sort")
-            elif 'quick' in code_lower:
+            elif index.has('quick'):
                 algorithms.append("Quick Sort")
             else:
                 algorithms.append("Sorting algorithms")
-        if 'search' in code_lower:
-            if 'binary' in code_lower:
+        if index.has('search'):
+            if index.has('binary'):
                 algorithms.append("Binary Search")
             else:
                 algorithms.append("Search algorithms")
@@ -186,29 +319,29 @@ def detect_program_type(code: str, code_lower: str, language: str) -> dict:
         }
     
     # Web Development
-    if any(web in code_lower for web in ['html', 'css', 'dom', 'fetch', 'api', 'ajax']):
+    if index.has('html', 'css', 'dom', 'fetch', 'api', 'ajax'):
         return {
             'type': 'web_development',
             'description': f"This {language} program is for web development, handling DOM manipulation, API calls, or frontend functionality."
         }
     
-    # Database Programs
-    if any(db in code_lower for db in ['sql', 'database', 'query', 'select', 'insert', 'update']):
+    # Database Programs (SQL usually lives in string literals)
+    if index.mentions('sql', 'database', 'query', 'select', 'insert', 'update'):
         return {
             'type': 'database',
             'description': f"This {language} program handles database operations including queries, data manipulation, and storage."
         }
     
     # Object-Oriented Programs
-    if 'class' in code_lower and any(oop in code_lower for oop in ['extends', 'inheritance', 'polymorphism', 'encapsulation']):
+    if index.has('class') and index.has('extends', 'inheritance', 'polymorphism', 'encapsulation'):
         return {
             'type': 'oop',
             'description': f"This {language} program demonstrates Object-Oriented Programming concepts with classes, inheritance, and encapsulation."
         }
     
     # Generic Programs
-    if 'class' in code:
-        class_count = len(re.findall(r'class\s+\w+', code, re.IGNORECASE))
+    if index.has('class'):
+        class_count = len(CLASS_COUNT_PATTERN.findall(code))
         return {
             'type': 'multi_class',
             'description': f"This {language} program contains {class_count} classes implementing various computational operations."
@@ -226,60 +359,40 @@ def analyze_syntax_patterns(code: str, file_extension: str, language: str) -> di
     classes = []
     functions = []
     
-    # 🏗️ CLASS DETECTION (Language-specific patterns)
-    class_patterns = {
-        '.java': [r'(?:public\s+|private\s+|protected\s+)?class\s+(\w+)(?:\s+extends\s+\w+)?(?:\s+implements\s+[\w,\s]+)?\s*{'],
-        '.py': [r'class\s+(\w+)(?:\([^)]*\))?\s*:'],
-        '.cpp': [r'class\s+(\w+)(?:\s*:\s*(?:public|private|protected)\s+\w+)?\s*{', r'struct\s+(\w+)\s*{'],
-        '.c': [r'struct\s+(\w+)\s*{', r'typedef\s+struct\s*{[^}]*}\s*(\w+)'],
-        '.cs': [r'(?:public\s+|private\s+|internal\s+)?(?:abstract\s+|sealed\s+)?class\s+(\w+)(?:\s*:\s*\w+)?\s*{'],
-        '.js': [r'class\s+(\w+)(?:\s+extends\s+\w+)?\s*{'],
-        '.ts': [r'(?:export\s+)?(?:abstract\s+)?class\s+(\w+)(?:<[^>]*>)?(?:\s+extends\s+\w+)?(?:\s+implements\s+[\w,\s]+)?\s*{']
-    }
-    
-    if file_extension in class_patterns:
-        for pattern in class_patterns[file_extension]:
-            matches = re.findall(pattern, code, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                class_purpose = analyze_class_purpose(match, code)
-                classes.append(f"{match} class: {class_purpose}")
-    
-    # 🔧 FUNCTION DETECTION (Language-specific patterns)
-    function_patterns = {
-        '.java': [
-            r'(?:public\s+|private\s+|protected\s+)?(?:static\s+)?(?:final\s+)?(\w+)\s+(\w+)\s*\([^)]*\)\s*(?:throws\s+[\w,\s]+)?\s*{',
-            r'(?:public\s+|private\s+|protected\s+)?(?:static\s+)?(void)\s+(\w+)\s*\([^)]*\)\s*(?:throws\s+[\w,\s]+)?\s*{'
-        ],
-        '.py': [r'def\s+(\w+)\s*\([^)]*\)\s*(?:->\s*[\w\[\],\s]+)?\s*:'],
-        '.cpp': [r'(?:inline\s+)?(?:virtual\s+)?(?:static\s+)?(\w+(?:\s*\*)?)\s+(\w+)\s*\([^)]*\)\s*(?:const\s*)?{'],
-        '.c': [r'(\w+(?:\s*\*)?)\s+(\w+)\s*\([^)]*\)\s*{'],
-        '.cs': [r'(?:public\s+|private\s+|protected\s+|internal\s+)?(?:static\s+)?(?:virtual\s+|override\s+)?(\w+)\s+(\w+)\s*\([^)]*\)\s*{'],
-        '.js': [r'function\s+(\w+)\s*\([^)]*\)\s*{', r'(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?\([^)]*\)\s*=>\s*{?', r'(\w+)\s*:\s*(?:async\s+)?function\s*\([^)]*\)\s*{'],
-        '.ts': [r'(?:export\s+)?(?:async\s+)?function\s+(\w+)(?:<[^>]*>)?\s*\([^)]*\)\s*(?::\s*[\w\[\]<>,\s|]+)?\s*{']
-    }
-    
-    if file_extension in function_patterns:
-        for pattern in function_patterns[file_extension]:
-            matches = re.findall(pattern, code, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                if isinstance(match, tuple):
-                    func_name = match[1] if len(match) > 1 else match[0]
-                    return_type = match[0] if len(match) > 1 else "void"
-                else:
-                    func_name = match
-                    return_type = "unknown"
-                
-                if func_name.lower() not in ['main', 'args', 'string', 'void', 'int', 'public', 'private', 'class']:
-                    func_purpose = analyze_function_purpose(func_name, code)
-                    functions.append(f"{func_name}(): {func_purpose}")
+    # 🏗️ CLASS DETECTION
+    for pattern in CLASS_PATTERNS.get(file_extension, []):
+        check_deadline()
+        for match in pattern.findall(code):
+            class_purpose = analyze_class_purpose(match, code)
+            classes.append(f"{match} class: {class_purpose}")
+    
+    # 🔧 FUNCTION DETECTION
+    for pattern in FUNCTION_PATTERNS.get(file_extension, []):
+        check_deadline()
+        for match in pattern.findall(code):
+            if isinstance(match, tuple):
+                func_name = match[1] if len(match) > 1 else match[0]
+                return_type = match[0] if len(match) > 1 else "void"
+            else:
+                func_name = match
+                return_type = "unknown"
+            
+            if func_name.lower() not in ['main', 'args', 'string', 'void', 'int', 'public', 'private', 'class']:
+                func_purpose = analyze_function_purpose(func_name, code)
+                functions.append(f"{func_name}(): {func_purpose}")
     
     return {'classes': classes, 'functions': functions}
 
 
 def analyze_class_purpose(class_name: str, code: str) -> str:
     """Analyzes what a class is designed to do"""
+    # The purpose depends only on the name, so repeated names are looked up once
+    return _class_purpose(class_name)
+
+
+@lru_cache(maxsize=4096)
+def _class_purpose(class_name: str) -> str:
     class_lower = class_name.lower()
-    code_lower = code.lower()
     
     # Data structure classes
     if 'node' in class_lower:
@@ -324,8 +437,13 @@ def analyze_class_purpose(class_name: str, code: str) -> str:
 
 def analyze_function_purpose(func_name: str, code: str) -> str:
     """Intelligently determines what a function does"""
+    # The purpose depends only on the name, so repeated names are looked up once
+    return _function_purpose(func_name)
+
+
+@lru_cache(maxsize=4096)
+def _function_purpose(func_name: str) -> str:
     func_lower = func_name.lower()
-    code_lower = code.lower()
     
     # String operations
     if 'palindrome' in func_lower or 'paligdron' in func_lower:
@@ -419,212 +537,213 @@ def analyze_function_purpose(func_name: str, code: str) -> str:
     return f"Performs {func_lower.replace('_', ' ')} operation"
 
 
-def detect_programming_concepts(code: str, code_lower: str, language: str) -> list:
+def detect_programming_concepts(code: str, index: SourceIndex, language: str) -> list:
     """Detects programming concepts used in the code"""
     concepts = []
     
     # Object-Oriented Programming
-    if 'class' in code_lower:
+    if index.has('class'):
         concepts.append("Object-Oriented Programming - organizing code into classes and objects")
-        if 'extends' in code_lower or 'inheritance' in code_lower:
+        if index.has('extends') or index.has('inheritance'):
             concepts.append("Inheritance - classes inheriting properties from parent classes")
-        if 'interface' in code_lower:
+        if index.has('interface'):
             concepts.append("Interfaces - contracts that classes must implement")
-        if 'abstract' in code_lower:
+        if index.has('abstract'):
             concepts.append("Abstraction - hiding implementation details")
     
     # Data Structures
-    if any(ds in code_lower for ds in ['array', 'list', 'arraylist']):
+    if index.has('array', 'list', 'arraylist'):
         concepts.append("Arrays/Lists - storing multiple elements in ordered collection")
-    if 'linkedlist' in code_lower or 'node' in code_lower:
+    if index.has('linkedlist') or index.has('node'):
         concepts.append("Linked Lists - dynamic data structure with nodes and pointers")
-    if 'queue' in code_lower:
+    if index.has('queue'):
         concepts.append("Queues - FIFO (First In, First Out) data structure")
-    if 'stack' in code_lower:
+    if index.has('stack'):
         concepts.append("Stacks - LIFO (Last In, First Out) data structure")
-    if 'tree' in code_lower:
+    if index.has('tree'):
         concepts.append("Trees - hierarchical data structure with parent-child relationships")
-    if 'graph' in code_lower:
+    if index.has('graph'):
         concepts.append("Graphs - network structure with nodes and edges")
-    if 'hash' in code_lower:
+    if index.has('hash'):
         concepts.append("Hash Tables - fast key-value lookup using hash functions")
     
     # Algorithms
-    if 'sort' in code_lower:
+    if index.has('sort'):
         concepts.append("Sorting Algorithms - arranging data in specific order")
-    if 'search' in code_lower:
+    if index.has('search'):
         concepts.append("Search Algorithms - finding specific elements efficiently")
-    if 'recursion' in code_lower or 'recursive' in code_lower:
+    if index.has('recursion') or index.has('recursive'):
         concepts.append("Recursion - functions calling themselves to solve problems")
-    if 'dynamic' in code_lower and 'programming' in code_lower:
+    if index.has('dynamic') and index.has('programming'):
         concepts.append("Dynamic Programming - optimizing recursive solutions")
     
     # Programming Fundamentals
-    if any(loop in code_lower for loop in ['for', 'while', 'do']):
+    if index.has('for', 'while', 'do'):
         concepts.append("Loops - repeating code blocks for iteration")
-    if any(cond in code_lower for cond in ['if', 'else', 'switch', 'case']):
+    if index.has('if', 'else', 'switch', 'case'):
         concepts.append("Conditional Statements - making decisions in code")
-    if 'exception' in code_lower or 'try' in code_lower or 'catch' in code_lower:
+    if index.has('exception') or index.has('try') or index.has('catch'):
         concepts.append("Exception Handling - managing errors gracefully")
     
     # Memory Management
-    if language in ['C', 'C++'] and any(mem in code_lower for mem in ['malloc', 'free', 'new', 'delete']):
+    if language in ['C', 'C++'] and index.has('malloc', 'free', 'new', 'delete'):
         concepts.append("Memory Management - allocating and deallocating memory")
-    if 'pointer' in code_lower or '->' in code:
+    if index.has('pointer') or index.has_symbol('->'):
         concepts.append("Pointers - variables storing memory addresses")
     
     # String Processing
-    if any(str_op in code_lower for str_op in ['substring', 'split', 'join', 'replace']):
+    if index.has('substring', 'split', 'join', 'replace'):
         concepts.append("String Manipulation - processing and modifying text data")
     
     # Input/Output
-    if any(io in code_lower for io in ['scanner', 'input', 'cin', 'cout', 'printf', 'scanf']):
+    if index.has('scanner', 'input', 'cin', 'cout', 'printf', 'scanf'):
         concepts.append("Input/Output Operations - reading user input and displaying output")
     
     return concepts
 
 
-def detect_algorithms(code: str, code_lower: str) -> list:
+def detect_algorithms(code: str, index: SourceIndex) -> list:
     """Detects specific algorithms implemented in the code"""
     algorithms = []
     
     # Sorting Algorithms
-    if 'bubblesort' in code_lower:
+    if index.has('bubblesort'):
         algorithms.append("Bubble Sort - O(n²) time complexity, simple comparison-based sorting")
-    elif 'selectionsort' in code_lower:
+    elif index.has('selectionsort'):
         algorithms.append("Selection Sort - O(n²) time complexity, finds minimum and swaps")
-    elif 'insertionsort' in code_lower:
+    elif index.has('insertionsort'):
         algorithms.append("Insertion Sort - O(n²) time complexity, builds sorted array incrementally")
-    elif 'mergesort' in code_lower:
+    elif index.has('mergesort'):
         algorithms.append("Merge Sort - O(n log n) time complexity, divide and conquer approach")
-    elif 'quicksort' in code_lower:
+    elif index.has('quicksort'):
         algorithms.append("Quick Sort - O(n log n) average case, uses pivot partitioning")
-    elif 'heapsort' in code_lower:
+    elif index.has('heapsort'):
         algorithms.append("Heap Sort - O(n log n) time complexity, uses heap data structure")
     
     # Search Algorithms
-    if 'binarysearch' in code_lower:
+    if index.has('binarysearch'):
         algorithms.append("Binary Search - O(log n) time complexity, works on sorted arrays")
-    elif 'linearsearch' in code_lower:
+    elif index.has('linearsearch'):
         algorithms.append("Linear Search - O(n) time complexity, checks each element sequentially")
     
     # String Algorithms
-    if 'palindrome' in code_lower:
+    if index.has('palindrome'):
         algorithms.append("Palindrome Check - two-pointer technique to verify symmetry")
-    if 'compress' in code_lower and 'string' in code_lower:
+    if index.has('compress') and index.has('string'):
         algorithms.append("String Compression - run-length encoding algorithm")
     
     # Mathematical Algorithms
-    if 'factorial' in code_lower:
+    if index.has('factorial'):
         algorithms.append("Factorial Calculation - iterative or recursive multiplication")
-    if 'fibonacci' in code_lower:
+    if index.has('fibonacci'):
         algorithms.append("Fibonacci Sequence - dynamic programming or recursion")
-    if 'prime' in code_lower:
+    if index.has('prime'):
         algorithms.append("Prime Number Check - divisibility testing algorithm")
-    if 'gcd' in code_lower:
+    if index.has('gcd'):
         algorithms.append("Greatest Common Divisor - Euclidean algorithm")
     
     # Graph Algorithms
-    if 'dfs' in code_lower or 'depth' in code_lower:
+    if index.has('dfs') or index.has('depth'):
         algorithms.append("Depth-First Search - graph traversal using stack")
-    if 'bfs' in code_lower or 'breadth' in code_lower:
+    if index.has('bfs') or index.has('breadth'):
         algorithms.append("Breadth-First Search - graph traversal using queue")
-    if 'dijkstra' in code_lower:
+    if index.has('dijkstra'):
         algorithms.append("Dijkstra's Algorithm - shortest path in weighted graphs")
     
     # Dynamic Programming
-    if 'dp' in code_lower or ('dynamic' in code_lower and 'programming' in code_lower):
+    if index.has('dp') or (index.has('dynamic') and index.has('programming')):
         algorithms.append("Dynamic Programming - optimization using memoization")
     
     # Geometric Algorithms
-    if 'shortestpath' in code_lower:
+    if index.has('shortestpath'):
         algorithms.append("Shortest Path Calculation - coordinate geometry using Pythagorean theorem")
     
     return algorithms
 
 
-def analyze_language_features(code: str, file_extension: str, language: str) -> list:
+def analyze_language_features(code: str, file_extension: str, language: str, index: SourceIndex = None) -> list:
     """Analyzes language-specific features used in the code"""
     features = []
-    code_lower = code.lower()
+    if index is None:
+        index = SourceIndex(code, file_extension)
     
     # Java-specific features
     if file_extension == '.java':
-        if 'scanner' in code_lower:
+        if index.has('scanner'):
             features.append("Scanner class for user input handling")
-        if 'stringbuilder' in code_lower:
+        if index.has('stringbuilder'):
             features.append("StringBuilder for efficient string manipulation")
-        if 'arraylist' in code_lower:
+        if index.has('arraylist'):
             features.append("ArrayList for dynamic array operations")
-        if 'hashmap' in code_lower:
+        if index.has('hashmap'):
             features.append("HashMap for key-value pair storage")
-        if 'interface' in code_lower:
+        if index.has('interface'):
             features.append("Interfaces for contract-based programming")
-        if 'extends' in code_lower:
+        if index.has('extends'):
             features.append("Class inheritance using extends keyword")
-        if 'implements' in code_lower:
+        if index.has('implements'):
             features.append("Interface implementation")
-        if 'static' in code_lower:
+        if index.has('static'):
             features.append("Static methods and variables")
-        if 'final' in code_lower:
+        if index.has('final'):
             features.append("Final keyword for immutability")
     
     # Python-specific features
     elif file_extension == '.py':
-        if 'list comprehension' in code_lower or '[' in code and 'for' in code and 'in' in code:
+        if index.has_symbol('[') and index.has('for') and index.has('in'):
             features.append("List comprehensions for concise data processing")
-        if 'lambda' in code_lower:
+        if index.has('lambda'):
             features.append("Lambda functions for inline function definitions")
-        if 'with' in code_lower:
+        if index.has('with'):
             features.append("Context managers for resource management")
-        if 'yield' in code_lower:
+        if index.has('yield'):
             features.append("Generators using yield for memory-efficient iteration")
-        if 'decorator' in code_lower or '@' in code:
+        if index.has('decorator') or index.has_symbol('@'):
             features.append("Decorators for function modification")
-        if '__init__' in code_lower:
+        if index.has('__init__'):
             features.append("Constructor methods for object initialization")
-        if 'self' in code_lower:
+        if index.has('self'):
             features.append("Self parameter for instance method access")
     
     # JavaScript-specific features
     elif file_extension == '.js':
-        if 'arrow function' in code_lower or '=>' in code:
+        if index.has_symbol('=>'):
             features.append("Arrow functions for concise function syntax")
-        if 'async' in code_lower and 'await' in code_lower:
+        if index.has('async') and index.has('await'):
             features.append("Async/await for asynchronous programming")
-        if 'promise' in code_lower:
+        if index.has('promise'):
             features.append("Promises for handling asynchronous operations")
-        if 'callback' in code_lower:
+        if index.has('callback'):
             features.append("Callback functions for event handling")
-        if 'closure' in code_lower:
+        if index.has('closure'):
             features.append("Closures for data encapsulation")
-        if 'prototype' in code_lower:
+        if index.has('prototype'):
             features.append("Prototype-based inheritance")
     
     # C++ specific features
     elif file_extension == '.cpp':
-        if 'template' in code_lower:
+        if index.has('template'):
             features.append("Templates for generic programming")
-        if 'namespace' in code_lower:
+        if index.has('namespace'):
             features.append("Namespaces for code organization")
-        if 'operator overloading' in code_lower or 'operator' in code_lower:
+        if index.has('operator'):
             features.append("Operator overloading for custom operations")
-        if 'virtual' in code_lower:
+        if index.has('virtual'):
             features.append("Virtual functions for polymorphism")
-        if 'smart pointer' in code_lower or 'unique_ptr' in code_lower:
+        if index.has('unique_ptr', 'shared_ptr'):
             features.append("Smart pointers for automatic memory management")
-        if 'vector' in code_lower:
+        if index.has('vector'):
             features.append("STL vectors for dynamic arrays")
     
     # C-specific features
     elif file_extension == '.c':
-        if 'malloc' in code_lower or 'calloc' in code_lower:
+        if index.has('malloc') or index.has('calloc'):
             features.append("Dynamic memory allocation")
-        if 'struct' in code_lower:
+        if index.has('struct'):
             features.append("Structures for custom data types")
-        if 'pointer' in code_lower or '->' in code:
+        if index.has('pointer') or index.has_symbol('->'):
             features.append("Pointers for memory address manipulation")
-        if 'typedef' in code_lower:
+        if index.has('typedef'):
             features.append("Type definitions for code clarity")
     
     return features
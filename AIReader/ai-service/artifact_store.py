@@ -0,0 +1,250 @@
+"""
+Persistent artifact store
+
+Extracted text and derived results (summaries, code explanations) are kept
+zlib-compressed in a SQLite database keyed by the document's content key and
+the kind of artifact. SQLite in WAL mode lets any number of processes read
+while one writes, so every uvicorn worker - including one that was just
+restarted or added - can serve a document another worker already parsed.
+
+iter_text reads a stored text back as chunks, a block of the compressed
+blob at a time, so a consumer that works incrementally (the summarizer)
+never holds the whole text.
+
+The store is best effort: a locked, full or corrupt database is logged and
+treated as a miss, never as a failed request. Entries are evicted roughly
+least recently used once the compressed data exceeds the size budget.
+"""
+
+import codecs
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Iterator, Optional
+
+from structured_log import get_logger, log_fields
+
+logger = get_logger("artifact_store")
+
+# Reads refresh an entry's access time at most this often, so hits rarely write
+TOUCH_INTERVAL_SECONDS = 3600
+
+# Compressed bytes read, and at most this many bytes decompressed, per step of iter_text
+BLOCK_BYTES = 256 * 1024
+
+# Bump when the layout changes; a store with an older layout is dropped (it's only a cache)
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    raw_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    -- Last, so reading the other columns never walks the blob's overflow pages
+    data BLOB NOT NULL,
+    PRIMARY KEY (key, kind)
+);
+CREATE INDEX IF NOT EXISTS artifacts_accessed ON artifacts (accessed);
+
+-- Running totals kept by the triggers below, so a put never sums the whole table
+CREATE TABLE IF NOT EXISTS artifact_totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    entries INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO artifact_totals
+    SELECT 0, COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0) FROM artifacts
+    WHERE NOT EXISTS (SELECT 1 FROM artifact_totals);
+CREATE TRIGGER IF NOT EXISTS artifacts_inserted AFTER INSERT ON artifacts BEGIN
+    UPDATE artifact_totals SET entries = entries + 1, raw_size = raw_size + NEW.raw_size,
+        stored_size = stored_size + NEW.stored_size;
+END;
+CREATE TRIGGER IF NOT EXISTS artifacts_replaced AFTER UPDATE OF raw_size, stored_size ON artifacts BEGIN
+    UPDATE artifact_totals SET raw_size = raw_size + NEW.raw_size - OLD.raw_size,
+        stored_size = stored_size + NEW.stored_size - OLD.stored_size;
+END;
+CREATE TRIGGER IF NOT EXISTS artifacts_deleted AFTER DELETE ON artifacts BEGIN
+    UPDATE artifact_totals SET entries = entries - 1, raw_size = raw_size - OLD.raw_size,
+        stored_size = stored_size - OLD.stored_size;
+END;
+"""
+
+
+class ArtifactUnavailable(Exception):
+    """A stored text could not be read to the end (changed, evicted or corrupt meanwhile)"""
+
+
+class ArtifactStore:
+    def __init__(self, path: str, max_bytes: int, compression_level: int = 6):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, and never one inherited from a parent process
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._upgrade(connection)
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @staticmethod
+    def _upgrade(connection: sqlite3.Connection) -> None:
+        # Checked under the write lock, so only the first process to open an old store drops it
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS artifacts")
+                connection.execute("DROP TABLE IF EXISTS artifact_totals")
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def get(self, key: str, kind: str) -> Optional[str]:
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT data, accessed FROM artifacts WHERE key = ? AND kind = ?", (key, kind)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            data, accessed = row
+            now = time.time()
+            if now - accessed > TOUCH_INTERVAL_SECONDS:
+                connection.execute("UPDATE artifacts SET accessed = ? WHERE key = ? AND kind = ?", (now, key, kind))
+            self.hits += 1
+            return zlib.decompress(data).decode('utf-8')
+        except (sqlite3.Error, zlib.error) as e:
+            self._failed("read", key, kind, e)
+            return None
+
+    def iter_text(self, key: str, kind: str, block_bytes: int = BLOCK_BYTES) -> Optional[Iterator[str]]:
+        """
+        A stored text as consecutive chunks, or None if it isn't stored
+        A read that fails partway raises ArtifactUnavailable from the iterator.
+        """
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT rowid, accessed FROM artifacts WHERE key = ? AND kind = ?", (key, kind)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            rowid, accessed = row
+            now = time.time()
+            if now - accessed > TOUCH_INTERVAL_SECONDS:
+                connection.execute("UPDATE artifacts SET accessed = ? WHERE rowid = ?", (now, rowid))
+        except sqlite3.Error as e:
+            self._failed("read", key, kind, e)
+            return None
+        self.hits += 1
+        return self._iter_chunks(connection, rowid, key, kind, block_bytes)
+
+    def _iter_chunks(self, connection: sqlite3.Connection, rowid: int, key: str, kind: str,
+                     block_bytes: int) -> Iterator[str]:
+        decompressor = zlib.decompressobj()
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            for block in self._blob_blocks(connection, rowid, block_bytes):
+                # Bounded output per step, however well the block compressed
+                while block:
+                    text = decoder.decode(decompressor.decompress(block, block_bytes))
+                    block = decompressor.unconsumed_tail
+                    if text:
+                        yield text
+            text = decoder.decode(decompressor.flush(), final=True)
+            if text:
+                yield text
+        except (sqlite3.Error, zlib.error, UnicodeDecodeError) as e:
+            self._failed("read", key, kind, e)
+            raise ArtifactUnavailable(str(e)) from e
+
+    @staticmethod
+    def _blob_blocks(connection: sqlite3.Connection, rowid: int, block_bytes: int) -> Iterator[bytes]:
+        if not hasattr(connection, 'blobopen'):
+            # Python < 3.11 has no incremental blob I/O: only the compressed bytes are held at once
+            row = connection.execute("SELECT data FROM artifacts WHERE rowid = ?", (rowid,)).fetchone()
+            if row is None:
+                raise sqlite3.OperationalError("artifact was removed")
+            data = row[0]
+            for start in range(0, len(data), block_bytes):
+                yield data[start:start + block_bytes]
+            return
+        with connection.blobopen('artifacts', 'data', rowid, readonly=True) as blob:
+            for block in iter(lambda: blob.read(block_bytes), b''):
+                yield block
+
+    def put(self, key: str, kind: str, text: str) -> None:
+        raw = text.encode('utf-8')
+        data = zlib.compress(raw, self.compression_level)
+        # Never let one huge document flush the whole store
+        if len(data) > self.max_bytes:
+            return
+        try:
+            connection = self._connection()
+            # An upsert rather than INSERT OR REPLACE: REPLACE's implicit delete doesn't fire the totals trigger
+            connection.execute(
+                "INSERT INTO artifacts (key, kind, raw_size, stored_size, accessed, data) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key, kind) DO UPDATE SET raw_size = excluded.raw_size, "
+                "stored_size = excluded.stored_size, accessed = excluded.accessed, data = excluded.data",
+                (key, kind, len(raw), len(data), time.time(), data),
+            )
+            self.evict(connection)
+        except sqlite3.Error as e:
+            self._failed("write", key, kind, e)
+
+    def evict(self, connection: sqlite3.Connection) -> None:
+        total = connection.execute("SELECT stored_size FROM artifact_totals").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used entries until a tenth of the budget is free again
+        excess = total - self.max_bytes * 0.9
+        victims = []
+        for key, kind, stored_size in connection.execute(
+                "SELECT key, kind, stored_size FROM artifacts ORDER BY accessed"):
+            victims.append((key, kind))
+            excess -= stored_size
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM artifacts WHERE key = ? AND kind = ?", victims)
+
+    def _failed(self, operation: str, key: str, kind: str, error: Exception) -> None:
+        self.errors += 1
+        logger.warning("artifact store %s failed", operation,
+                       extra=log_fields(key=key, kind=kind, error=str(error)))
+
+    def stats(self) -> dict:
+        try:
+            entries, raw_size, stored_size = self._connection().execute(
+                "SELECT entries, raw_size, stored_size FROM artifact_totals"
+            ).fetchone()
+        except sqlite3.Error:
+            entries = raw_size = stored_size = None
+        return {
+            "entries": entries,
+            "rawBytes": raw_size,
+            "storedBytes": stored_size,
+            "maxBytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
@@ -0,0 +1,189 @@
+"""
+Content-addressed audio cache
+
+Generated MP3s are named after a hash of the cleaned text plus the TTS
+settings, so a repeat request returns the existing file instead of calling
+the TTS service again. A file's modification time is its last use.
+
+sweep() deletes files unused for longer than the TTL, then the least recently
+used files until the directory fits the disk budget, plus temporary files
+left behind by interrupted syntheses. Files that are in use are never
+deleted: those pinned by this process (being served or streamed) and those
+used within the last min_age_seconds by any process, so a file that was just
+handed to a client is still there when the client fetches it.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+# Temporary files older than this belong to a synthesis that died
+TEMP_MAX_AGE_SECONDS = 3600
+
+# Cached files are named after their key
+FILE_NAME = re.compile(r'[0-9a-f]{64}\.mp3')
+
+
+class AudioCache:
+    def __init__(self, directory: str, max_bytes: int, ttl_seconds: Optional[float] = None,
+                 min_age_seconds: float = 300):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.min_age_seconds = min_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._pins = Counter()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key_for(text: str, language: str, **tts_settings) -> str:
+        payload = json.dumps({"text": text, "language": language, **tts_settings}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        return f"{self.directory}/{key}.mp3"
+
+    @contextmanager
+    def pinned(self, path: str):
+        """Keep path from being swept while the block runs"""
+        with self._lock:
+            self._pins[path] += 1
+        try:
+            yield path
+        finally:
+            with self._lock:
+                self._pins[path] -= 1
+                if not self._pins[path]:
+                    del self._pins[path]
+
+    def path_for_name(self, name: str) -> Optional[str]:
+        """Path of a cache file name as it appears in audio URLs, None for anything else"""
+        return f"{self.directory}/{name}" if FILE_NAME.fullmatch(name) else None
+
+    def lookup(self, key: str) -> Optional[str]:
+        path = self.path_for(key)
+        try:
+            # Touch the file so eviction treats it as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def get_or_create(self, key: str, synthesize: Callable[[str], None]) -> str:
+        """Return the cached file for key, calling synthesize(path) to create it on a miss"""
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Identical concurrent requests wait for the first one instead of synthesizing twice
+        with key_lock:
+            try:
+                path = self.lookup(key)
+                if path is not None:
+                    self.hits += 1
+                    return path
+
+                self.misses += 1
+                path = self.path_for(key)
+                temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+                try:
+                    synthesize(temp_path)
+                    os.replace(temp_path, path)
+                finally:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+
+        self.sweep(keep=path)
+        return path
+
+    def stream_or_create(self, key: str, produce: Callable[[], Iterator[bytes]],
+                         block_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        Yield the cached file for key, or stream produce() while writing it through
+        The file only enters the cache once the whole stream has been produced
+        """
+        path = self.lookup(key)
+        if path is not None:
+            self.hits += 1
+            with self.pinned(path), open(path, 'rb') as file:
+                for block in iter(lambda: file.read(block_size), b''):
+                    yield block
+            return
+
+        self.misses += 1
+        path = self.path_for(key)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(temp_path, 'wb') as file:
+                for block in produce():
+                    file.write(block)
+                    yield block
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self.sweep(keep=path)
+
+    def sweep(self, keep: Optional[str] = None) -> None:
+        """Delete expired files, then least recently used ones until the directory fits the budget"""
+        now = time.time()
+        files = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if not entry.is_file():
+                continue
+            path = f"{self.directory}/{entry.name}"
+            stat = entry.stat()
+            if entry.name.endswith('.mp3'):
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+            elif entry.name.endswith('.tmp') and now - stat.st_mtime > TEMP_MAX_AGE_SECONDS:
+                self._remove(path)
+
+        for mtime, size, path in sorted(files):
+            expired = self.ttl_seconds is not None and now - mtime > self.ttl_seconds
+            if not expired and total <= self.max_bytes:
+                break
+            if path == keep or path in self._pins or now - mtime < self.min_age_seconds:
+                continue
+            if self._remove(path):
+                total -= size
+                if expired:
+                    self.expired += 1
+                else:
+                    self.evictions += 1
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+        except (FileNotFoundError, PermissionError):
+            # Already gone, or still open on a platform that can't delete open files
+            return False
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "pinned": len(self._pins),
+            "maxBytes": self.max_bytes,
+            "ttlSeconds": self.ttl_seconds,
+        }
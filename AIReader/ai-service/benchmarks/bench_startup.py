@@ -0,0 +1,121 @@
+"""
+Benchmark: service cold start
+
+Usage (from ai-service/):
+    python benchmarks/bench_startup.py --runs 5 --output startup.json
+
+Every run starts a fresh interpreter that imports main, runs the startup
+hooks and extracts one small document, for each format with and without
+AI_WARMUP=all. Reports, per scenario, the median time to import main, to be
+ready (import plus startup hooks), to the first extracted document, the
+whole process wall time, and which format libraries ended up loaded.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVICE_DIR = os.path.dirname(BENCH_DIR)
+
+LIBRARIES = ['PyPDF2', 'docx', 'pptx', 'gtts', 'requests']
+
+
+def make_inputs(data_dir: str) -> dict:
+    sys.path.insert(0, BENCH_DIR)
+    import synthetic
+    return {
+        '.txt': synthetic.write_text(os.path.join(data_dir, 'doc.txt'), 4096),
+        '.pdf': synthetic.write_pdf(os.path.join(data_dir, 'doc.pdf'), 2),
+        '.docx': synthetic.write_docx(os.path.join(data_dir, 'doc.docx'), 2),
+        '.pptx': synthetic.write_pptx(os.path.join(data_dir, 'doc.pptx'), 2),
+    }
+
+
+def child(file_path: str, file_extension: str):
+    """One cold start, run in a fresh interpreter; prints its timings as JSON"""
+    start = time.perf_counter()
+    sys.path.insert(0, SERVICE_DIR)
+    import main
+    imported = time.perf_counter()
+
+    async def serve_first_document():
+        await main.app.router.startup()
+        ready = time.perf_counter()
+        await main.extract_content(file_path, file_extension)
+        done = time.perf_counter()
+        await main.app.router.shutdown()
+        return ready, done
+
+    ready, done = asyncio.run(serve_first_document())
+    print(json.dumps({
+        "importMs": (imported - start) * 1000,
+        "readyMs": (ready - start) * 1000,
+        "firstDocumentMs": (done - ready) * 1000,
+        "loaded": [library for library in LIBRARIES if library in sys.modules],
+    }))
+
+
+def run_child(file_path: str, file_extension: str, warmup: str, cpu_workers: int, index_dir: str) -> dict:
+    env = dict(os.environ, AI_WARMUP=warmup, AI_CPU_WORKERS=str(cpu_workers),
+               AI_PAGE_INDEX_DIR=index_dir, AI_LOG_LEVEL="WARNING")
+    start = time.perf_counter()
+    output = subprocess.check_output([sys.executable, os.path.abspath(__file__), '--child', file_path, file_extension],
+                                     cwd=SERVICE_DIR, env=env, text=True)
+    result = json.loads(output.strip().splitlines()[-1])
+    result["processMs"] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help="cold starts per scenario")
+    parser.add_argument('--formats', nargs='+', default=['.txt', '.pdf', '.docx', '.pptx'])
+    parser.add_argument('--cpu-workers', type=int, default=0, help="AI_CPU_WORKERS for the service (0 = threads)")
+    parser.add_argument('--output', help="also write the JSON report to this file")
+    parser.add_argument('--child', nargs=2, metavar=('PATH', 'EXT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="ai-service-startup-") as data_dir:
+        inputs = make_inputs(data_dir)
+        for file_extension in args.formats:
+            for warmup in ('', 'all'):
+                print(f"{file_extension} warmup={warmup or 'off'} ...", file=sys.stderr)
+                # Fresh page index every run, so each run really extracts
+                runs = [run_child(inputs[file_extension], file_extension, warmup, args.cpu_workers,
+                                  os.path.join(data_dir, f"index-{file_extension[1:]}-{warmup}-{run}"))
+                        for run in range(args.runs)]
+                results.append({
+                    "format": file_extension,
+                    "warmup": warmup or "off",
+                    "runs": args.runs,
+                    **{key: round(statistics.median(run[key] for run in runs), 1)
+                       for key in ("importMs", "readyMs", "firstDocumentMs", "processMs")},
+                    "loaded": runs[-1]["loaded"],
+                })
+
+    report = {
+        "python": sys.version.split()[0],
+        "cpuWorkers": args.cpu_workers,
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+
+
+if __name__ == "__main__":
+    main_cli()
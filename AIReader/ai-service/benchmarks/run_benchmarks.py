@@ -0,0 +1,237 @@
+"""
+Benchmark suite for the ai-service hot paths
+
+Usage (from ai-service/):
+    python benchmarks/run_benchmarks.py --profile default --output results.json
+    python benchmarks/run_benchmarks.py --profile full --only extract_pdf summarize
+
+Generates synthetic PDF, DOCX, PPTX, text and source files (see synthetic.py),
+times DocumentProcessor extraction, AIProcessor.summarize_text, the TF-IDF
+summary engine (single documents and batches, when NumPy is installed),
+analyze_code_advanced_universal, AudioGenerator.clean_text_for_audio and the
+chunked TTS pipeline with gTTS replaced by a local stub, and prints the
+throughput, latency percentiles and peak memory of every case as JSON.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+
+import synthetic
+from main import DocumentProcessor, AIProcessor, AudioGenerator
+from advanced_universal_analyzer import analyze_code_advanced_universal
+
+try:
+    import tfidf_summarizer
+except ImportError:
+    tfidf_summarizer = None
+
+KB = 1024
+MB = 1024 * 1024
+
+PROFILES = {
+    "quick": {
+        "pages": [1, 10],
+        "text_bytes": [1 * KB, 100 * KB],
+        "source_bytes": [1 * KB, 10 * KB],
+        "repeat": 5,
+    },
+    "default": {
+        "pages": [1, 10, 100],
+        "text_bytes": [1 * KB, 1 * MB, 10 * MB],
+        "source_bytes": [1 * KB, 100 * KB],
+        "repeat": 5,
+    },
+    "full": {
+        "pages": [1, 10, 100, 1000],
+        "text_bytes": [1 * KB, 1 * MB, 10 * MB, 50 * MB],
+        "source_bytes": [1 * KB, 100 * KB, 1 * MB],
+        "repeat": 3,
+    },
+}
+
+SOURCE_EXTENSIONS = ['.py', '.js', '.java']
+
+# Text handed to the TTS pipeline is capped like a summary would be
+TTS_TEXT_BYTES = [1 * KB, 16 * KB]
+
+# Documents per summarize_batch call and the size of each
+TFIDF_BATCH_DOCUMENTS = [10, 100]
+TFIDF_BATCH_DOCUMENT_BYTES = 4 * KB
+
+
+def stub_tts(latency_seconds: float):
+    """Replace network synthesis with a fixed delay and fake MP3 frames"""
+    def synthesize_chunk(text: str, language: str) -> bytes:
+        if latency_seconds:
+            time.sleep(latency_seconds)
+        return b'\xff\xf3' * len(text)
+    AudioGenerator.synthesize_chunk = staticmethod(synthesize_chunk)
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile"""
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def measure(func, args: tuple, repeat: int) -> dict:
+    func(*args)  # warm-up (imports, compiled regexes, caches)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    # Separate run so tracing overhead doesn't leak into the timings
+    tracemalloc.start()
+    try:
+        func(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "runs": repeat,
+        "latencyMs": {
+            "min": round(timings[0] * 1000, 3),
+            "p50": round(percentile(timings, 0.50) * 1000, 3),
+            "p95": round(percentile(timings, 0.95) * 1000, 3),
+            "p99": round(percentile(timings, 0.99) * 1000, 3),
+            "max": round(timings[-1] * 1000, 3),
+            "mean": round(sum(timings) / len(timings) * 1000, 3),
+        },
+        "p50Seconds": percentile(timings, 0.50),
+        "peakMemoryMB": round(peak / MB, 3),
+    }
+
+
+def build_cases(profile: dict, data_dir: str, only: list = None):
+    """
+    Yield (name, label, input_bytes, func, args) for every benchmark case
+    Inputs are generated lazily, so cases filtered out by only cost nothing
+    """
+    def wanted(name: str) -> bool:
+        return not only or any(pattern in name for pattern in only)
+
+    for pages in profile["pages"]:
+        if wanted("extract_pdf"):
+            path = synthetic.write_pdf(os.path.join(data_dir, f"doc_{pages}p.pdf"), pages)
+            yield "extract_pdf", f"{pages} pages", os.path.getsize(path), DocumentProcessor.extract_pdf_text, (path,)
+        if wanted("extract_docx"):
+            path = synthetic.write_docx(os.path.join(data_dir, f"doc_{pages}p.docx"), pages)
+            yield "extract_docx", f"{pages} pages", os.path.getsize(path), DocumentProcessor.extract_docx_text, (path,)
+        if wanted("extract_pptx"):
+            path = synthetic.write_pptx(os.path.join(data_dir, f"deck_{pages}s.pptx"), pages)
+            yield "extract_pptx", f"{pages} slides", os.path.getsize(path), DocumentProcessor.extract_pptx_text, (path,)
+
+    for size in profile["text_bytes"]:
+        label = f"{size // KB} KB"
+        if wanted("extract_text"):
+            path = synthetic.write_text(os.path.join(data_dir, f"text_{size}.txt"), size)
+            yield "extract_text", label, size, DocumentProcessor.extract_text_file, (path,)
+        if wanted("summarize_text") or wanted("clean_text_for_audio"):
+            text = synthetic.make_text(size)
+            if wanted("summarize_text"):
+                yield "summarize_text", label, size, AIProcessor.summarize_text, (text,)
+            if wanted("clean_text_for_audio"):
+                yield "clean_text_for_audio", label, size, AudioGenerator.clean_text_for_audio, (text,)
+        if wanted("summarize_tfidf") and tfidf_summarizer is not None:
+            yield "summarize_tfidf", label, size, tfidf_summarizer.summarize, (synthetic.make_text(size),)
+
+    if wanted("summarize_tfidf_batch") and tfidf_summarizer is not None:
+        for count in TFIDF_BATCH_DOCUMENTS:
+            texts = [synthetic.make_text(TFIDF_BATCH_DOCUMENT_BYTES, seed=seed) for seed in range(count)]
+            yield ("summarize_tfidf_batch", f"{count} x {TFIDF_BATCH_DOCUMENT_BYTES // KB} KB",
+                   sum(map(len, texts)), tfidf_summarizer.summarize_batch, (texts,))
+
+    if wanted("analyze_code"):
+        for size in profile["source_bytes"]:
+            for extension in SOURCE_EXTENSIONS:
+                code = synthetic.make_source(size, extension)
+                yield "analyze_code", f"{extension} {size // KB} KB", len(code), analyze_code_advanced_universal, (code, extension)
+
+    if wanted("tts_pipeline_stub"):
+        for size in TTS_TEXT_BYTES:
+            cleaned = AudioGenerator.clean_text_for_audio(synthetic.make_text(size))
+            yield "tts_pipeline_stub", f"{size // KB} KB", len(cleaned), run_tts_pipeline, (cleaned,)
+
+
+def run_tts_pipeline(cleaned_text: str) -> bytes:
+    return b''.join(AudioGenerator.iter_tts_audio(cleaned_text, 'en'))
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=SERVICE_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='default')
+    parser.add_argument('--only', nargs='+', help="run only cases whose name contains one of these strings")
+    parser.add_argument('--repeat', type=int, help="timed runs per case (overrides the profile)")
+    parser.add_argument('--tts-latency-ms', type=float, default=50, help="simulated latency of one TTS call")
+    parser.add_argument('--data-dir', help="keep generated inputs here instead of a temporary directory")
+    parser.add_argument('--output', help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    profile = PROFILES[args.profile]
+    repeat = args.repeat or profile["repeat"]
+    stub_tts(args.tts_latency_ms / 1000)
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="ai-service-bench-")
+    os.makedirs(data_dir, exist_ok=True)
+    try:
+        results = []
+        for name, label, input_bytes, func, func_args in build_cases(profile, data_dir, args.only):
+            print(f"{name} [{label}] ...", file=sys.stderr)
+            result = measure(func, func_args, repeat)
+            p50 = result.pop("p50Seconds")
+            results.append({
+                "case": name,
+                "input": label,
+                "inputBytes": input_bytes,
+                **result,
+                "throughputMBps": round(input_bytes / MB / p50, 3) if p50 else None,
+            })
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "revision": git_revision(),
+        "profile": args.profile,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpuCount": os.cpu_count(),
+        "ttsLatencyMs": args.tts_latency_ms,
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+
+
+if __name__ == "__main__":
+    main_cli()
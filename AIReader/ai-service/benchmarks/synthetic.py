@@ -0,0 +1,210 @@
+"""
+Synthetic benchmark inputs
+
+Every generator is seeded, so the same arguments always produce the same
+document. PDFs are written by hand (one Helvetica text stream per page), so no
+PDF library is needed; DOCX and PPTX files use python-docx and python-pptx,
+which the service already depends on.
+"""
+
+import os
+import random
+
+import docx
+from pptx import Presentation
+from pptx.util import Inches
+
+LINES_PER_PAGE = 45
+PARAGRAPHS_PER_PAGE = 8
+
+# Project-style vocabulary so the summarizer's detectors have something to find
+VOCABULARY = (
+    "the project system application platform uses react node express mongodb python "
+    "fastapi docker api authentication dashboard upload users documents summary audio "
+    "frontend backend database server client module component architecture design "
+    "implementation workflow deployment testing documentation feature real time "
+    "notification search analytics management data model service request response "
+    "a an of to for with and in on is are will should can"
+).split()
+
+SOURCE_TEMPLATES = {
+    '.py': (
+        "class {Name}Service:\n"
+        "    def __init__(self, items):\n"
+        "        self.items = list(items)\n\n"
+        "    def sort_{name}(self):\n"
+        "        for i in range(len(self.items)):\n"
+        "            for j in range(len(self.items) - i - 1):\n"
+        "                if self.items[j] > self.items[j + 1]:\n"
+        "                    self.items[j], self.items[j + 1] = self.items[j + 1], self.items[j]\n"
+        "        return self.items\n\n"
+        "    def find_{name}(self, target):\n"
+        "        # binary search over the sorted items\n"
+        "        low, high = 0, len(self.items) - 1\n"
+        "        while low <= high:\n"
+        "            mid = (low + high) // 2\n"
+        "            if self.items[mid] == target:\n"
+        "                return mid\n"
+        "            low, high = (mid + 1, high) if self.items[mid] < target else (low, mid - 1)\n"
+        "        return -1\n\n\n"
+    ),
+    '.js': (
+        "class {Name}Store {{\n"
+        "  constructor(items) {{ this.items = [...items]; }}\n"
+        "  sort{Name}() {{ return this.items.sort((a, b) => a - b); }}\n"
+        "  async fetch{Name}(url) {{\n"
+        "    const response = await fetch(url);\n"
+        "    return response.json();\n"
+        "  }}\n"
+        "  total{Name}() {{\n"
+        "    let sum = 0;\n"
+        "    for (let i = 0; i < this.items.length; i++) {{ sum += this.items[i]; }}\n"
+        "    return sum;\n"
+        "  }}\n"
+        "}}\n\n"
+    ),
+    '.java': (
+        "class {Name}Processor {{\n"
+        "    private int[] values;\n\n"
+        "    public {Name}Processor(int[] values) {{ this.values = values; }}\n\n"
+        "    public int factorial{Name}(int n) {{\n"
+        "        if (n <= 1) {{ return 1; }}\n"
+        "        return n * factorial{Name}(n - 1);\n"
+        "    }}\n\n"
+        "    public String reverse{Name}(String input) {{\n"
+        "        StringBuilder builder = new StringBuilder(input);\n"
+        "        return builder.reverse().toString();\n"
+        "    }}\n"
+        "}}\n\n"
+    ),
+}
+
+
+def make_sentences(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(count):
+        words = [rng.choice(VOCABULARY) for _ in range(rng.randint(6, 16))]
+        sentences.append(' '.join(words).capitalize() + '.')
+    return sentences
+
+
+def make_text(size_bytes: int, seed: int = 7) -> str:
+    """Plain prose of roughly size_bytes characters, split into paragraphs"""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size_bytes:
+        paragraph = ' '.join(make_sentences(rng.randint(3, 8), seed=rng.random()))
+        parts.append(paragraph)
+        length += len(paragraph) + 2
+    return '\n\n'.join(parts)[:size_bytes]
+
+
+def make_source(size_bytes: int, extension: str = '.py') -> str:
+    """Source file of roughly size_bytes built from repeated, uniquely named classes"""
+    template = SOURCE_TEMPLATES[extension]
+    parts = []
+    length = 0
+    index = 0
+    while length < size_bytes:
+        block = template.format(Name=f"Item{index}", name=f"item{index}")
+        parts.append(block)
+        length += len(block)
+        index += 1
+    return ''.join(parts)
+
+
+def _pdf_string(line: str) -> bytes:
+    escaped = line.encode('latin-1', 'replace').replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+    return b"(" + escaped + b") Tj T*"
+
+
+def write_pdf(path: str, pages: int, seed: int = 7) -> str:
+    """Text PDF with LINES_PER_PAGE lines of prose per page"""
+    sentences = make_sentences(pages * LINES_PER_PAGE // 2 + 1, seed)
+    words = ' '.join(sentences).split()
+    lines = [' '.join(words[i:i + 12]) for i in range(0, len(words), 12)]
+
+    objects = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    font_id = 1
+    content_ids = []
+    for page in range(pages):
+        page_lines = lines[page * LINES_PER_PAGE:(page + 1) * LINES_PER_PAGE] or ["(blank page)"]
+        stream = b"BT /F1 10 Tf 14 TL 60 770 Td " + b" ".join(_pdf_string(line) for line in page_lines) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ids.append(len(objects))
+
+    pages_id = len(objects) + pages + 1
+    page_ids = []
+    for content_id in content_ids:
+        objects.append(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (pages_id, content_id, font_id)
+        )
+        page_ids.append(len(objects))
+    objects.append(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % i for i in page_ids), pages))
+    objects.append(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+    catalog_id = len(objects)
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog_id, xref)
+
+    with open(path, 'wb') as file:
+        file.write(output)
+    return path
+
+
+def write_docx(path: str, pages: int, seed: int = 7) -> str:
+    """Word document with PARAGRAPHS_PER_PAGE paragraphs per page and one small table every 10 pages"""
+    rng = random.Random(seed)
+    document = docx.Document()
+    document.add_heading("Synthetic Project Specification", level=1)
+    for page in range(pages):
+        for _ in range(PARAGRAPHS_PER_PAGE):
+            document.add_paragraph(' '.join(make_sentences(3, seed=rng.random())))
+        if page % 10 == 0:
+            table = document.add_table(rows=3, cols=3)
+            for row in table.rows:
+                for cell in row.cells:
+                    cell.text = rng.choice(VOCABULARY)
+    document.save(path)
+    return path
+
+
+def write_pptx(path: str, slides: int, seed: int = 7) -> str:
+    """Presentation with a title and a bulleted body on every slide"""
+    rng = random.Random(seed)
+    presentation = Presentation()
+    layout = presentation.slide_layouts[1]
+    for number in range(slides):
+        slide = presentation.slides.add_slide(layout)
+        slide.shapes.title.text = f"Section {number + 1}: {rng.choice(VOCABULARY).title()} {rng.choice(VOCABULARY)}"
+        body = slide.placeholders[1].text_frame
+        body.text = make_sentences(1, seed=rng.random())[0]
+        for sentence in make_sentences(4, seed=rng.random()):
+            body.add_paragraph().text = sentence
+        if number % 5 == 0:
+            note = slide.shapes.add_textbox(Inches(1), Inches(6.5), Inches(8), Inches(0.5))
+            note.text_frame.text = make_sentences(1, seed=rng.random())[0]
+    presentation.save(path)
+    return path
+
+
+def write_text(path: str, size_bytes: int, seed: int = 7) -> str:
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(make_text(size_bytes, seed))
+    return path
+
+
+def write_source(path: str, size_bytes: int) -> str:
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(make_source(size_bytes, os.path.splitext(path)[1]))
+    return path
@@ -0,0 +1,36 @@
+"""
+Cooperative per-job CPU deadlines
+
+Worker jobs run under cpu_budget(seconds); long loops call check_deadline()
+between units of work (a PDF page, a repair pass, an analyzer stage) and get
+DeadlineExceeded once the job has used more CPU time than its budget. CPU
+time is measured per thread with time.thread_time, so time spent waiting in
+a queue or on I/O doesn't count against the budget.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+_local = threading.local()
+
+
+class DeadlineExceeded(BaseException):
+    """BaseException (like asyncio.CancelledError) so extractors' broad except Exception blocks don't swallow it"""
+
+
+@contextmanager
+def cpu_budget(seconds: float):
+    """Run the block with a CPU budget (0 or None for no limit)"""
+    previous = getattr(_local, 'deadline', None)
+    _local.deadline = (time.thread_time() + seconds, seconds) if seconds else None
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+
+def check_deadline() -> None:
+    deadline = getattr(_local, 'deadline', None)
+    if deadline is not None and time.thread_time() > deadline[0]:
+        raise DeadlineExceeded(f"Processing exceeded the CPU budget of {deadline[1]:g}s")
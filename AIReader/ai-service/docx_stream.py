@@ -0,0 +1,197 @@
+"""
+Streaming DOCX text extraction
+
+Reads word/document.xml straight from the zip with ElementTree.iterparse and
+yields body paragraphs and table rows in document order. Every row and
+top-level paragraph is discarded as soon as its text has been produced, so
+memory stays bounded by the largest single row or paragraph rather than the
+document, and no python-docx object model is built.
+
+Text follows python-docx's rules exactly: runs and hyperlinks of a paragraph
+(tabs, breaks and non-breaking hyphens included), cells joined with newlines
+between their paragraphs, horizontally and vertically merged cells repeated
+across the grid columns they cover. Documents this reader can't map the same
+way raise UnsupportedDocx so the caller can fall back to python-docx.
+"""
+
+import posixpath
+import xml.etree.ElementTree as ET
+import zipfile
+from collections import deque
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+PACKAGE_RELS = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+# Text equivalent of a run's inner-content elements (w:t and w:br are handled separately)
+RUN_CONTENT = {W + 'tab': '\t', W + 'ptab': '\t', W + 'cr': '\n', W + 'noBreakHyphen': '-'}
+
+
+class UnsupportedDocx(Exception):
+    """The document has a structure the streaming reader doesn't handle"""
+
+
+def main_document_part(archive: zipfile.ZipFile) -> str:
+    """Name of the main document part, from the package relationships"""
+    try:
+        rels = ET.fromstring(archive.read('_rels/.rels'))
+    except KeyError:
+        raise UnsupportedDocx("package has no relationships")
+    for relationship in rels.iter(PACKAGE_RELS):
+        if relationship.get('Type') == OFFICE_DOCUMENT and relationship.get('TargetMode') != 'External':
+            return posixpath.normpath(relationship.get('Target', '').lstrip('/'))
+    raise UnsupportedDocx("package has no main document")
+
+
+def run_text(run) -> str:
+    parts = []
+    for child in run:
+        if child.tag == W + 't':
+            parts.append(child.text or '')
+        elif child.tag == W + 'br':
+            parts.append('\n' if child.get(W + 'type', 'textWrapping') == 'textWrapping' else '')
+        else:
+            parts.append(RUN_CONTENT.get(child.tag, ''))
+    return ''.join(parts)
+
+
+def paragraph_text(paragraph) -> str:
+    parts = []
+    for child in paragraph:
+        if child.tag == W + 'r':
+            parts.append(run_text(child))
+        elif child.tag == W + 'hyperlink':
+            parts.extend(run_text(run) for run in child.iterfind(W + 'r'))
+    return ''.join(parts)
+
+
+def cell_text(cell) -> str:
+    return '\n'.join(paragraph_text(paragraph) for paragraph in cell.iterfind(W + 'p'))
+
+
+def row_text(cells: list) -> str:
+    return ' | '.join(text.strip() for text in cells if text.strip())
+
+
+class TableRows:
+    """
+    Rows of one table, built like python-docx's Table._cells: every cell is
+    repeated for each grid column it spans, a vertically merged continuation
+    repeats the cell one grid row above, and the flat cell sequence is cut
+    into rows of one grid width.
+    """
+
+    def __init__(self, column_count: int):
+        if column_count < 1:
+            raise UnsupportedDocx("table without grid columns")
+        self.column_count = column_count
+        self.rows_seen = 0
+        self.rows_built = 0
+        self.cells_seen = 0
+        self.previous_row = []
+        self.current_row = []
+        self.held = deque()
+
+    def add_row(self, row) -> list:
+        """Consume one w:tr and return the texts of the rows that are now complete"""
+        self.rows_seen += 1
+        for cell in row.iterfind(W + 'tc'):
+            span = 1
+            merge = None
+            properties = cell.find(W + 'tcPr')
+            if properties is not None:
+                grid_span = properties.find(W + 'gridSpan')
+                if grid_span is not None:
+                    span = int(grid_span.get(W + 'val'))
+                v_merge = properties.find(W + 'vMerge')
+                if v_merge is not None:
+                    merge = v_merge.get(W + 'val', 'continue')
+            text = None
+            for span_index in range(span):
+                if merge == 'continue':
+                    if self.cells_seen < self.column_count:
+                        raise UnsupportedDocx("vertical merge in the first grid row")
+                    # Same position in the previous grid row
+                    self._append(self.previous_row[len(self.current_row)])
+                elif span_index > 0:
+                    self._append(text)
+                else:
+                    text = cell_text(cell)
+                    self._append(text)
+        return self._release()
+
+    def _append(self, text: str) -> None:
+        self.current_row.append(text)
+        self.cells_seen += 1
+        if len(self.current_row) == self.column_count:
+            self.held.append(self.current_row)
+            self.previous_row = self.current_row
+            self.current_row = []
+
+    def _release(self, total_rows: int = None) -> list:
+        # python-docx only shows as many grid rows as the table has w:tr elements
+        limit = self.rows_seen if total_rows is None else total_rows
+        released = []
+        while self.held and self.rows_built < limit:
+            released.append(row_text(self.held.popleft()))
+            self.rows_built += 1
+        return released
+
+    def finish(self) -> list:
+        if self.current_row:
+            self.held.append(self.current_row)
+            self.current_row = []
+        return self._release(self.rows_seen)
+
+
+def iter_docx_blocks(file_path: str):
+    """Yield stripped body paragraphs and ' | '-joined table rows in document order, skipping empty ones"""
+    with zipfile.ZipFile(file_path) as archive:
+        part = main_document_part(archive)
+        try:
+            stream = archive.open(part)
+        except KeyError:
+            raise UnsupportedDocx(f"missing part {part}")
+
+        with stream:
+            depth = 0
+            body = None
+            table = None
+            rows = None
+            for event, element in ET.iterparse(stream, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    if depth == 2 and element.tag == W + 'body':
+                        body = element
+                    elif depth == 3 and body is not None and element.tag == W + 'tbl':
+                        table = element
+                    continue
+
+                depth -= 1
+                if table is not None and depth == 3:
+                    # A direct child of a top-level table just ended
+                    if element.tag == W + 'tblGrid':
+                        rows = TableRows(len(element.findall(W + 'gridCol')))
+                    elif element.tag == W + 'tr':
+                        if rows is None:
+                            raise UnsupportedDocx("table rows before the table grid")
+                        for text in rows.add_row(element):
+                            if text:
+                                yield text
+                        table.remove(element)
+                elif body is not None and depth == 2:
+                    # A direct child of the body just ended
+                    if element.tag == W + 'p':
+                        text = paragraph_text(element).strip()
+                        if text:
+                            yield text
+                    elif element is table:
+                        if rows is not None:
+                            for text in rows.finish():
+                                if text:
+                                    yield text
+                        table = None
+                        rows = None
+                    body.remove(element)
+                elif depth == 1 and element is body:
+                    body = None
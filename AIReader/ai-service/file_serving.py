@@ -0,0 +1,121 @@
+"""
+Conditional and range responses for immutable files
+
+Starlette's StaticFiles answers every request with the whole file and no
+caching policy. file_response serves one file with a strong ETag and the
+caller's Cache-Control. It answers If-None-Match with 304 and a single
+"bytes=" range with 206 Partial Content, so players can seek and resume
+downloads without fetching the whole file again. If-Range falls back to the
+full file when the client's copy is stale. Multi-range requests get the whole
+file, which the RFC allows.
+"""
+
+import os
+from contextlib import nullcontext
+from typing import Optional
+
+from starlette.responses import Response, StreamingResponse
+
+BLOCK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def strong_etag(tag: str, stat: os.stat_result) -> str:
+    """ETag from the caller's tag plus the file's identity, so a rewritten file never reuses it"""
+    return f'"{tag}-{stat.st_ino:x}-{stat.st_size:x}"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Weak comparison against an If-None-Match list"""
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(',')]
+    return '*' in candidates or any(candidate.removeprefix('W/') == etag for candidate in candidates)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple]:
+    """Inclusive (start, end) of a single byte range, or None to send the whole file"""
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    first, _, last = header[len('bytes='):].strip().partition('-')
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else None
+            if end is not None and end < start:
+                return None
+            if start >= size:
+                raise RangeNotSatisfiable()
+            if end is None:
+                end = size - 1
+        else:
+            suffix = int(last)
+            if suffix == 0 or size == 0:
+                raise RangeNotSatisfiable()
+            start, end = max(size - suffix, 0), size - 1
+    except ValueError:
+        return None
+    return start, min(end, size - 1)
+
+
+def iter_file(file, start: int, length: int, hold):
+    try:
+        with hold:
+            file.seek(start)
+            while length > 0:
+                block = file.read(min(BLOCK_SIZE, length))
+                if not block:
+                    break
+                length -= len(block)
+                yield block
+    finally:
+        file.close()
+
+
+def file_response(method: str, headers, path: str, tag: str, media_type: str, cache_control: str,
+                  hold=None) -> Response:
+    """
+    Response for a GET or HEAD of path; raises FileNotFoundError if it doesn't exist.
+    hold is a context manager kept open while the body is sent (e.g. a pin against deletion).
+    """
+    file = open(path, 'rb')
+    try:
+        stat = os.fstat(file.fileno())
+        etag = strong_etag(tag, stat)
+        size = stat.st_size
+        base_headers = {"etag": etag, "cache-control": cache_control, "accept-ranges": "bytes"}
+
+        if etag_matches(headers.get('if-none-match'), etag):
+            file.close()
+            return Response(status_code=304, headers=base_headers)
+
+        byte_range = None
+        if_range = headers.get('if-range')
+        if if_range is None or if_range.strip() == etag:
+            try:
+                byte_range = parse_range(headers.get('range'), size)
+            except RangeNotSatisfiable:
+                file.close()
+                return Response(status_code=416, headers={**base_headers, "content-range": f"bytes */{size}"})
+    except BaseException:
+        file.close()
+        raise
+
+    status_code = 200
+    start, length = 0, size
+    response_headers = dict(base_headers)
+    if byte_range is not None:
+        start, end = byte_range
+        length = end - start + 1
+        status_code = 206
+        response_headers["content-range"] = f"bytes {start}-{end}/{size}"
+    response_headers["content-length"] = str(length)
+
+    if method == 'HEAD':
+        file.close()
+        return Response(status_code=status_code, headers=response_headers, media_type=media_type)
+    return StreamingResponse(iter_file(file, start, length, hold if hold is not None else nullcontext()),
+                             status_code=status_code, headers=response_headers, media_type=media_type)
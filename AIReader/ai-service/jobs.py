@@ -0,0 +1,299 @@
+"""
+Durable background jobs
+
+Long requests can be submitted as jobs: the request is written to a SQLite
+queue, the caller gets a job id at once and polls the job for its stage,
+progress and result. Resubmitting the same work (same dedupe key) while a job
+for it is queued, running or recently succeeded returns that job instead of
+starting another one; failed jobs can simply be submitted again.
+
+Any service process may run a queued job - claiming it is a single atomic
+UPDATE - and a running job's owner renews its lease with a heartbeat. Jobs
+whose owner stopped renewing (a crashed or killed worker) are requeued and
+picked up again, so a restart continues the queue instead of losing it.
+Every claim counts as an attempt; a job that keeps taking its worker down
+with it is failed after max_attempts instead of being requeued forever.
+Finished jobs are deleted once they are older than the retention period.
+
+Progress updates are written by one background thread per process, so a
+job reporting progress from the event loop never waits for SQLite; only
+the latest pending update of each job is written.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+
+from structured_log import get_logger, log_fields
+
+logger = get_logger("jobs")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    dedupe_key TEXT NOT NULL,
+    request TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stage TEXT,
+    done INTEGER NOT NULL DEFAULT 0,
+    total INTEGER,
+    unit TEXT,
+    result TEXT,
+    error TEXT,
+    status_code INTEGER,
+    owner TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key, created);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, updated);
+"""
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = 'queued', 'running', 'succeeded', 'failed'
+
+# Progress is written at most this often (stage changes and completion are always written)
+PROGRESS_INTERVAL_SECONDS = 0.5
+
+
+class JobStore:
+    def __init__(self, path: str, lease_seconds: float = 60, retention_seconds: float = 3600,
+                 max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.retention_seconds = retention_seconds
+        self.max_attempts = max_attempts
+        # Identifies this process as the owner of the jobs it runs
+        self.owner = uuid.uuid4().hex
+        self.progress_writer = ProgressWriter(self)
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, and never one inherited from a parent process
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._upgrade(connection)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @staticmethod
+    def _upgrade(connection: sqlite3.Connection) -> None:
+        """Add the columns newer versions need to a database created by an older one"""
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            columns = {row['name'] for row in connection.execute("PRAGMA table_info(jobs)")}
+            if 'attempts' not in columns:
+                connection.execute("ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def submit(self, job_type: str, dedupe_key: str, request: dict,
+               reusable: Optional[Callable[[dict], bool]] = None) -> tuple:
+        """
+        (job, created): the live or recently succeeded job for dedupe_key, or a new queued one
+        reusable(job) can reject a succeeded job whose result is gone, so the work runs again.
+        """
+        connection = self._connection()
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE dedupe_key = ? AND status != ? ORDER BY created DESC LIMIT 1",
+                (dedupe_key, FAILED),
+            ).fetchone()
+            if row is not None:
+                job = self._job(row)
+                if job["status"] != SUCCEEDED or reusable is None or reusable(job):
+                    connection.execute("COMMIT")
+                    return job, False
+            job_id = uuid.uuid4().hex
+            connection.execute(
+                "INSERT INTO jobs (id, type, dedupe_key, request, status, created, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, job_type, dedupe_key, json.dumps(request), QUEUED, now, now),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return self.get(job_id), True
+
+    def claim(self, job_id: str) -> Optional[dict]:
+        """Mark a queued job as running in this process; None if another process got it first"""
+        claimed = self._connection().execute(
+            "UPDATE jobs SET status = ?, owner = ?, attempts = attempts + 1, updated = ? WHERE id = ? AND status = ?",
+            (RUNNING, self.owner, time.time(), job_id, QUEUED),
+        ).rowcount
+        return self.get(job_id) if claimed else None
+
+    def progress(self, job_id: str, done: int, total: Optional[int], stage: str, unit: Optional[str]) -> None:
+        self._connection().execute(
+            "UPDATE jobs SET done = ?, total = ?, stage = ?, unit = ?, updated = ? WHERE id = ? AND status = ?",
+            (done, total, stage, unit, time.time(), job_id, RUNNING),
+        )
+
+    def succeed(self, job_id: str, result: dict) -> None:
+        self._connection().execute(
+            # A finished job is all done, even if it never reported counts (then it was one step)
+            "UPDATE jobs SET status = ?, stage = NULL, result = ?, done = COALESCE(total, MAX(done, 1)), "
+            "total = COALESCE(total, MAX(done, 1)), updated = ? WHERE id = ?",
+            (SUCCEEDED, json.dumps(result), time.time(), job_id),
+        )
+
+    def fail(self, job_id: str, status_code: int, error: str) -> None:
+        self._connection().execute(
+            "UPDATE jobs SET status = ?, stage = NULL, status_code = ?, error = ?, updated = ? WHERE id = ?",
+            (FAILED, status_code, error, time.time(), job_id),
+        )
+
+    def release(self, job_ids: list) -> None:
+        """Put this process's unfinished jobs back in the queue (on shutdown); that claim wasn't a failed attempt"""
+        self._connection().executemany(
+            "UPDATE jobs SET status = ?, owner = NULL, attempts = attempts - 1, updated = ? "
+            "WHERE id = ? AND owner = ? AND status = ?",
+            [(QUEUED, time.time(), job_id, self.owner, RUNNING) for job_id in job_ids],
+        )
+
+    def heartbeat(self) -> None:
+        self._connection().execute(
+            "UPDATE jobs SET updated = ? WHERE owner = ? AND status = ?", (time.time(), self.owner, RUNNING)
+        )
+
+    def recover(self) -> list:
+        """
+        Requeue jobs whose owner stopped renewing its lease (failing those out of attempts),
+        purge expired ones; ids of all queued jobs
+        """
+        connection = self._connection()
+        now = time.time()
+        expired = now - self.lease_seconds
+        abandoned = [row['id'] for row in connection.execute(
+            "SELECT id FROM jobs WHERE status = ? AND updated < ? AND attempts >= ?",
+            (RUNNING, expired, self.max_attempts))]
+        for job_id in abandoned:
+            logger.warning("job abandoned", extra=log_fields(jobId=job_id, attempts=self.max_attempts))
+        connection.executemany(
+            "UPDATE jobs SET status = ?, stage = NULL, owner = NULL, status_code = ?, error = ?, updated = ? "
+            "WHERE id = ? AND status = ? AND updated < ?",
+            [(FAILED, 500, f"Job stopped its worker {self.max_attempts} times; giving up", now,
+              job_id, RUNNING, expired) for job_id in abandoned],
+        )
+        connection.execute(
+            "UPDATE jobs SET status = ?, owner = NULL WHERE status = ? AND updated < ? AND attempts < ?",
+            (QUEUED, RUNNING, expired, self.max_attempts),
+        )
+        connection.execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND updated < ?",
+            (SUCCEEDED, FAILED, now - self.retention_seconds),
+        )
+        return [row['id'] for row in connection.execute(
+            "SELECT id FROM jobs WHERE status = ? ORDER BY created", (QUEUED,))]
+
+    def get(self, job_id: str) -> Optional[dict]:
+        row = self._connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row is not None else None
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> dict:
+        return {
+            "id": row['id'],
+            "type": row['type'],
+            "request": json.loads(row['request']),
+            "status": row['status'],
+            "stage": row['stage'],
+            "done": row['done'],
+            "total": row['total'],
+            "unit": row['unit'],
+            "result": json.loads(row['result']) if row['result'] is not None else None,
+            "error": row['error'],
+            "statusCode": row['status_code'],
+            "attempts": row['attempts'],
+            "created": row['created'],
+            "updated": row['updated'],
+        }
+
+    def stats(self) -> dict:
+        counts = dict(self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {status: counts.get(status, 0) for status in (QUEUED, RUNNING, SUCCEEDED, FAILED)}
+
+
+class ProgressWriter:
+    """Writes progress updates on a background thread, latest update per job only"""
+
+    def __init__(self, store: JobStore):
+        self.store = store
+        self._pending = {}
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def put(self, job_id: str, done: int, total: Optional[int], stage: str, unit: Optional[str]) -> None:
+        with self._condition:
+            self._pending[job_id] = (done, total, stage, unit)
+            # Started on first use, and again in a forked child (threads don't survive a fork)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="job-progress", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                pending, self._pending = self._pending, {}
+            for job_id, (done, total, stage, unit) in pending.items():
+                try:
+                    self.store.progress(job_id, done, total, stage, unit)
+                except sqlite3.Error:
+                    # Progress is informational; the next update (or the result) will get through
+                    logger.warning("job progress write failed", extra=log_fields(jobId=job_id), exc_info=True)
+
+
+class Progress:
+    """
+    progress(done, total) callback for one running job; safe to call from any
+    thread, and cheap to call often since writes are throttled and made by the
+    store's progress writer thread
+    """
+
+    def __init__(self, store: JobStore, job_id: str):
+        self.store = store
+        self.job_id = job_id
+        self.stage_name = None
+        self.unit = None
+        self.done = 0
+        self.total = None
+        self._written = 0.0
+        self._lock = threading.Lock()
+
+    def stage(self, name: str, unit: Optional[str] = None, total: Optional[int] = None) -> None:
+        """Start a stage; one without a unit of its own (e.g. summarizing) keeps the previous counts"""
+        with self._lock:
+            self.stage_name = name
+            if unit is not None:
+                self.unit, self.done, self.total = unit, 0, total
+            self._write()
+
+    def __call__(self, done: int, total: Optional[int] = None) -> None:
+        with self._lock:
+            self.done, self.total = done, total
+            if done == total or time.monotonic() - self._written >= PROGRESS_INTERVAL_SECONDS:
+                self._write()
+
+    def _write(self) -> None:
+        self._written = time.monotonic()
+        self.store.progress_writer.put(self.job_id, self.done, self.total, self.stage_name, self.unit)
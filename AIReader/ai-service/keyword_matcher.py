@@ -0,0 +1,63 @@
+"""
+Compiled multi-keyword matcher
+
+A vocabulary is folded into one trie-shaped regex at import time, so finding
+every keyword in a document is a single scan whose cost grows with the text,
+not with the number of keywords. Matching is plain substring containment,
+exactly like the `keyword in text` checks it replaces: 'go' matches inside
+'good' and 'express' inside 'expressive'.
+"""
+
+import re
+from typing import Iterable, Optional
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """Regex alternation of words with shared prefixes factored out"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # Greedy optional: the longest keyword at a position wins
+            return ('(?:' + body + ')' if len(branches) == 1 else body) + '?'
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = frozenset(keyword.lower() for keyword in keywords)
+        pattern = trie_pattern(self.keywords)
+        # Zero-width lookahead tried at every position, so overlapping hits ('test' in 'unit test') are all seen
+        self._scanner = re.compile(r'(?=(' + pattern + r'))')
+        # The longest keyword at a position wins, so its shorter prefixes ('java' in 'javascript') are implied
+        self._implied = {
+            keyword: [prefix for prefix in self.keywords if prefix != keyword and keyword.startswith(prefix)]
+            for keyword in self.keywords
+        }
+
+    def scan(self, text: str) -> dict:
+        """Map every keyword found in lower-cased text to the position of its first hit"""
+        hits = {}
+        for match in self._scanner.finditer(text):
+            keyword = match.group(1)
+            if keyword not in hits:
+                hits[keyword] = match.start()
+                for prefix in self._implied[keyword]:
+                    hits.setdefault(prefix, match.start())
+        return hits
+
+    def search(self, text: str) -> Optional[str]:
+        """First keyword in lower-cased text, or None"""
+        match = self._scanner.search(text)
+        return match.group(1) if match else None
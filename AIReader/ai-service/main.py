@@ -1,308 +1,854 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse, PlainTextResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 import os
 import asyncio
 from pathlib import Path
-import PyPDF2
-import docx
-from pptx import Presentation
-import requests
 import json
-from gtts import gTTS
-import uuid
+import logging
+import importlib
+import io
+import itertools
+import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+# Memory-mapped text reading with encoding detection and a size cap
+from text_reader import TextTooLarge, iter_text, read_text, check_size as check_text_size
+
+# Streaming DOCX reader (python-docx is the fallback)
+from docx_stream import iter_docx_blocks
+
+# Slide-XML PPTX reader (python-pptx is the fallback)
+from pptx_xml import extract_slides as extract_pptx_xml_slides
+
+# Compiled PDF word-repair tables
+from pdf_repair import SPECIFIC_FIXES_CHAIN, REPLACEMENTS_CHAIN
+
+# Linear-time regex compilation and cooperative CPU deadlines
+import safe_regex
+from deadline import check_deadline
 
 # Import advanced universal analyzer
 from advanced_universal_analyzer import analyze_code_advanced_universal
 
+# Single-scan keyword matching for summaries
+from keyword_matcher import KeywordMatcher
+
+# Bounded-memory sentence and keyword collection for summaries
+from summary_stream import collect as collect_summary_input
+
+# Worker pools for blocking extraction, analysis and TTS
+from worker_pool import PoolBusy, WorkerPool
+
+# Content-addressed storage for generated audio
+from audio_cache import AudioCache
+
+# ETag, Cache-Control and Range support for serving audio files
+from file_serving import file_response
+
+# Persisted page offsets for page/slide/character range requests
+from page_index import PageIndex, join_pages, virtual_page_spans, pages_for_chars, slice_pages, slice_chars
+
+# Compressed extracted text and derived results shared by all workers and restarts
+from artifact_store import ArtifactStore, ArtifactUnavailable
+
+# Durable job queue for the asynchronous /jobs API
+from jobs import JobStore, Progress
+
+# Per-stage latency histograms, counters and the Server-Timing header
+import metrics
+
+# Sampled JSON logging (replaces print)
+from structured_log import SamplingMiddleware, get_logger, log_fields, setup_logging, shutdown_logging
+
 app = FastAPI(title="AI Document Reader Service", version="1.0.0")
 
+logger = get_logger("main")
+
+worker_pool = WorkerPool(
+    cpu_workers=int(os.environ.get("AI_CPU_WORKERS", os.cpu_count() or 1)),
+    io_workers=int(os.environ.get("AI_IO_WORKERS", 8)),
+    max_pending=int(os.environ["AI_MAX_PENDING"]) if "AI_MAX_PENDING" in os.environ else None,
+    cpu_budget=float(os.environ.get("AI_CPU_BUDGET_SECONDS", 30)) or None,
+)
+
 # Request models
 class FileProcessRequest(BaseModel):
     filePath: str
     fileName: str
     fileType: str
 
+class BatchProcessRequest(BaseModel):
+    files: List[FileProcessRequest]
+
 class ContentRequest(BaseModel):
     filePath: str
     contentType: str  # 'full' or 'summary'
+    # Optional range: pages (slides for PPTX, virtual pages otherwise) are 1-based and inclusive,
+    # characters are 0-based and end-exclusive
+    pageStart: Optional[int] = None
+    pageEnd: Optional[int] = None
+    charStart: Optional[int] = None
+    charEnd: Optional[int] = None
+    # Stream NDJSON events (pages as they are extracted, then summary sections) instead of one JSON body
+    stream: bool = False
 
 class AudioRequest(BaseModel):
     text: str
     language: str = 'en'
 
+# Code file extensions (always explained rather than summarized)
+CODE_EXTENSIONS = ['.py', '.js', '.java', '.cpp', '.c']
+
 # File processors
 class DocumentProcessor:
     @staticmethod
-    def extract_pdf_text(file_path: str) -> str:
+    def pdf_page_text(page) -> str:
+        metrics.count(metrics.PAGES, 1, format='pdf')
+        page_text = page.extract_text()
+        return DocumentProcessor.repair_pdf_text(page_text) if page_text else ''
+
+    @staticmethod
+    def iter_pdf_pages(file_path: str):
+        """
+        Yield cleaned text one PDF page at a time
+        Repairs run page-locally so peak memory stays proportional to a single page
+        """
+        import PyPDF2
+        
         try:
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page_num, page in enumerate(pdf_reader.pages):
-                    page_text = page.extract_text()
+                for page in pdf_reader.pages:
+                    page_text = DocumentProcessor.pdf_page_text(page)
                     if page_text:
-                        text += page_text + " "
-                
-                # COMPREHENSIVE word fixing - ENHANCED VERSION
-                import re
-                
-                # Step 1: Fix broken words with spaces in middle (SUPER ENHANCED)
-                # Multiple passes for complex patterns
-                
-                # Pass 1: Fix 3-part broken words like "Det a iled" -> "Detailed"
-                text = re.sub(r'([A-Z][a-z]{1,3})\s+([a-z]{1,3})\s+([a-z]{1,5})', r'\1\2\3', text)
-                
-                # Pass 2: Fix 2-part broken words like "T ask" -> "Task"  
-                text = re.sub(r'([A-Z])\s+([a-z]{3,})', r'\1\2', text)
-                
-                # Pass 3: Fix common patterns like "Man a gement" -> "Management"
-                text = re.sub(r'([A-Za-z]{3,})\s+([a-z]{1,5})([A-Za-z])', r'\1\2\3', text)
-                text = re.sub(r'([A-Za-z]{3,})\s+([a-z]{1,5})\s+([A-Za-z])', r'\1\2 \3', text)
-                
-                # Pass 4: Aggressive specific fixes (case-insensitive)
-                specific_fixes = [
-                    ('Det a iled', 'Detailed'),
-                    ('det a iled', 'detailed'),
-                    ('T ask', 'Task'),
-                    ('t ask', 'task'),
-                    ('Br e a kdown', 'Breakdown'),
-                    ('br e a kdown', 'breakdown'),
-                    ('Man a gement', 'Management'),
-                    ('man a gement', 'management'),
-                    ('F ullstack', 'Fullstack'),
-                    ('f ullstack', 'fullstack'),
-                    ('R eact', 'React'),
-                    ('r eact', 'react'),
-                    ('V ite', 'Vite'),
-                    ('v ite', 'vite'),
-                    ('e xpert', 'expert'),
-                    ('po wered', 'powered'),
-                    ('Git Hub', 'GitHub'),
-                    ('git hub', 'github'),
-                    ('Builda', 'Build a'),
-                    ('builda', 'build a'),
-                    ('needa', 'need a'),
-                    ('whois', 'who is'),
-                    ('Systemwith', 'System with'),
-                    ('systemwith', 'system with')
-                ]
-                
-                for broken, fixed in specific_fixes:
-                    text = text.replace(broken, fixed)
-                
-                # Step 2: Fix words stuck together with 'a': "BuildaFullstack" -> "Build a Fullstack"
-                text = re.sub(r'([a-z])a([A-Z][a-z]+)', r'\1 a \2', text)
-                text = re.sub(r'([a-z])a([a-z]{4,})', r'\1 a \2', text)
-                
-                # Step 3: Fix camelCase words: "needadeveloper" -> "need a developer"
-                text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
-                
-                # Step 4: Fix words stuck together: "whoisane" -> "who is an e"
-                text = re.sub(r'([a-z]{3,})is([a-z]{2,})', r'\1 is \2', text)
-                text = re.sub(r'([a-z]{3,})be([a-z]{3,})', r'\1 be \2', text)
-                text = re.sub(r'([a-z]{3,})the([a-z]{3,})', r'\1 the \2', text)
-                text = re.sub(r'([a-z]{3,})to([a-z]{3,})', r'\1 to \2', text)
-                text = re.sub(r'([a-z]{3,})for([a-z]{3,})', r'\1 for \2', text)
-                text = re.sub(r'([a-z]{3,})with([a-z]{3,})', r'\1 with \2', text)
-                text = re.sub(r'([a-z]{3,})and([a-z]{3,})', r'\1 and \2', text)
-                
-                # Step 5: Fix specific common broken patterns
-                replacements = {
-                    # Broken words with spaces
-                    'Manag ement': 'Management',
-                    'manag ement': 'management',
-                    'Enquiry Manag ement': 'Enquiry Management',
-                    'Authen tication': 'Authentication',
-                    'authen tication': 'authentication',
-                    'Authoriza tion': 'Authorization',
-                    'authoriza tion': 'authorization',
-                    'Deplo yment': 'Deployment',
-                    'deplo yment': 'deployment',
-                    'Documen tation': 'Documentation',
-                    'documen tation': 'documentation',
-                    'Deliv erables': 'Deliverables',
-                    'deliv erables': 'deliverables',
-                    'Con ﬁgure': 'Configure',
-                    'con ﬁgure': 'configure',
-                    'Workﬂow': 'Workflow',
-                    'workﬂow': 'workflow',
-                    'T esting': 'Testing',
-                    't esting': 'testing',
-                    'gener ating': 'generating',
-                    'r efactoring': 'refactoring',
-                    'collabor ator': 'collaborator',
-                    'dev eloper': 'developer',
-                    'dev elopment': 'development',
-                    'elopmen t': 'elopment',
-                    'middlew are': 'middleware',
-                    'middlew ares': 'middlewares',
-                    'con troller': 'controller',
-                    'con trollers': 'controllers',
-                    'environmen t': 'environment',
-                    'notiﬁca tion': 'notification',
-                    'notiﬁca tions': 'notifications',
-                    'valida tion': 'validation',
-                    'integra tion': 'integration',
-                    'architec ture': 'architecture',
-                    'diagr am': 'diagram',
-                    'creden tials': 'credentials',
-                    'def ault': 'default',
-                    
-                    # Words stuck together
-                    'BuildaFullstack': 'Build a Fullstack',
-                    'needadev': 'need a dev',
-                    'needadeveloper': 'need a developer',
-                    'whoisane': 'who is an e',
-                    'whoisanexpert': 'who is an expert',
-                    'shouldbethe': 'should be the',
-                    'shouldbe': 'should be',
-                    'onlybedoneto': 'only be done to',
-                    'onlybedone': 'only be done',
-                    'shouldproactively': 'should proactively',
-                    'throughoutthepr': 'throughout the pr',
-                    'throughoutthe': 'throughout the',
-                    'withfrontendandbackend': 'with frontend and backend',
-                    'withfrontend': 'with frontend',
-                    'andbackend': 'and backend',
-                    'GitHubrepo': 'GitHub repo',
-                    'Implementroutes': 'Implement routes',
-                    'Handletokenstorage': 'Handle token storage',
-                    'CreateAddEnquiry': 'Create Add Enquiry',
-                    'ReminderforDeveloper': 'Reminder for Developer',
-                    'AI-ﬁrst': 'AI-first',
-                    'dev elopmenttoolsexpertly': 'development tools expertly',
-                    'collabor atorindev': 'collaborator in dev',
-                    'indev': 'in dev',
-                    'ina': 'in a',
-                    'ona': 'on a',
-                    'fora': 'for a',
-                    'witha': 'with a',
-                    'toa': 'to a',
-                    'asa': 'as a',
-                    
-                    # Special characters
-                    'ﬂ': 'fl',
-                    'ﬁ': 'fi',
-                    'ﬀ': 'ff',
-                    'ﬃ': 'ffi',
-                    'ﬄ': 'ffl',
-                }
-                
-                for old, new in replacements.items():
-                    text = text.replace(old, new)
-                
-                # Step 6: Fix remaining broken words with common suffixes
-                text = re.sub(r'([a-z]+)\s+(ment|tion|ing|er|ed|ly|al|ive|ous|ful|ness|able|ible)\b', r'\1\2', text)
-                
-                # Step 7: Clean multiple spaces
-                text = re.sub(r'\s+', ' ', text)
-                
-                return text.strip() if text.strip() else "No text content found in PDF"
+                        yield page_text
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"PDF extraction failed: {str(e)}")
+
+    @staticmethod
+    @metrics.timed("extract")
+    def extract_pdf_pages(file_path: str, start: int = 0, stop: Optional[int] = None) -> tuple:
+        """Cleaned text of pages [start, stop) ('' for pages without text) plus the page count"""
+        import PyPDF2
+        
+        try:
+            with open(file_path, 'rb') as file:
+                pdf_reader = PyPDF2.PdfReader(file)
+                total = len(pdf_reader.pages)
+                stop = total if stop is None else min(stop, total)
+                return [DocumentProcessor.pdf_page_text(pdf_reader.pages[i]) for i in range(start, stop)], total
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"PDF extraction failed: {str(e)}")
 
     @staticmethod
+    @metrics.timed("extract")
+    def extract_pdf_text(file_path: str) -> str:
+        text = ' '.join(DocumentProcessor.iter_pdf_pages(file_path))
+        return text if text else "No text content found in PDF"
+
+    @staticmethod
+    @metrics.timed("pdf_repair")
+    def repair_pdf_text(text: str) -> str:
+        """Fix broken and stuck-together words produced by PDF text extraction"""
+        # COMPREHENSIVE word fixing - ENHANCED VERSION
+        rx = safe_regex.cached
+        check_deadline()
+        
+        # Step 1: Fix broken words with spaces in middle (SUPER ENHANCED)
+        # Multiple passes for complex patterns
+        
+        # Pass 1: Fix 3-part broken words like "Det a iled" -> "Detailed"
+        text = rx(r'([A-Z][a-z]{1,3})\s+([a-z]{1,3})\s+([a-z]{1,5})').sub(r'\1\2\3', text)
+        
+        # Pass 2: Fix 2-part broken words like "T ask" -> "Task"  
+        text = rx(r'([A-Z])\s+([a-z]{3,})').sub(r'\1\2', text)
+        
+        # Pass 3: Fix common patterns like "Man a gement" -> "Management"
+        # (the leading run is copied unchanged, so matching just its last 3 letters gives the
+        # same result as [A-Za-z]{3,} without rescanning the run from every position)
+        text = rx(r'([A-Za-z]{3})\s+([a-z]{1,5})([A-Za-z])').sub(r'\1\2\3', text)
+        text = rx(r'([A-Za-z]{3})\s+([a-z]{1,5})\s+([A-Za-z])').sub(r'\1\2 \3', text)
+        check_deadline()
+        
+        # Pass 4: Aggressive specific fixes (case-insensitive)
+        text = SPECIFIC_FIXES_CHAIN.apply(text)
+        
+        # Step 2: Fix words stuck together with 'a': "BuildaFullstack" -> "Build a Fullstack"
+        text = rx(r'([a-z])a([A-Z][a-z]+)').sub(r'\1 a \2', text)
+        text = rx(r'([a-z])a([a-z]{4,})').sub(r'\1 a \2', text)
+        
+        # Step 3: Fix camelCase words: "needadeveloper" -> "need a developer"
+        text = rx(r'([a-z])([A-Z])').sub(r'\1 \2', text)
+        
+        # Step 4: Fix words stuck together: "whoisane" -> "who is an e"
+        # (a match can only start where a lowercase run starts, so anchor it there)
+        text = rx(r'(?<![a-z])([a-z]{3,})is([a-z]{2,})').sub(r'\1 is \2', text)
+        text = rx(r'(?<![a-z])([a-z]{3,})be([a-z]{3,})').sub(r'\1 be \2', text)
+        text = rx(r'(?<![a-z])([a-z]{3,})the([a-z]{3,})').sub(r'\1 the \2', text)
+        text = rx(r'(?<![a-z])([a-z]{3,})to([a-z]{3,})').sub(r'\1 to \2', text)
+        text = rx(r'(?<![a-z])([a-z]{3,})for([a-z]{3,})').sub(r'\1 for \2', text)
+        text = rx(r'(?<![a-z])([a-z]{3,})with([a-z]{3,})').sub(r'\1 with \2', text)
+        text = rx(r'(?<![a-z])([a-z]{3,})and([a-z]{3,})').sub(r'\1 and \2', text)
+        check_deadline()
+        
+        # Step 5: Fix specific common broken patterns
+        text = REPLACEMENTS_CHAIN.apply(text)
+        
+        # Step 6: Fix remaining broken words with common suffixes (last letter only, as in pass 3)
+        text = rx(r'([a-z])\s+(ment|tion|ing|er|ed|ly|al|ive|ous|ful|ness|able|ible)\b').sub(r'\1\2', text)
+        
+        # Step 7: Clean multiple spaces
+        text = rx(r'\s+').sub(' ', text)
+        
+        return text.strip()
+
+    @staticmethod
+    @metrics.timed("extract")
     def extract_docx_text(file_path: str) -> str:
+        """Paragraphs and table rows in document order, streamed from the XML when possible"""
+        try:
+            text_parts = list(iter_docx_blocks(file_path))
+        except Exception:
+            # Unusual package or table layout (or not a DOCX at all) - let python-docx decide
+            text_parts = DocumentProcessor.docx_blocks_with_python_docx(file_path)
+        
+        text = '\n'.join(text_parts)
+        return text.strip() if text.strip() else "No text content found in document"
+
+    @staticmethod
+    def docx_blocks_with_python_docx(file_path: str) -> list:
+        import docx
+        from docx.text.paragraph import Paragraph
+        
         try:
             doc = docx.Document(file_path)
             text_parts = []
             
-            # Extract paragraphs
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_parts.append(paragraph.text.strip())
-            
-            # Extract tables
-            for table in doc.tables:
-                for row in table.rows:
+            for block in doc.iter_inner_content():
+                if isinstance(block, Paragraph):
+                    if block.text.strip():
+                        text_parts.append(block.text.strip())
+                    continue
+                for row in block.rows:
                     row_text = ' | '.join([cell.text.strip() for cell in row.cells if cell.text.strip()])
                     if row_text:
                         text_parts.append(row_text)
             
-            text = '\n'.join(text_parts)
-            return text.strip() if text.strip() else "No text content found in document"
+            return text_parts
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"DOCX extraction failed: {str(e)}")
 
+    @staticmethod
+    def pptx_slide_text(slide, slide_num: int) -> str:
+        slide_text = []
+        for shape in slide.shapes:
+            if hasattr(shape, "text") and shape.text.strip():
+                slide_text.append(shape.text.strip())
+        return f"Slide {slide_num}: " + ' '.join(slide_text) if slide_text else ''
+
     @staticmethod
     def extract_pptx_text(file_path: str) -> str:
+        slide_texts, _ = DocumentProcessor.extract_pptx_slides(file_path)
+        text = '\n\n'.join(slide_text for slide_text in slide_texts if slide_text)
+        return text.strip() if text.strip() else "No text content found in presentation"
+
+    @staticmethod
+    @metrics.timed("extract")
+    def extract_pptx_slides(file_path: str, start: int = 0, stop: Optional[int] = None) -> tuple:
+        """Text of slides [start, stop) ('' for slides without text) plus the slide count"""
+        try:
+            slide_texts, total = extract_pptx_xml_slides(file_path, start, stop)
+        except Exception:
+            # Unusual package (or not a PPTX at all) - let python-pptx decide
+            slide_texts, total = DocumentProcessor.pptx_slides_with_python_pptx(file_path, start, stop)
+        metrics.count(metrics.PAGES, len(slide_texts), format='pptx')
+        return slide_texts, total
+
+    @staticmethod
+    def pptx_slides_with_python_pptx(file_path: str, start: int = 0, stop: Optional[int] = None) -> tuple:
+        from pptx import Presentation
+        
         try:
             prs = Presentation(file_path)
-            text_parts = []
-            
-            for slide_num, slide in enumerate(prs.slides, 1):
-                slide_text = []
-                for shape in slide.shapes:
-                    if hasattr(shape, "text") and shape.text.strip():
-                        slide_text.append(shape.text.strip())
-                
-                if slide_text:
-                    text_parts.append(f"Slide {slide_num}: " + ' '.join(slide_text))
-            
-            text = '\n\n'.join(text_parts)
-            return text.strip() if text.strip() else "No text content found in presentation"
+            slides = prs.slides
+            total = len(slides)
+            stop = total if stop is None else min(stop, total)
+            return [DocumentProcessor.pptx_slide_text(slides[i], i + 1) for i in range(start, stop)], total
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"PPTX extraction failed: {str(e)}")
 
     @staticmethod
+    def iter_pptx_slides(file_path: str):
+        """Slide texts ('' for slides without text), parsed PPTX_SLIDES_PER_JOB slides at a time"""
+        start, total = 0, None
+        while total is None or start < total:
+            slide_texts, total = DocumentProcessor.extract_pptx_slides(file_path, start, start + PPTX_SLIDES_PER_JOB)
+            if not slide_texts:
+                break
+            yield from slide_texts
+            start += len(slide_texts)
+
+    @staticmethod
+    def iter_document_text(file_path: str, file_extension: str):
+        """
+        The text the extractor returns for a file, as consecutive chunks: pages (slides,
+        paragraphs) and the separators between them, or bounded pieces of a text file
+        """
+        if file_extension == '.pdf':
+            pages = DocumentProcessor.iter_pdf_pages(file_path)
+        elif file_extension == '.pptx':
+            pages = DocumentProcessor.iter_pptx_slides(file_path)
+        elif file_extension in DOCX_EXTENSIONS:
+            pages = iter_docx_blocks(file_path)
+        else:
+            try:
+                yield from iter_text(file_path)
+            except TextTooLarge as e:
+                raise HTTPException(status_code=413, detail=str(e))
+            return
+        yield from iter_joined(pages, PAGE_SEPARATORS[file_extension], EMPTY_DOCUMENT_TEXT[file_extension])
+
+    @staticmethod
+    @metrics.timed("extract")
     def extract_text_file(file_path: str) -> str:
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
+            return read_text(file_path)
+        except TextTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Text file reading failed: {str(e)}")
 
     @staticmethod
+    @metrics.timed("extract")
     def extract_code_file(file_path: str) -> str:
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
+            return read_text(file_path)
+        except TextTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Code file reading failed: {str(e)}")
 
+# Extractor for each supported extension
+EXTRACTORS = {
+    '.pdf': DocumentProcessor.extract_pdf_text,
+    '.docx': DocumentProcessor.extract_docx_text,
+    '.doc': DocumentProcessor.extract_docx_text,
+    '.pptx': DocumentProcessor.extract_pptx_text,
+    '.txt': DocumentProcessor.extract_text_file,
+    **{ext: DocumentProcessor.extract_code_file for ext in CODE_EXTENSIONS},
+}
+
+# Format libraries each extractor imports on first use, so startup only pays for what is served
+FORMAT_LIBRARIES = {
+    '.pdf': ['PyPDF2'],
+    '.docx': ['docx'],
+    '.doc': ['docx'],
+    '.pptx': ['pptx'],
+}
+TTS_LIBRARIES = ['gtts']
+
+DOCX_EXTENSIONS = ('.docx', '.doc')
+
+# What the full-text extractors put between pages, slides and paragraphs
+PAGE_SEPARATORS = {'.pdf': ' ', '.pptx': '\n\n', '.docx': '\n', '.doc': '\n'}
+
+# Formats with real pages: page extractor and the separator the full-text extractor joins pages with
+PAGED_EXTRACTORS = {
+    '.pdf': (DocumentProcessor.extract_pdf_pages, PAGE_SEPARATORS['.pdf']),
+    '.pptx': (DocumentProcessor.extract_pptx_slides, PAGE_SEPARATORS['.pptx']),
+}
+
+# Text shown when a document has no text at all
+EMPTY_DOCUMENT_TEXT = {
+    '.pdf': "No text content found in PDF",
+    '.pptx': "No text content found in presentation",
+    '.docx': "No text content found in document",
+    '.doc': "No text content found in document",
+}
+
+def iter_joined(page_texts, separator: str, empty_text: str):
+    """separator.join() of the non-empty page texts (empty_text if there are none), piece by piece"""
+    empty = True
+    for page_text in page_texts:
+        if page_text:
+            if not empty:
+                yield separator
+            yield page_text
+            empty = False
+    if empty:
+        yield empty_text
+
+def extract_with_pages(file_path: str, file_extension: str) -> tuple:
+    """Full text plus the [start, end] span of every page (virtual pages for unpaged formats)"""
+    metrics.count(metrics.BYTES, os.path.getsize(file_path), kind='extracted')
+    if file_extension in PAGED_EXTRACTORS:
+        extract_pages, separator = PAGED_EXTRACTORS[file_extension]
+        page_texts, _ = extract_pages(file_path)
+        text, spans = join_pages(page_texts, separator)
+        return (text if text else EMPTY_DOCUMENT_TEXT[file_extension]), spans
+    text = EXTRACTORS[file_extension](file_path)
+    return text, virtual_page_spans(text)
+
+# Bump whenever extractor output changes so stale cache entries are never served
+EXTRACTOR_VERSION = 4
+
+# Extraction cache
+class ExtractionCache:
+    """
+    LRU cache of extracted text keyed by file content hash
+    A document is parsed once no matter how many endpoints touch it
+    """
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.total_chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    @metrics.timed("read")
+    def file_digest(file_path: str) -> str:
+        digest = hashlib.sha256()
+        size = 0
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(block)
+                size += len(block)
+        metrics.count(metrics.BYTES, size, kind='read')
+        return digest.hexdigest()
+
+    def key_for(self, file_path: str, file_extension: str) -> str:
+        return f"{self.file_digest(file_path)}:{file_extension}:v{EXTRACTOR_VERSION}"
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, key: str, text: str) -> None:
+        # Never let one huge document flush the whole cache
+        if len(text) > self.max_chars:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_chars -= len(previous)
+            self._entries[key] = text
+            self.total_chars += len(text)
+            while self.total_chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_chars -= len(evicted)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "totalChars": self.total_chars,
+                "maxChars": self.max_chars,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+extraction_cache = ExtractionCache(int(os.environ.get("AI_EXTRACTION_CACHE_CHARS", 50_000_000)))
+
+page_index = PageIndex(
+    os.environ.get("AI_PAGE_INDEX_DIR", "cache/page-index"),
+    max_files=int(os.environ.get("AI_PAGE_INDEX_MAX_FILES", 20000)),
+)
+
+artifact_store = ArtifactStore(
+    os.environ.get("AI_ARTIFACT_DB", "cache/artifacts.sqlite3"),
+    int(os.environ.get("AI_ARTIFACT_MAX_BYTES", 2 * 1024 * 1024 * 1024)),
+)
+
+# Summary engine: 'rules' (keyword and position rules) or 'tfidf' (extractive TF-IDF scoring, needs NumPy)
+SUMMARIZER = os.environ.get("AI_SUMMARIZER", "rules").lower()
+if SUMMARIZER not in ('rules', 'tfidf'):
+    raise ValueError(f"AI_SUMMARIZER must be 'rules' or 'tfidf', got {SUMMARIZER!r}")
+# Imported only when selected, so the default engine doesn't need NumPy (see requirements-tfidf.txt)
+tfidf_summarizer = None
+if SUMMARIZER == 'tfidf':
+    try:
+        tfidf_summarizer = importlib.import_module('tfidf_summarizer')
+    except ImportError as e:
+        raise ImportError("AI_SUMMARIZER=tfidf requires numpy (pip install -r requirements-tfidf.txt)") from e
+
+# Bump whenever summarize_text or the code analyzer output changes so stale stored results are never served
+SUMMARY_VERSION = 2
+EXPLANATION_VERSION = 1
+# Summaries of each engine are stored apart
+SUMMARY_KIND = (f"summary:v{SUMMARY_VERSION}" if tfidf_summarizer is None
+                else f"summary:{SUMMARIZER}:v{tfidf_summarizer.VERSION}")
+
+async def content_key(file_path: str, file_extension: str) -> str:
+    if file_extension not in EXTRACTORS:
+        raise HTTPException(status_code=400, detail="Unsupported file type")
+    if file_extension == '.txt' or file_extension in CODE_EXTENSIONS:
+        # Refuse oversized text files before spending time hashing them
+        try:
+            check_text_size(file_path)
+        except TextTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+    return await worker_pool.run_io(extraction_cache.key_for, file_path, file_extension)
+
+async def cached_content(key: str) -> Optional[str]:
+    """Extracted text from memory, or from the artifact store (then kept in memory too)"""
+    content = extraction_cache.get(key)
+    if content is None:
+        content = await worker_pool.run_io(artifact_store.get, key, 'text')
+        if content is not None:
+            extraction_cache.put(key, content)
+    return content
+
+async def store_content(key: str, content: str) -> None:
+    extraction_cache.put(key, content)
+    await worker_pool.run_io(artifact_store.put, key, 'text', content)
+
+async def extract_content(file_path: str, file_extension: str, key: Optional[str] = None) -> str:
+    """Extract text from a file in the worker pool, reusing the cached or stored result for identical content"""
+    key = key or await content_key(file_path, file_extension)
+    content = await cached_content(key)
+    if content is None:
+        # Record page offsets on the way so later range requests can skip full extraction
+        if file_extension == '.pptx':
+            content, spans = await extract_slides_parallel(file_path)
+        else:
+            content, spans = await worker_pool.run_cpu(extract_with_pages, file_path, file_extension)
+        await worker_pool.run_io(page_index.put, key, spans)
+        await store_content(key, content)
+    return content
+
+# Slides per CPU job when a whole deck is extracted; larger decks are split across the workers
+PPTX_SLIDES_PER_JOB = int(os.environ.get("AI_PPTX_SLIDES_PER_JOB", 64))
+
+async def extract_slides_parallel(file_path: str) -> tuple:
+    """Whole-deck text and slide spans, like extract_with_pages, with slide ranges parsed concurrently"""
+    extract_slides, separator = PAGED_EXTRACTORS['.pptx']
+    metrics.count(metrics.BYTES, os.path.getsize(file_path), kind='extracted')
+    slide_texts, total = await worker_pool.run_cpu(extract_slides, file_path, 0, PPTX_SLIDES_PER_JOB)
+    
+    # The rest of the deck in at most one job per CPU worker
+    remaining = total - len(slide_texts)
+    step = max(PPTX_SLIDES_PER_JOB, -(-remaining // max(worker_pool.cpu_workers, 1)))
+    batches = await asyncio.gather(*(worker_pool.run_cpu(extract_slides, file_path, start, start + step)
+                                     for start in range(len(slide_texts), total, step)))
+    for texts, _ in batches:
+        slide_texts.extend(texts)
+    
+    text, spans = join_pages(slide_texts, separator)
+    return (text if text else EMPTY_DOCUMENT_TEXT['.pptx']), spans
+
+# (key, kind) -> task computing that derived result, shared by every request (and precomputation) that needs it
+derived_jobs = {}
+
+async def derived_content(key: Optional[str], kind: str, func, *args) -> str:
+    """
+    Result of func(*args) in the CPU pool, persisted in the artifact store under
+    (key, kind); key is None for results that shouldn't be stored (e.g. of a range)
+    """
+    if key is None:
+        return await worker_pool.run_cpu(func, *args)
+    job = derived_jobs.get((key, kind))
+    if job is None:
+        stored = await worker_pool.run_io(artifact_store.get, key, kind)
+        if stored is not None:
+            return stored
+        job = derived_jobs.get((key, kind))
+        if job is None:
+            job = asyncio.ensure_future(compute_derived(key, kind, func, *args))
+            derived_jobs[(key, kind)] = job
+            job.add_done_callback(lambda _: derived_jobs.pop((key, kind), None))
+    # A caller that goes away doesn't cancel the job for the others
+    return await asyncio.shield(job)
+
+async def compute_derived(key: str, kind: str, func, *args) -> str:
+    result = await worker_pool.run_cpu(func, *args)
+    await worker_pool.run_io(artifact_store.put, key, kind, result)
+    return result
+
+async def process_content(key: Optional[str], file_path: str, file_extension: str, content_type: str,
+                          content: Optional[str] = None) -> str:
+    """
+    Code explanation, summary or the content itself, as /get-content returns it
+    content is the text of a range (key None); whole documents are loaded (or, for
+    summaries, read page by page in the worker) only as needed.
+    """
+    if file_extension not in CODE_EXTENSIONS and content_type == 'summary':
+        if key is None:
+            return await derived_content(None, SUMMARY_KIND, AIProcessor.summarize_text, content)
+        return await derived_content(key, SUMMARY_KIND, AIProcessor.summarize_document, key, file_path, file_extension)
+    if content is None:
+        content = await extract_content(file_path, file_extension, key)
+    if file_extension in CODE_EXTENSIONS:
+        # For code files, always explain the code
+        return await derived_content(key, f"explanation:v{EXPLANATION_VERSION}",
+                                     AIProcessor.explain_code, content, file_extension)
+    return content
+
+# Background summaries (code explanations for code files) started by /process-file, and how many run at once
+PRECOMPUTE = os.environ.get("AI_PRECOMPUTE", "1") != "0"
+PRECOMPUTE_CONCURRENCY = int(os.environ.get("AI_PRECOMPUTE_CONCURRENCY", max(worker_pool.cpu_workers, 1)))
+precompute_slots = asyncio.Semaphore(PRECOMPUTE_CONCURRENCY)
+precompute_tasks = set()
+
+def schedule_precompute(key: str, file_path: str, file_extension: str) -> None:
+    """Compute and store the summary of freshly extracted content, so the follow-up /get-content is a stored hit"""
+    if not PRECOMPUTE:
+        return
+    task = asyncio.ensure_future(precompute(key, file_path, file_extension))
+    precompute_tasks.add(task)
+    task.add_done_callback(precompute_done)
+
+async def precompute(key: str, file_path: str, file_extension: str) -> None:
+    async with precompute_slots:
+        # Summaries read the stored text in the worker; code is loaded only now, so queued ones don't hold it
+        await process_content(key, file_path, file_extension, 'summary')
+
+def precompute_done(task: asyncio.Task) -> None:
+    precompute_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        error = task.exception()
+        logger.warning("precompute failed", extra=log_fields(
+            error=error.detail if isinstance(error, HTTPException) else str(error)))
+
+async def extract_range(request: ContentRequest, file_extension: str) -> tuple:
+    """
+    Text of the requested page or character range plus a description of the range
+    PDF and PPTX page ranges only parse the pages asked for; character ranges use
+    the persisted page index to do the same once a document has been seen.
+    """
+    file_path = request.filePath
+    key = await content_key(file_path, file_extension)
+    paged = PAGED_EXTRACTORS.get(file_extension)
+    cached = await cached_content(key)
+    
+    if request.pageStart is not None or request.pageEnd is not None:
+        if request.charStart is not None or request.charEnd is not None:
+            raise HTTPException(status_code=400, detail="Request either a page range or a character range, not both")
+        start = request.pageStart or 1
+        end = request.pageEnd or start
+        if start < 1 or end < start:
+            raise HTTPException(status_code=400, detail="Invalid page range")
+        
+        spans = await worker_pool.run_io(page_index.get, key)
+        if paged and (cached is None or spans is None):
+            extract_pages, separator = paged
+            page_texts, total = await worker_pool.run_cpu(extract_pages, file_path, start - 1, end)
+            text = join_pages(page_texts, separator)[0]
+        else:
+            if cached is None or spans is None:
+                cached = await extract_content(file_path, file_extension, key)
+                spans = await worker_pool.run_io(page_index.get, key) or virtual_page_spans(cached)
+            total = len(spans)
+            text = slice_pages(cached, spans, start - 1, end)
+        
+        if start > total:
+            raise HTTPException(status_code=416, detail=f"Page {start} is out of range (document has {total})")
+        unit = 'slide' if file_extension == '.pptx' else 'page'
+        return text, {"unit": unit, "start": start, "end": min(end, total), "total": total}
+    
+    start = request.charStart or 0
+    end = request.charEnd
+    if start < 0 or (end is not None and end < start):
+        raise HTTPException(status_code=400, detail="Invalid character range")
+    
+    spans = await worker_pool.run_io(page_index.get, key) if cached is None and paged else None
+    if spans is not None:
+        total = spans[-1][1] if spans else 0
+        start, end = min(start, total), total if end is None else max(min(end, total), min(start, total))
+        first, last = pages_for_chars(spans, start, end)
+        extract_pages, separator = paged
+        page_texts, _ = await worker_pool.run_cpu(extract_pages, file_path, first, last) if last > first else ([], 0)
+        text = slice_chars(page_texts, spans, first, last, separator, start, end)
+    else:
+        if cached is None:
+            cached = await extract_content(file_path, file_extension, key)
+        total = len(cached)
+        start, end = min(start, total), total if end is None else max(min(end, total), min(start, total))
+        text = cached[start:end]
+    return text, {"unit": "char", "start": start, "end": end, "total": total}
+
+# Summary vocabularies (compiled once into keyword matchers below)
+PROJECT_INDICATORS = ['project', 'system', 'application', 'platform', 'website', 'portal', 'tool', 'software']
+
+TECH_MAPPING = {
+    # Frontend
+    'react': ('Frontend', 'React'), 'angular': ('Frontend', 'Angular'), 'vue': ('Frontend', 'Vue.js'),
+    'vite': ('Frontend', 'Vite'), 'next': ('Frontend', 'Next.js'), 'typescript': ('Frontend', 'TypeScript'),
+    'javascript': ('Frontend', 'JavaScript'), 'html': ('Frontend', 'HTML'), 'css': ('Frontend', 'CSS'),
+    'tailwind': ('Frontend', 'Tailwind CSS'), 'bootstrap': ('Frontend', 'Bootstrap'),
+    'material': ('Frontend', 'Material UI'), 'radix': ('Frontend', 'Radix UI'),
+
+    # Backend
+    'node': ('Backend', 'Node.js'), 'express': ('Backend', 'Express'), 'django': ('Backend', 'Django'),
+    'flask': ('Backend', 'Flask'), 'spring': ('Backend', 'Spring Boot'), 'laravel': ('Backend', 'Laravel'),
+    'php': ('Backend', 'PHP'), 'python': ('Backend', 'Python'), 'java': ('Backend', 'Java'),
+    'ruby': ('Backend', 'Ruby'), 'go': ('Backend', 'Go'), 'rust': ('Backend', 'Rust'),
+
+    # Database
+    'mongodb': ('Database', 'MongoDB'), 'mysql': ('Database', 'MySQL'), 'postgresql': ('Database', 'PostgreSQL'),
+    'postgres': ('Database', 'PostgreSQL'), 'redis': ('Database', 'Redis'), 'sqlite': ('Database', 'SQLite'),
+    'oracle': ('Database', 'Oracle'), 'sql': ('Database', 'SQL'), 'nosql': ('Database', 'NoSQL'),
+    'firebase': ('Database', 'Firebase'), 'mongoose': ('Database', 'Mongoose'),
+
+    # Tools & Frameworks
+    'docker': ('Tools & Frameworks', 'Docker'), 'kubernetes': ('Tools & Frameworks', 'Kubernetes'),
+    'aws': ('Tools & Frameworks', 'AWS'), 'azure': ('Tools & Frameworks', 'Azure'),
+    'git': ('Tools & Frameworks', 'Git'), 'github': ('Tools & Frameworks', 'GitHub'),
+    'jenkins': ('Tools & Frameworks', 'Jenkins'), 'nginx': ('Tools & Frameworks', 'Nginx'),
+    'apache': ('Tools & Frameworks', 'Apache'), 'jwt': ('Tools & Frameworks', 'JWT'),
+    'oauth': ('Tools & Frameworks', 'OAuth'), 'graphql': ('Tools & Frameworks', 'GraphQL'),
+    'rest': ('Tools & Frameworks', 'REST API'), 'api': ('Tools & Frameworks', 'API'),
+    'jest': ('Tools & Frameworks', 'Jest'), 'mocha': ('Tools & Frameworks', 'Mocha'),
+    'eslint': ('Tools & Frameworks', 'ESLint'), 'prettier': ('Tools & Frameworks', 'Prettier'),
+    'webpack': ('Tools & Frameworks', 'Webpack'), 'babel': ('Tools & Frameworks', 'Babel')
+}
+
+FEATURE_KEYWORDS = {
+    'Authentication & Authorization': ['authentication', 'login', 'register', 'signup', 'jwt', 'oauth', 'auth', 'authorization'],
+    'CRUD Operations': ['crud', 'create', 'read', 'update', 'delete', 'add', 'edit', 'remove'],
+    'User Management': ['user management', 'user admin', 'user profile', 'account management'],
+    'Dashboard & Analytics': ['dashboard', 'analytics', 'reports', 'statistics', 'metrics', 'visualization'],
+    'Search & Filter': ['search', 'filter', 'query', 'find', 'lookup'],
+    'API Development': ['api', 'rest', 'restful', 'endpoint', 'web service'],
+    'Database Design': ['database', 'schema', 'model', 'entity', 'table', 'collection'],
+    'Security': ['security', 'encryption', 'secure', 'protection', 'safety'],
+    'Testing': ['testing', 'test', 'unit test', 'integration test', 'qa'],
+    'Deployment': ['deployment', 'deploy', 'production', 'hosting', 'server'],
+    'Documentation': ['documentation', 'docs', 'readme', 'guide', 'manual'],
+    'Responsive Design': ['responsive', 'mobile', 'adaptive', 'device'],
+    'Real-time Features': ['real-time', 'realtime', 'live', 'websocket', 'socket'],
+    'File Upload': ['upload', 'file upload', 'image upload', 'attachment'],
+    'Notification System': ['notification', 'alert', 'email', 'sms', 'push'],
+    'Payment Integration': ['payment', 'checkout', 'transaction', 'billing'],
+    'Admin Panel': ['admin', 'admin panel', 'administration', 'backend panel']
+}
+
+AI_TOOLS = {'cursor': 'Cursor', 'copilot': 'GitHub Copilot', 'codeium': 'Codeium', 'tabnine': 'Tabnine'}
+
+EPIC_KEYWORDS = ['project setup', 'authentication', 'user management', 'deployment', 'testing', 'documentation']
+
+DELIVERABLE_KEYWORDS = ['source code', 'docker', 'api documentation', 'api doc', 'test suite', 'testing', 'deployment', 'documentation', 'readme']
+
+STRUCTURE_KEYWORDS = ['component', 'module', 'structure', 'architecture', 'implementation', 'design', 'workflow', 'process', 'method', 'approach', 'technique']
+
+TECHNICAL_KEYWORDS = ['framework', 'library', 'database', 'server', 'client', 'architecture', 'design', 'implementation', 'feature', 'module', 'component']
+
+# One scan over the document finds every document-level keyword
+SUMMARY_KEYWORDS = KeywordMatcher(
+    list(TECH_MAPPING)
+    + [keyword for keywords in FEATURE_KEYWORDS.values() for keyword in keywords]
+    + list(AI_TOOLS) + ['ai', 'ai-first', 'epic']
+    + EPIC_KEYWORDS + DELIVERABLE_KEYWORDS
+)
+PROJECT_MATCHER = KeywordMatcher(PROJECT_INDICATORS)
+STRUCTURE_MATCHER = KeywordMatcher(STRUCTURE_KEYWORDS)
+TECHNICAL_MATCHER = KeywordMatcher(TECHNICAL_KEYWORDS)
+
+# Slice size summarize_text feeds the summarizer, so no full-size copy of the text is ever made
+SUMMARY_CHUNK_CHARS = 1024 * 1024
+
+def text_slices(text: str):
+    return (text[start:start + SUMMARY_CHUNK_CHARS] for start in range(0, len(text), SUMMARY_CHUNK_CHARS))
+
 # AI Processing
 class AIProcessor:
     @staticmethod
+    @metrics.timed("summarize")
     def summarize_text(text: str) -> str:
         """
         INTELLIGENT summarization - Extracts ALL key information comprehensively
         """
-        import re
-        
-        if not text or len(text) < 100:
+        if tfidf_summarizer is not None:
+            return tfidf_summarizer.summarize(text)
+        if not text:
             return text
+        return AIProcessor.summarize_chunks(text_slices(text))
+    
+    @staticmethod
+    @metrics.timed("summarize")
+    def summarize_batch(texts: list) -> list:
+        """Summaries of many documents in one call (one term matrix for all of them with the TF-IDF engine)"""
+        if tfidf_summarizer is not None:
+            return tfidf_summarizer.summarize_batch(texts)
+        return [AIProcessor.summarize_chunks(text_slices(text)) if text else text for text in texts]
+    
+    @staticmethod
+    @metrics.timed("summarize")
+    def summarize_document(key: str, file_path: str, file_extension: str) -> str:
+        """
+        Summary of a whole document, computed in the worker from the stored extracted text
+        (or, before it is stored, the extractor's pages) read as chunks, so no full copy of
+        the text is passed to the worker or built in it
+        """
+        summarize = AIProcessor.summarize_chunks
+        if tfidf_summarizer is not None:
+            # TF-IDF scores every sentence against the whole document, so it needs all of them anyway
+            summarize = lambda chunks: tfidf_summarizer.summarize(''.join(chunks))
         
-        # Clean text thoroughly but preserve important content
-        text = ' '.join(text.split())
-        text = re.sub(r'slide \d+:', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'page \d+', '', text, flags=re.IGNORECASE)
-        
-        # Remove only specific noise patterns, keep project details
-        minimal_noise = ['roll no', 'session 20', 'semester']
-        for pattern in minimal_noise:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+        # Text files are read straight from disk in bounded chunks - cheaper than decompressing the stored copy
+        stored = artifact_store.iter_text(key, 'text') if file_extension != '.txt' else None
+        if stored is not None:
+            try:
+                return summarize(stored)
+            except ArtifactUnavailable:
+                # Replaced or evicted while it was read - start over from the file
+                pass
+        try:
+            return summarize(DocumentProcessor.iter_document_text(file_path, file_extension))
+        except Exception:
+            if file_extension not in DOCX_EXTENSIONS:
+                raise
+            # Unusual package or table layout - start over with python-docx, like extract_docx_text
+            blocks = DocumentProcessor.docx_blocks_with_python_docx(file_path)
+            return summarize(iter_joined(blocks, PAGE_SEPARATORS[file_extension], EMPTY_DOCUMENT_TEXT[file_extension]))
+    
+    @staticmethod
+    def summarize_chunks(chunks) -> str:
+        """
+        Rule-based summary of a document given as consecutive text chunks (pages with
+        their separators, file chunks), keeping only the sentences the summary can use
+        """
+        import re
         
-        full_text = text.lower()
+        # Whitespace collapsed, slide/page markers and noise phrases removed, split into sentences
+        document = collect_summary_input(chunks, SUMMARY_KEYWORDS, STRUCTURE_MATCHER, TECHNICAL_MATCHER)
+        if document.raw_text is not None:
+            return document.raw_text
         
-        # Split into sentences - be more inclusive
-        sentences = [s.strip() for s in text.split('.') if s.strip()]
-        meaningful_sentences = [s for s in sentences if len(s.split()) >= 3]  # Reduced from 5 to 3
+        keyword_hits = document.keyword_hits
+        # Only the first LEADING_SENTENCES meaningful (3+ word) sentences are kept
+        meaningful_sentences = document.leading
         
-        if not meaningful_sentences:
-            return text[:1000] if len(text) > 1000 else text
+        if not document.sentence_count:
+            return document.head
         
         # Build comprehensive summary
         summary_parts = []
         
         # 1. IDENTIFY PROJECT/TOPIC
         # Look for project-related keywords in first 20 sentences
-        project_indicators = ['project', 'system', 'application', 'platform', 'website', 'portal', 'tool', 'software']
         project_sentence = None
         
         for sent in meaningful_sentences[:20]:
-            sent_lower = sent.lower()
-            if any(indicator in sent_lower for indicator in project_indicators):
+            if PROJECT_MATCHER.search(sent.lower()):
                 # This sentence likely describes the project
                 project_sentence = sent
                 break
@@ -349,41 +895,8 @@ class AIProcessor:
             'Tools & Frameworks': []
         }
         
-        tech_mapping = {
-            # Frontend
-            'react': ('Frontend', 'React'), 'angular': ('Frontend', 'Angular'), 'vue': ('Frontend', 'Vue.js'),
-            'vite': ('Frontend', 'Vite'), 'next': ('Frontend', 'Next.js'), 'typescript': ('Frontend', 'TypeScript'),
-            'javascript': ('Frontend', 'JavaScript'), 'html': ('Frontend', 'HTML'), 'css': ('Frontend', 'CSS'),
-            'tailwind': ('Frontend', 'Tailwind CSS'), 'bootstrap': ('Frontend', 'Bootstrap'),
-            'material': ('Frontend', 'Material UI'), 'radix': ('Frontend', 'Radix UI'),
-            
-            # Backend
-            'node': ('Backend', 'Node.js'), 'express': ('Backend', 'Express'), 'django': ('Backend', 'Django'),
-            'flask': ('Backend', 'Flask'), 'spring': ('Backend', 'Spring Boot'), 'laravel': ('Backend', 'Laravel'),
-            'php': ('Backend', 'PHP'), 'python': ('Backend', 'Python'), 'java': ('Backend', 'Java'),
-            'ruby': ('Backend', 'Ruby'), 'go': ('Backend', 'Go'), 'rust': ('Backend', 'Rust'),
-            
-            # Database
-            'mongodb': ('Database', 'MongoDB'), 'mysql': ('Database', 'MySQL'), 'postgresql': ('Database', 'PostgreSQL'),
-            'postgres': ('Database', 'PostgreSQL'), 'redis': ('Database', 'Redis'), 'sqlite': ('Database', 'SQLite'),
-            'oracle': ('Database', 'Oracle'), 'sql': ('Database', 'SQL'), 'nosql': ('Database', 'NoSQL'),
-            'firebase': ('Database', 'Firebase'), 'mongoose': ('Database', 'Mongoose'),
-            
-            # Tools & Frameworks
-            'docker': ('Tools & Frameworks', 'Docker'), 'kubernetes': ('Tools & Frameworks', 'Kubernetes'),
-            'aws': ('Tools & Frameworks', 'AWS'), 'azure': ('Tools & Frameworks', 'Azure'),
-            'git': ('Tools & Frameworks', 'Git'), 'github': ('Tools & Frameworks', 'GitHub'),
-            'jenkins': ('Tools & Frameworks', 'Jenkins'), 'nginx': ('Tools & Frameworks', 'Nginx'),
-            'apache': ('Tools & Frameworks', 'Apache'), 'jwt': ('Tools & Frameworks', 'JWT'),
-            'oauth': ('Tools & Frameworks', 'OAuth'), 'graphql': ('Tools & Frameworks', 'GraphQL'),
-            'rest': ('Tools & Frameworks', 'REST API'), 'api': ('Tools & Frameworks', 'API'),
-            'jest': ('Tools & Frameworks', 'Jest'), 'mocha': ('Tools & Frameworks', 'Mocha'),
-            'eslint': ('Tools & Frameworks', 'ESLint'), 'prettier': ('Tools & Frameworks', 'Prettier'),
-            'webpack': ('Tools & Frameworks', 'Webpack'), 'babel': ('Tools & Frameworks', 'Babel')
-        }
-        
-        for keyword, (category, tech_name) in tech_mapping.items():
-            if keyword in full_text:
+        for keyword, (category, tech_name) in TECH_MAPPING.items():
+            if keyword in keyword_hits:
                 if tech_name not in tech_found[category]:
                     tech_found[category].append(tech_name)
         
@@ -398,28 +911,8 @@ class AIProcessor:
         
         # 4. KEY FEATURES & MODULES
         features_found = []
-        feature_keywords = {
-            'Authentication & Authorization': ['authentication', 'login', 'register', 'signup', 'jwt', 'oauth', 'auth', 'authorization'],
-            'CRUD Operations': ['crud', 'create', 'read', 'update', 'delete', 'add', 'edit', 'remove'],
-            'User Management': ['user management', 'user admin', 'user profile', 'account management'],
-            'Dashboard & Analytics': ['dashboard', 'analytics', 'reports', 'statistics', 'metrics', 'visualization'],
-            'Search & Filter': ['search', 'filter', 'query', 'find', 'lookup'],
-            'API Development': ['api', 'rest', 'restful', 'endpoint', 'web service'],
-            'Database Design': ['database', 'schema', 'model', 'entity', 'table', 'collection'],
-            'Security': ['security', 'encryption', 'secure', 'protection', 'safety'],
-            'Testing': ['testing', 'test', 'unit test', 'integration test', 'qa'],
-            'Deployment': ['deployment', 'deploy', 'production', 'hosting', 'server'],
-            'Documentation': ['documentation', 'docs', 'readme', 'guide', 'manual'],
-            'Responsive Design': ['responsive', 'mobile', 'adaptive', 'device'],
-            'Real-time Features': ['real-time', 'realtime', 'live', 'websocket', 'socket'],
-            'File Upload': ['upload', 'file upload', 'image upload', 'attachment'],
-            'Notification System': ['notification', 'alert', 'email', 'sms', 'push'],
-            'Payment Integration': ['payment', 'checkout', 'transaction', 'billing'],
-            'Admin Panel': ['admin', 'admin panel', 'administration', 'backend panel']
-        }
-        
-        for feature, keywords in feature_keywords.items():
-            if any(kw in full_text for kw in keywords):
+        for feature, keywords in FEATURE_KEYWORDS.items():
+            if any(kw in keyword_hits for kw in keywords):
                 features_found.append(feature)
         
         if features_found:
@@ -429,65 +922,45 @@ class AIProcessor:
                 summary_parts.append(f"Key features include: {', '.join(features_found[:5])} and {len(features_found) - 5} more modules.")
         
         # 5. DEVELOPMENT METHODOLOGY
-        if 'ai' in full_text and any(tool in full_text for tool in ['cursor', 'copilot', 'codeium', 'tabnine', 'ai-first']):
-            ai_tools = []
-            if 'cursor' in full_text:
-                ai_tools.append('Cursor')
-            if 'copilot' in full_text:
-                ai_tools.append('GitHub Copilot')
-            if 'codeium' in full_text:
-                ai_tools.append('Codeium')
-            if 'tabnine' in full_text:
-                ai_tools.append('Tabnine')
+        if 'ai' in keyword_hits and any(tool in keyword_hits for tool in list(AI_TOOLS) + ['ai-first']):
+            ai_tools = [name for tool, name in AI_TOOLS.items() if tool in keyword_hits]
             
             if ai_tools:
                 summary_parts.append(f"The project follows an AI-first development approach using {', '.join(ai_tools)} for enhanced productivity.")
         
         # 6. PROJECT STRUCTURE
-        if 'epic' in full_text:
-            epic_keywords = ['project setup', 'authentication', 'user management', 'deployment', 'testing', 'documentation']
-            epics_found = [epic for epic in epic_keywords if epic in full_text]
+        if 'epic' in keyword_hits:
+            epics_found = [epic for epic in EPIC_KEYWORDS if epic in keyword_hits]
             if epics_found:
                 summary_parts.append(f"Development is structured into multiple epics including {', '.join(epics_found)}.")
         
         # 7. DELIVERABLES
         deliverables = []
-        if 'source code' in full_text:
+        if 'source code' in keyword_hits:
             deliverables.append('complete source code')
-        if 'docker' in full_text:
+        if 'docker' in keyword_hits:
             deliverables.append('containerized setup')
-        if 'api documentation' in full_text or 'api doc' in full_text:
+        if 'api documentation' in keyword_hits or 'api doc' in keyword_hits:
             deliverables.append('API documentation')
-        if 'test suite' in full_text or 'testing' in full_text:
+        if 'test suite' in keyword_hits or 'testing' in keyword_hits:
             deliverables.append('test suite')
-        if 'deployment' in full_text:
+        if 'deployment' in keyword_hits:
             deliverables.append('deployment configuration')
-        if 'documentation' in full_text or 'readme' in full_text:
+        if 'documentation' in keyword_hits or 'readme' in keyword_hits:
             deliverables.append('comprehensive documentation')
         
         if deliverables:
             summary_parts.append(f"Project deliverables include: {', '.join(deliverables)}.")
         
         # 8. PROJECT STRUCTURE & IMPLEMENTATION DETAILS
-        structure_details = []
-        for sent in meaningful_sentences:
-            sent_lower = sent.lower()
-            # Look for implementation and structure details
-            if any(keyword in sent_lower for keyword in ['component', 'module', 'structure', 'architecture', 'implementation', 'design', 'workflow', 'process', 'method', 'approach', 'technique']):
-                if len(sent.strip()) > 20:
-                    structure_details.append(sent.strip())
-                    if len(structure_details) >= 3:
-                        break
+        structure_details = document.structure
         
         if structure_details:
             summary_parts.append(f"Implementation approach: {' '.join(structure_details[:2])}")
         
         # 9. ADDITIONAL CONTEXT (from any remaining meaningful content)
-        if len(meaningful_sentences) > 10:
-            context_sentences = []
-            for sent in meaningful_sentences[10:]:
-                if len(sent.strip()) > 25 and len(context_sentences) < 3:
-                    context_sentences.append(sent.strip())
+        if document.sentence_count > 10:
+            context_sentences = document.context
             
             if context_sentences:
                 summary_parts.append(f"Additional context: {' '.join(context_sentences[:2])}")
@@ -496,7 +969,7 @@ class AIProcessor:
         result = ' '.join(summary_parts)
         
         # Calculate proportional summary length based on original content
-        original_length = len(text)
+        original_length = document.length
         target_summary_length = 0
         
         if original_length < 1000:
@@ -509,7 +982,7 @@ class AIProcessor:
             target_summary_length = 1300  # Increased from 1000
         
         # If summary is too short compared to content, add more details
-        if len(result) < target_summary_length and len(meaningful_sentences) > 5:
+        if len(result) < target_summary_length and document.sentence_count > 5:
             # Add more context from meaningful sentences
             additional_sentences = []
             for sent in meaningful_sentences[5:15]:  # Take sentences 6-15
@@ -525,15 +998,7 @@ class AIProcessor:
         # Add more technical details if content is very long
         if original_length > 4000 and len(result) < target_summary_length:
             # Look for more specific technical details
-            technical_sentences = []
-            for sent in meaningful_sentences:
-                sent_lower = sent.lower()
-                # Look for sentences with technical keywords
-                if any(tech in sent_lower for tech in ['framework', 'library', 'database', 'server', 'client', 'architecture', 'design', 'implementation', 'feature', 'module', 'component']):
-                    if len(sent.strip()) > 40:
-                        technical_sentences.append(sent.strip())
-                        if len(technical_sentences) >= 3:
-                            break
+            technical_sentences = document.technical
             
             if technical_sentences:
                 result += ' Additional technical details: ' + ' '.join(technical_sentences[:2])
@@ -543,7 +1008,7 @@ class AIProcessor:
         result = re.sub(r'\s+', ' ', result).strip()
         
         # Final length adjustment - ensure we meet the target (more aggressive)
-        if len(result) < target_summary_length * 0.7 and len(meaningful_sentences) > 8:  # Reduced from 0.8 to 0.7
+        if len(result) < target_summary_length * 0.7 and document.sentence_count > 8:  # Reduced from 0.8 to 0.7
             # Add more sentences to reach target length
             extra_sentences = meaningful_sentences[8:20]  # Increased from 12 to 20
             extra_content = ' '.join([s.strip() for s in extra_sentences if len(s.strip()) > 10])  # Reduced from 25 to 10
@@ -561,6 +1026,7 @@ class AIProcessor:
         return result
     
     @staticmethod
+    @metrics.timed("code_analysis")
     def explain_code(code: str, file_extension: str) -> str:
         """
         🚀 ADVANCED UNIVERSAL CODE ANALYZER
@@ -573,6 +1039,7 @@ class AIProcessor:
 # Audio generation
 class AudioGenerator:
     @staticmethod
+    @metrics.timed("audio_clean")
     def clean_text_for_audio(text: str) -> str:
         """
         Clean text for better audio generation
@@ -625,149 +1092,692 @@ class AudioGenerator:
         return text.strip()
 
     @staticmethod
-    def generate_audio(text: str, language: str = 'en') -> str:
+    def split_for_tts(text: str, max_chars: Optional[int] = None) -> list:
+        """
+        Split text into TTS chunks at sentence boundaries
+        The first chunk is a single sentence so playback can start as early as possible
+        """
+        import re
+        
+        max_chars = max_chars or TTS_CHUNK_CHARS
+        pieces = []
+        for sentence in re.split(r'(?<=[.!?;:])\s+', text):
+            sentence = sentence.strip()
+            # Break overly long sentences at word boundaries
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(' ', 0, max_chars)
+                if cut <= 0:
+                    cut = max_chars
+                pieces.append(sentence[:cut])
+                sentence = sentence[cut:].strip()
+            if sentence:
+                pieces.append(sentence)
+        
+        chunks = pieces[:1]
+        for piece in pieces[1:]:
+            if len(chunks) > 1 and len(chunks[-1]) + 1 + len(piece) <= max_chars:
+                chunks[-1] += ' ' + piece
+            else:
+                chunks.append(piece)
+        return chunks
+
+    @staticmethod
+    @metrics.timed("tts_chunk")
+    def synthesize_chunk(text: str, language: str) -> bytes:
+        from gtts import gTTS
+        
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=language, **TTS_SETTINGS).write_to_fp(buffer)
+        metrics.count(metrics.BYTES, buffer.tell(), kind='audio')
+        return buffer.getvalue()
+
+    @staticmethod
+    def iter_tts_audio(cleaned_text: str, language: str, progress=None):
+        """
+        Synthesize chunks concurrently (at most TTS_PARALLELISM at once) and yield MP3 bytes in order
+        progress(done, total) is called as chunks complete
+        """
+        chunks = AudioGenerator.split_for_tts(cleaned_text)
+        if not chunks:
+            raise ValueError("No text to speak")
+        
+        pending = deque()
+        next_chunk = 0
+        done = 0
+        try:
+            while next_chunk < len(chunks) or pending:
+                while next_chunk < len(chunks) and len(pending) < TTS_PARALLELISM:
+                    pending.append(tts_executor.submit(AudioGenerator.synthesize_chunk, chunks[next_chunk], language))
+                    next_chunk += 1
+                audio_bytes = pending.popleft().result()
+                done += 1
+                if progress is not None:
+                    progress(done, len(chunks))
+                yield audio_bytes
+        finally:
+            for future in pending:
+                future.cancel()
+
+    @staticmethod
+    @metrics.timed("tts")
+    def generate_audio(text: str, language: str = 'en', progress=None) -> str:
         try:
             # Clean text for better audio experience
             cleaned_text = AudioGenerator.clean_text_for_audio(text)
             
-            # Generate unique filename
-            audio_id = str(uuid.uuid4())
-            audio_path = f"audio/{audio_id}.mp3"
-            
-            # Create audio directory if it doesn't exist
-            os.makedirs("audio", exist_ok=True)
+            # Identical text, language and settings map to the same file
+            key = audio_cache.key_for(cleaned_text, language, **TTS_SETTINGS)
             
-            # Generate audio using gTTS with cleaned text
-            tts = gTTS(text=cleaned_text, lang=language, slow=False)
-            tts.save(audio_path)
+            # Generate audio using gTTS with cleaned text (only on a cache miss)
+            synthesized = False
+            def synthesize(audio_path: str):
+                nonlocal synthesized
+                synthesized = True
+                with open(audio_path, 'wb') as audio_file:
+                    for audio_bytes in AudioGenerator.iter_tts_audio(cleaned_text, language, progress):
+                        audio_file.write(audio_bytes)
             
+            audio_path = audio_cache.get_or_create(key, synthesize)
+            if progress is not None and not synthesized:
+                # Served from the cache: every chunk is already done
+                chunks = len(AudioGenerator.split_for_tts(cleaned_text))
+                progress(chunks, chunks)
             return audio_path
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Audio generation failed: {str(e)}")
 
+    @staticmethod
+    def stream_audio(text: str, language: str = 'en'):
+        """Yield MP3 bytes as soon as the first chunk is synthesized, caching the result as it streams"""
+        cleaned_text = AudioGenerator.clean_text_for_audio(text)
+        key = audio_cache.key_for(cleaned_text, language, **TTS_SETTINGS)
+        return audio_cache.stream_or_create(key, lambda: AudioGenerator.iter_tts_audio(cleaned_text, language))
+
+# gTTS options that affect the generated audio (part of the cache key)
+TTS_SETTINGS = {'slow': False, 'tld': 'com'}
+
+audio_cache = AudioCache(
+    "audio",
+    int(os.environ.get("AI_AUDIO_CACHE_BYTES", 500 * 1024 * 1024)),
+    ttl_seconds=float(os.environ.get("AI_AUDIO_TTL_SECONDS", 7 * 24 * 3600)) or None,
+    min_age_seconds=float(os.environ.get("AI_AUDIO_MIN_AGE_SECONDS", 300)),
+)
+
+# Chunked TTS: chunk size, per-request parallelism and shared synthesis threads
+TTS_CHUNK_CHARS = int(os.environ.get("AI_TTS_CHUNK_CHARS", 200))
+TTS_PARALLELISM = int(os.environ.get("AI_TTS_PARALLELISM", 4))
+tts_executor = ThreadPoolExecutor(max_workers=int(os.environ.get("AI_TTS_WORKERS", 16)), thread_name_prefix="tts")
+
 # API Endpoints
 @app.get("/")
 async def root():
     return {"message": "🤖 AI Document Reader Service is running!", "status": "active"}
 
+@app.get("/cache-stats")
+async def cache_stats():
+    return {
+        "extraction": extraction_cache.stats(),
+        "artifacts": await worker_pool.run_io(artifact_store.stats),
+        "pageIndex": page_index.stats(),
+        "audio": audio_cache.stats(),
+    }
+
+@app.get("/worker-stats")
+async def worker_stats():
+    return worker_pool.stats()
+
+# Jobs waiting for (or running in) each worker pool
+metrics.Gauge("ai_worker_pending_jobs", "Jobs pending in each worker pool",
+              callback=lambda: {"cpu": worker_pool.cpu.pending, "io": worker_pool.io.pending}, label="pool")
+
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+def log_request(scope, status: int, elapsed: float, timings: dict):
+    """Request line for every sampled request (always for server errors)"""
+    level = logging.WARNING if status >= 500 else logging.INFO
+    logger.log(level, "request", extra=log_fields(
+        method=scope["method"], path=scope["path"], status=status, durationMs=round(elapsed * 1000, 1),
+        stagesMs={name: round(seconds * 1000, 1) for name, seconds in timings.items()},
+    ))
+
+app.add_middleware(metrics.MetricsMiddleware, on_complete=log_request)
+app.add_middleware(SamplingMiddleware)
+
+@app.on_event("startup")
+async def start_logging():
+    setup_logging()
+
+# Optional warm-up at startup: "all", or a comma-separated list of formats and "tts" (e.g. "pdf,docx,tts")
+WARMUP = os.environ.get("AI_WARMUP", "")
+
+def warmup_libraries(spec: str) -> list:
+    if spec.strip().lower() == 'all':
+        names = list(FORMAT_LIBRARIES) + ['tts']
+    else:
+        names = [name.strip().lower() for name in spec.split(',') if name.strip()]
+    libraries = []
+    for name in names:
+        if name == 'tts':
+            found = TTS_LIBRARIES
+        else:
+            extension = name if name.startswith('.') else '.' + name
+            if extension not in EXTRACTORS:
+                raise ValueError(f"AI_WARMUP: unknown format {name!r}")
+            found = FORMAT_LIBRARIES.get(extension, [])
+        for library in found:
+            if library not in libraries:
+                libraries.append(library)
+    return libraries
+
+def warm_up(libraries: list) -> None:
+    """Import the given format libraries and compile the PDF repair patterns"""
+    for library in libraries:
+        importlib.import_module(library)
+    if 'PyPDF2' in libraries:
+        DocumentProcessor.repair_pdf_text("warm up")
+
+@app.on_event("startup")
+async def warm_up_service():
+    if not WARMUP:
+        return
+    started = time.perf_counter()
+    libraries = warmup_libraries(WARMUP)
+    # Import here (thread-mode CPU workers share this process), then in every worker process
+    warm_up(libraries)
+    await asyncio.gather(*(worker_pool.run_cpu(warm_up, libraries) for _ in range(max(worker_pool.cpu_workers, 1))))
+    logger.info("warmed up", extra=log_fields(libraries=libraries, durationMs=round((time.perf_counter() - started) * 1000, 1)))
+
+@app.on_event("shutdown")
+async def shutdown_workers():
+    stop_jobs()
+    if audio_sweeper is not None:
+        audio_sweeper.cancel()
+    for task in precompute_tasks:
+        task.cancel()
+    worker_pool.shutdown()
+    tts_executor.shutdown(wait=False, cancel_futures=True)
+    shutdown_logging()
+
+async def process_single_file(request: FileProcessRequest, progress: Optional[Progress] = None) -> dict:
+    file_path = request.filePath
+    file_type = request.fileType.lower()
+    
+    # Extract content based on file type (cached by content hash), then summarize it in the background
+    key = await content_key(file_path, file_type)
+    if progress is not None:
+        await walk_pages(file_path, file_type, key, progress)
+    content = await extract_content(file_path, file_type, key)
+    schedule_precompute(key, file_path, file_type)
+    content_type = 'code' if file_type in CODE_EXTENSIONS else 'document'
+    
+    logger.info("processed file", extra=log_fields(path=file_path, fileType=file_type, chars=len(content)))
+    
+    return {
+        "success": True,
+        "contentType": content_type,
+        "fileType": file_type,
+        "contentLength": len(content),
+        "preview": content[:200] + "..." if len(content) > 200 else content
+    }
+
 @app.post("/process-file")
 async def process_file(request: FileProcessRequest):
     try:
-        file_path = request.filePath
-        file_type = request.fileType.lower()
-        
-        print(f"Processing file: {file_path}")
-        print(f"File type: {file_type}")
-        
-        # Extract content based on file type
-        if file_type == '.pdf':
-            content = DocumentProcessor.extract_pdf_text(file_path)
-            content_type = 'document'
-        elif file_type in ['.docx', '.doc']:
-            content = DocumentProcessor.extract_docx_text(file_path)
-            content_type = 'document'
-        elif file_type == '.pptx':
-            content = DocumentProcessor.extract_pptx_text(file_path)
-            content_type = 'document'
-        elif file_type == '.txt':
-            content = DocumentProcessor.extract_text_file(file_path)
-            content_type = 'document'
-        elif file_type in ['.py', '.js', '.java', '.cpp', '.c']:
-            content = DocumentProcessor.extract_code_file(file_path)
-            content_type = 'code'
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file type")
-        
-        print(f"Successfully extracted {len(content)} characters")
-        
-        return {
-            "success": True,
-            "contentType": content_type,
-            "fileType": file_type,
-            "contentLength": len(content),
-            "preview": content[:200] + "..." if len(content) > 200 else content
-        }
-        
+        return await process_single_file(request)
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error processing file: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("process-file failed", extra=log_fields(path=request.filePath))
         raise HTTPException(status_code=500, detail=str(e))
 
+# Batch processing: files in flight at once and the largest accepted batch
+BATCH_CONCURRENCY = int(os.environ.get("AI_BATCH_CONCURRENCY", max(worker_pool.cpu_workers, 1) * 2))
+MAX_BATCH_FILES = int(os.environ.get("AI_MAX_BATCH_FILES", 500))
+# A batch file that finds a worker pool full waits and retries (doubling pauses up to the maximum) this long
+BATCH_RETRY_SECONDS = float(os.environ.get("AI_BATCH_RETRY_SECONDS", 60))
+BATCH_RETRY_PAUSE = 0.1
+BATCH_RETRY_MAX_PAUSE = 2.0
+
+async def process_when_admitted(request: FileProcessRequest) -> dict:
+    """
+    process_single_file, retried with backoff while the worker pools are full
+    A batch shares the pools with per-file PPTX jobs, background summaries and
+    other requests, so its own concurrency limit can't guarantee admission.
+    """
+    deadline = time.monotonic() + BATCH_RETRY_SECONDS
+    pause = BATCH_RETRY_PAUSE
+    while True:
+        try:
+            return await process_single_file(request)
+        except PoolBusy:
+            if time.monotonic() + pause > deadline:
+                raise
+        # Jittered so waiting files don't all come back at once
+        await asyncio.sleep(pause * random.uniform(0.5, 1))
+        pause = min(pause * 2, BATCH_RETRY_MAX_PAUSE)
+
+@app.post("/process-batch")
+async def process_batch(request: BatchProcessRequest):
+    """
+    Process many files at once, streaming one NDJSON line per file as soon as it finishes
+    Lines arrive in completion order; "index" refers back to the position in the request.
+    A failed file yields a line with success false and never aborts the rest of the batch.
+    """
+    if not request.files:
+        raise HTTPException(status_code=400, detail="No files to process")
+    if len(request.files) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=413, detail=f"Batch too large ({len(request.files)} files, limit {MAX_BATCH_FILES})")
+    
+    # Bound the fan-out so a large batch doesn't overflow the worker queues
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    
+    async def process_entry(index: int, file_request: FileProcessRequest) -> dict:
+        entry = {"index": index, "filePath": file_request.filePath, "fileName": file_request.fileName}
+        async with semaphore:
+            try:
+                entry.update(await process_when_admitted(file_request))
+            except HTTPException as e:
+                entry.update({"success": False, "statusCode": e.status_code, "error": e.detail})
+            except Exception as e:
+                logger.exception("batch entry failed", extra=log_fields(path=file_request.filePath))
+                entry.update({"success": False, "statusCode": 500, "error": str(e)})
+        return entry
+    
+    async def results():
+        tasks = [asyncio.ensure_future(process_entry(index, file_request))
+                 for index, file_request in enumerate(request.files)]
+        succeeded = 0
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                entry = await next_result
+                succeeded += entry["success"]
+                yield json.dumps(entry) + "\n"
+            yield json.dumps({"done": True, "total": len(tasks), "succeeded": succeeded,
+                              "failed": len(tasks) - succeeded}) + "\n"
+        finally:
+            # Client went away - don't keep extracting for nobody
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+# Progressive /get-content: pages are parsed in batches that double up to this size
+STREAM_MAX_BATCH_PAGES = int(os.environ.get("AI_STREAM_MAX_BATCH_PAGES", 64))
+
+async def iter_document_pages(file_path: str, file_extension: str, key: str, progress=None):
+    """
+    Yield (page_number, text) for every page with text, as soon as it is extracted
+    PDF and PPTX pages come from the worker pool in growing batches (the next batch is
+    parsed while the current one is sent); other formats yield virtual pages.
+    A completed walk stores the full text and page index like extract_content does.
+    progress(done, total) is called as pages are extracted.
+    """
+    cached = await cached_content(key)
+    spans = await worker_pool.run_io(page_index.get, key)
+    paged = PAGED_EXTRACTORS.get(file_extension)
+    
+    if paged is None or (cached is not None and spans is not None):
+        if cached is None or spans is None:
+            cached = await extract_content(file_path, file_extension, key)
+            spans = await worker_pool.run_io(page_index.get, key) or virtual_page_spans(cached)
+        if progress is not None:
+            progress(len(spans), len(spans))
+        for page_number, (start, end) in enumerate(spans, 1):
+            if end > start:
+                yield page_number, cached[start:end]
+        return
+    
+    extract_pages, separator = paged
+    page_texts = []
+    batch_size = 1
+    next_batch = asyncio.ensure_future(worker_pool.run_cpu(extract_pages, file_path, 0, batch_size))
+    try:
+        while next_batch is not None:
+            texts, total = await next_batch
+            first_page = len(page_texts)
+            page_texts.extend(texts)
+            if progress is not None:
+                progress(len(page_texts), total)
+            next_batch = None
+            if texts and len(page_texts) < total:
+                batch_size = min(batch_size * 2, STREAM_MAX_BATCH_PAGES)
+                next_batch = asyncio.ensure_future(
+                    worker_pool.run_cpu(extract_pages, file_path, len(page_texts), len(page_texts) + batch_size))
+            for offset, text in enumerate(texts):
+                if text:
+                    yield first_page + offset + 1, text
+    finally:
+        if next_batch is not None:
+            next_batch.cancel()
+    
+    text, spans = join_pages(page_texts, separator)
+    await worker_pool.run_io(page_index.put, key, spans)
+    await store_content(key, text if text else EMPTY_DOCUMENT_TEXT[file_extension])
+
+def split_sections(text: str) -> list:
+    """Blank-line separated blocks of a summary or code explanation"""
+    import re
+    return [section.strip() for section in re.split(r'\n\s*\n', text) if section.strip()]
+
+async def stream_content(request: ContentRequest, file_extension: str) -> StreamingResponse:
+    """
+    NDJSON events for /get-content with stream=true:
+    start, one page event per page with text, section events for a summary or
+    code explanation, then done (or error if something fails midway)
+    """
+    if any(value is not None for value in (request.pageStart, request.pageEnd, request.charStart, request.charEnd)):
+        raise HTTPException(status_code=400, detail="Streaming can't be combined with a page or character range")
+    
+    # Fail fast (with a real status code) on unsupported or missing files
+    key = await content_key(request.filePath, file_extension)
+    is_code = file_extension in CODE_EXTENSIONS
+    separator = PAGED_EXTRACTORS[file_extension][1] if file_extension in PAGED_EXTRACTORS else ''
+    
+    async def events():
+        def event(**fields) -> str:
+            return json.dumps(fields) + "\n"
+        
+        yield event(type="start", contentType=request.contentType, isCode=is_code,
+                    unit='slide' if file_extension == '.pptx' else 'page')
+        try:
+            # Pages are sent as they come and not kept; the summary reads the stored text in the worker
+            pages = 0
+            content_length = 0
+            async for page_number, text in iter_document_pages(request.filePath, file_extension, key):
+                content_length += len(text) + (len(separator) if pages else 0)
+                pages += 1
+                yield event(type="page", page=page_number, text=text)
+            if not pages:
+                content_length = len(EMPTY_DOCUMENT_TEXT.get(file_extension, ''))
+            
+            if is_code or request.contentType == 'summary':
+                processed_content = await process_content(key, request.filePath, file_extension, request.contentType)
+                for index, section in enumerate(split_sections(processed_content)):
+                    yield event(type="section", index=index, text=section)
+            yield event(type="done", pages=pages, contentLength=content_length)
+        except HTTPException as e:
+            yield event(type="error", statusCode=e.status_code, error=e.detail)
+        except Exception as e:
+            logger.exception("content stream failed", extra=log_fields(path=request.filePath))
+            yield event(type="error", statusCode=500, error=str(e))
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+async def content_response(request: ContentRequest, file_extension: str, progress: Optional[Progress] = None) -> dict:
+    """The JSON body of a non-streaming /get-content"""
+    file_path = request.filePath
+    content_type = request.contentType
+    
+    # Only the requested range is extracted; whole documents are extracted (cached by content hash)
+    # as processing needs them - a summary never needs the full text in this process
+    key = None
+    content_range = None
+    range_content = None
+    if any(value is not None for value in (request.pageStart, request.pageEnd, request.charStart, request.charEnd)):
+        range_content, content_range = await extract_range(request, file_extension)
+    else:
+        key = await content_key(file_path, file_extension)
+        if progress is not None:
+            await walk_pages(file_path, file_extension, key, progress)
+    
+    # Process content based on request type (whole-document results are stored per content hash)
+    if progress is not None and (file_extension in CODE_EXTENSIONS or content_type == 'summary'):
+        progress.stage('explaining' if file_extension in CODE_EXTENSIONS else 'summarizing')
+    processed_content = await process_content(key, file_path, file_extension, content_type, range_content)
+    
+    logger.info("content", extra=log_fields(path=file_path, contentType=content_type, extension=file_extension,
+                                            processedChars=len(processed_content)))
+    
+    response = {
+        "success": True,
+        "content": processed_content,
+        "contentType": content_type,
+        "isCode": file_extension in CODE_EXTENSIONS
+    }
+    if content_range is not None:
+        response["range"] = content_range
+    return response
+
 @app.post("/get-content")
 async def get_content(request: ContentRequest):
     try:
-        file_path = request.filePath
-        content_type = request.contentType
-        
-        print(f"Getting content for: {file_path}, type: {content_type}")
-        
         # Determine file type
-        file_extension = Path(file_path).suffix.lower()
-        print(f"File extension: {file_extension}")
-        
-        # Extract content
-        if file_extension == '.pdf':
-            full_content = DocumentProcessor.extract_pdf_text(file_path)
-        elif file_extension in ['.docx', '.doc']:
-            full_content = DocumentProcessor.extract_docx_text(file_path)
-        elif file_extension == '.pptx':
-            full_content = DocumentProcessor.extract_pptx_text(file_path)
-        elif file_extension == '.txt':
-            full_content = DocumentProcessor.extract_text_file(file_path)
-        elif file_extension in ['.py', '.js', '.java', '.cpp', '.c']:
-            full_content = DocumentProcessor.extract_code_file(file_path)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file type")
-        
-        print(f"Extracted {len(full_content)} characters")
-        
-        # Process content based on request type
-        if file_extension in ['.py', '.js', '.java', '.cpp', '.c']:
-            # For code files, always explain the code
-            print("Processing as code file")
-            processed_content = AIProcessor.explain_code(full_content, file_extension)
-        else:
-            # For documents
-            if content_type == 'summary':
-                print("Generating summary")
-                processed_content = AIProcessor.summarize_text(full_content)
-            else:
-                print("Returning full content")
-                processed_content = full_content
+        file_extension = Path(request.filePath).suffix.lower()
         
-        print(f"Processed content length: {len(processed_content)}")
-        
-        return {
-            "success": True,
-            "content": processed_content,
-            "contentType": content_type,
-            "isCode": file_extension in ['.py', '.js', '.java', '.cpp', '.c']
-        }
+        if request.stream:
+            return await stream_content(request, file_extension)
+        return await content_response(request, file_extension)
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"ERROR in get_content: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("get-content failed", extra=log_fields(path=request.filePath))
         raise HTTPException(status_code=500, detail=str(e))
 
+def audio_response(audio_path: str) -> dict:
+    return {
+        "success": True,
+        "audioPath": audio_path,
+        "audioUrl": f"http://localhost:8001/{audio_path}"
+    }
+
 @app.post("/generate-audio")
 async def generate_audio(request: AudioRequest):
     try:
-        audio_path = AudioGenerator.generate_audio(request.text, request.language)
-        
-        return {
-            "success": True,
-            "audioPath": audio_path,
-            "audioUrl": f"http://localhost:8001/{audio_path}"
-        }
+        audio_path = await worker_pool.run_io(AudioGenerator.generate_audio, request.text, request.language)
+        return audio_response(audio_path)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-# Serve audio files
-from fastapi.staticfiles import StaticFiles
-app.mount("/audio", StaticFiles(directory="audio"), name="audio")
+@app.post("/stream-audio")
+async def stream_audio(request: AudioRequest):
+    try:
+        audio = AudioGenerator.stream_audio(request.text, request.language)
+        # Wait for the first chunk so synthesis errors still get a proper status code
+        first_block = await worker_pool.run_io(next, audio, b'')
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Audio generation failed: {str(e)}")
+    
+    return StreamingResponse(itertools.chain([first_block], audio), media_type="audio/mpeg")
+
+# Asynchronous jobs: submit, get a job id at once, poll GET /jobs/{id} for progress and the result
+job_store = JobStore(
+    os.environ.get("AI_JOB_DB", os.path.join("cache", "jobs.sqlite3")),
+    lease_seconds=float(os.environ.get("AI_JOB_LEASE_SECONDS", 60)),
+    retention_seconds=float(os.environ.get("AI_JOB_RETENTION_SECONDS", 3600)),
+    max_attempts=int(os.environ.get("AI_JOB_MAX_ATTEMPTS", 3)),
+)
+JOB_CONCURRENCY = int(os.environ.get("AI_JOB_CONCURRENCY", max(worker_pool.cpu_workers, 1)))
+job_slots = asyncio.Semaphore(JOB_CONCURRENCY)
+# Job id -> task running (or waiting to run) it in this process
+job_tasks = {}
+job_heartbeat = None
+
+async def walk_pages(file_path: str, file_extension: str, key: str, progress: Progress) -> None:
+    """Extract (or load) a document page by page, reporting pages done to a job"""
+    progress.stage('extracting', 'slide' if file_extension == '.pptx' else 'page')
+    async for _ in iter_document_pages(file_path, file_extension, key, progress):
+        pass
+
+async def run_process_file_job(request: FileProcessRequest, progress: Progress) -> dict:
+    return await process_single_file(request, progress)
+
+async def run_get_content_job(request: ContentRequest, progress: Progress) -> dict:
+    return await content_response(request, Path(request.filePath).suffix.lower(), progress)
+
+async def run_generate_audio_job(request: AudioRequest, progress: Progress) -> dict:
+    progress.stage('synthesizing', 'chunk')
+    audio_path = await worker_pool.run_io(AudioGenerator.generate_audio, request.text, request.language, progress)
+    return audio_response(audio_path)
+
+# Job type -> request model and handler
+JOB_TYPES = {
+    'process-file': (FileProcessRequest, run_process_file_job),
+    'get-content': (ContentRequest, run_get_content_job),
+    'generate-audio': (AudioRequest, run_generate_audio_job),
+}
+
+def start_job(job_id: str) -> None:
+    if job_id not in job_tasks:
+        task = asyncio.ensure_future(run_job(job_id))
+        job_tasks[job_id] = task
+        task.add_done_callback(lambda _: job_tasks.pop(job_id, None))
+
+async def run_job(job_id: str) -> None:
+    async with job_slots:
+        job = await worker_pool.run_io(job_store.claim, job_id)
+        if job is None:
+            # Another worker process claimed it first
+            return
+        model, handler = JOB_TYPES[job["type"]]
+        try:
+            result = await handler(model(**job["request"]), Progress(job_store, job_id))
+        except HTTPException as e:
+            await worker_pool.run_io(job_store.fail, job_id, e.status_code, str(e.detail))
+        except Exception as e:
+            logger.exception("job failed", extra=log_fields(jobId=job_id, jobType=job["type"]))
+            await worker_pool.run_io(job_store.fail, job_id, 500, str(e))
+        else:
+            await worker_pool.run_io(job_store.succeed, job_id, result)
+
+async def heartbeat_jobs() -> None:
+    """Renew the lease of running jobs, and pick up queued ones (also those a dead worker left behind)"""
+    while True:
+        try:
+            await worker_pool.run_io(job_store.heartbeat)
+            for job_id in await worker_pool.run_io(job_store.recover):
+                start_job(job_id)
+        except Exception:
+            logger.exception("job heartbeat failed")
+        await asyncio.sleep(job_store.lease_seconds / 3)
+
+@app.on_event("startup")
+async def start_jobs():
+    global job_heartbeat
+    job_heartbeat = asyncio.ensure_future(heartbeat_jobs())
+
+def stop_jobs() -> None:
+    """Called at shutdown, before the worker pools go away"""
+    if job_heartbeat is not None:
+        job_heartbeat.cancel()
+    # Unfinished jobs go back to the queue for the next start (or another worker)
+    job_store.release(list(job_tasks))
+    for task in job_tasks.values():
+        task.cancel()
+
+async def submit_job(job_type: str, dedupe_key: str, request: BaseModel, reusable=None) -> dict:
+    job, created = await worker_pool.run_io(job_store.submit, job_type, dedupe_key, request.model_dump(), reusable)
+    if job["status"] == 'queued':
+        start_job(job["id"])
+    logger.info("job submitted", extra=log_fields(jobId=job["id"], jobType=job_type, deduplicated=not created))
+    return {
+        "success": True,
+        "jobId": job["id"],
+        "status": job["status"],
+        "deduplicated": not created,
+        "statusUrl": f"/jobs/{job['id']}",
+    }
+
+@app.post("/jobs/process-file", status_code=202)
+async def submit_process_file(request: FileProcessRequest):
+    try:
+        # Same content, same job: resubmits after a client timeout attach to the running one
+        key = await content_key(request.filePath, request.fileType.lower())
+        return await submit_job('process-file', f"process-file:{key}", request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("job submit failed", extra=log_fields(path=request.filePath))
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/jobs/get-content", status_code=202)
+async def submit_get_content(request: ContentRequest):
+    try:
+        if request.stream:
+            raise HTTPException(status_code=400, detail="Jobs can't stream; poll the job instead")
+        key = await content_key(request.filePath, Path(request.filePath).suffix.lower())
+        content_range = (request.pageStart, request.pageEnd, request.charStart, request.charEnd)
+        return await submit_job('get-content', f"get-content:{key}:{request.contentType}:{content_range}", request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("job submit failed", extra=log_fields(path=request.filePath))
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/jobs/generate-audio", status_code=202)
+async def submit_generate_audio(request: AudioRequest):
+    try:
+        digest = hashlib.sha256(f"{request.language}\0{request.text}".encode('utf-8')).hexdigest()
+        # A finished job only counts while the audio cache still has its file; once swept, synthesize again
+        return await submit_job('generate-audio', f"generate-audio:{digest}", request,
+                                reusable=lambda job: os.path.exists(job["result"]["audioPath"]))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("job submit failed", extra=log_fields(language=request.language))
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await worker_pool.run_io(job_store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    response = {
+        "jobId": job["id"],
+        "type": job["type"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "progress": {"done": job["done"], "total": job["total"], "unit": job["unit"]},
+        "createdAt": job["created"],
+        "updatedAt": job["updated"],
+    }
+    if job["status"] == 'succeeded':
+        response["result"] = job["result"]
+    elif job["status"] == 'failed':
+        response["statusCode"] = job["statusCode"]
+        response["error"] = job["error"]
+    return response
+
+# Audio files: the sweeper deletes expired and over-budget files in the background
+AUDIO_SWEEP_SECONDS = float(os.environ.get("AI_AUDIO_SWEEP_SECONDS", 600))
+# File names are content hashes, so a URL's content never changes
+AUDIO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+audio_sweeper = None
+
+async def sweep_audio() -> None:
+    while True:
+        try:
+            await worker_pool.run_io(audio_cache.sweep)
+        except Exception:
+            logger.exception("audio sweep failed")
+        await asyncio.sleep(AUDIO_SWEEP_SECONDS)
+
+@app.on_event("startup")
+async def start_audio_sweeper():
+    global audio_sweeper
+    audio_sweeper = asyncio.ensure_future(sweep_audio())
+
+@app.api_route("/audio/{name}", methods=["GET", "HEAD"])
+async def get_audio_file(name: str, request: Request):
+    path = audio_cache.path_for_name(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    key = name[:-len('.mp3')]
+    # Serving counts as use, so the sweeper keeps files that are still being played
+    if audio_cache.lookup(key) is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    try:
+        return file_response(request.method, request.headers, path, key, "audio/mpeg",
+                             AUDIO_CACHE_CONTROL, hold=audio_cache.pinned(path))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Audio not found")
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,256 @@
+"""
+Per-stage latency metrics
+
+Histograms, counters and gauges rendered in the Prometheus text format for
+GET /metrics, plus the per-request stage timings behind the Server-Timing
+response header.
+
+Stages usually run inside worker processes, where neither the registry nor
+the request are visible. Worker jobs therefore record into a job-local
+collector (see job_recording), whose contents travel back with the job's
+result and are replayed into the registry and the request timings by
+record_job in the event loop.
+"""
+
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(labels: tuple) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def render(self) -> list:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"] + self.samples()
+
+    def samples(self) -> list:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list:
+        with self._lock:
+            return [f"{self.name}{_label_text(key)} {value:g}" for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """Gauge set directly, or read from a callback at scrape time"""
+    kind = 'gauge'
+
+    def __init__(self, name: str, help_text: str, callback: Optional[Callable[[], dict]] = None, label: str = 'name'):
+        super().__init__(name, help_text)
+        self._values = {}
+        self._callback = callback
+        self._label = label
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self) -> list:
+        with self._lock:
+            values = dict(self._values)
+        if self._callback is not None:
+            # Callback returns {label value: gauge value}
+            values.update({((self._label, label),): value for label, value in self._callback().items()})
+        return [f"{self.name}{_label_text(key)} {value:g}" for key, value in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(buckets)
+        self._series = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self) -> list:
+        lines = []
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for key, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else f"{bound:g}"
+                lines.append(f"{self.name}_bucket{_label_text(key + (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(key)} {total:.6f}")
+            lines.append(f"{self.name}_count{_label_text(key)} {count}")
+        return lines
+
+
+REGISTRY = []
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+STAGE_SECONDS = Histogram("ai_stage_duration_seconds", "Time spent in each processing stage")
+REQUEST_SECONDS = Histogram("ai_request_duration_seconds", "HTTP request latency by route")
+BYTES = Counter("ai_bytes_total", "Bytes processed, by kind")
+PAGES = Counter("ai_pages_total", "Pages and slides extracted, by format")
+IN_FLIGHT = Gauge("ai_in_flight_requests", "Requests currently being handled, by route")
+
+# Stage timings of the current request (for Server-Timing) and of the current worker job
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+_job = threading.local()
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    job = getattr(_job, 'collector', None)
+    if job is not None:
+        job["stages"].append((stage, seconds))
+        return
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+def count(counter: Counter, amount: float, **labels) -> None:
+    job = getattr(_job, 'collector', None)
+    if job is not None:
+        job["counts"].append((counter.name, amount, labels))
+        return
+    counter.inc(amount, **labels)
+
+
+@contextmanager
+def stage(name: str):
+    """Time the block as one observation of a processing stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - start)
+
+
+def timed(name: str):
+    """Decorator form of stage()"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def job_recording():
+    """Collect the stages and counts recorded by a worker job so they can be shipped back with its result"""
+    previous = getattr(_job, 'collector', None)
+    collector = _job.collector = {"stages": [], "counts": []}
+    try:
+        yield collector
+    finally:
+        _job.collector = previous
+
+
+def record_job(collector: dict) -> None:
+    """Replay a worker job's collector into the registry and the current request (runs in the event loop)"""
+    counters = {metric.name: metric for metric in REGISTRY if isinstance(metric, Counter)}
+    for stage_name, seconds in collector["stages"]:
+        record_stage(stage_name, seconds)
+    for name, amount, labels in collector["counts"]:
+        counters[name].inc(amount, **labels)
+
+
+def server_timing(timings: dict, total: float) -> str:
+    parts = [f"{name.replace(' ', '_')};dur={seconds * 1000:.1f}" for name, seconds in timings.items()]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ', '.join(parts)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware: request latency and in-flight gauges per route, and a
+    Server-Timing header listing the stages that ran before the response started
+    """
+
+    def __init__(self, app, on_complete: Optional[Callable] = None):
+        self.app = app
+        self.on_complete = on_complete
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # First path segment only, so /audio/<file> and friends don't explode the label set
+        route = '/' + scope["path"].strip('/').split('/')[0]
+        timings = {}
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = server_timing(timings, time.perf_counter() - start)
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"server-timing", header.encode())]}
+            await send(message)
+
+        IN_FLIGHT.inc(route=route)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            IN_FLIGHT.dec(route=route)
+            elapsed = time.perf_counter() - start
+            REQUEST_SECONDS.observe(elapsed, route=route)
+            _request_timings.reset(token)
+            if self.on_complete is not None:
+                self.on_complete(scope, status, elapsed, timings)
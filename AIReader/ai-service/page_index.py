@@ -0,0 +1,197 @@
+"""
+Persisted per-document page index
+
+For every extracted document we record where each page (PDF), slide (PPTX)
+or virtual page (DOCX, text and code) starts and ends in the extracted text.
+The index is small, stored as JSON next to the service and keyed by the
+document's content hash, so after a restart a character range can still be
+mapped to the handful of pages that contain it instead of re-extracting the
+whole document.
+
+Both get and put touch the disk, so callers run them in the I/O pool. The
+directory holds at most max_files indexes: once a put goes past that, the
+least recently written files are deleted until a tenth of the budget is free
+again, together with temporary files left behind by interrupted writes.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+# Size of a virtual page for formats without real pages
+VIRTUAL_PAGE_CHARS = 3000
+
+# Temporary files older than this belong to a write that died
+TEMP_MAX_AGE_SECONDS = 3600
+
+
+def join_pages(page_texts: List[str], separator: str) -> Tuple[str, list]:
+    """Join page texts like the extractors do (empty pages skipped) and return the text plus [start, end] spans"""
+    parts = []
+    spans = []
+    position = 0
+    for page_text in page_texts:
+        if page_text:
+            if parts:
+                position += len(separator)
+            parts.append(page_text)
+            spans.append([position, position + len(page_text)])
+            position += len(page_text)
+        else:
+            spans.append([position, position])
+    return separator.join(parts), spans
+
+
+def virtual_page_spans(text: str, page_chars: int = VIRTUAL_PAGE_CHARS) -> list:
+    """Cut text into pages of about page_chars characters, preferring line and word boundaries"""
+    spans = []
+    start = 0
+    while start < len(text):
+        end = min(start + page_chars, len(text))
+        if end < len(text):
+            cut = text.rfind('\n', start + page_chars // 2, end)
+            if cut < 0:
+                cut = text.rfind(' ', start + page_chars // 2, end)
+            if cut > 0:
+                end = cut + 1
+        spans.append([start, end])
+        start = end
+    return spans
+
+
+def pages_for_chars(spans: list, char_start: int, char_end: int) -> Tuple[int, int]:
+    """Half-open range of page indexes whose text overlaps [char_start, char_end)"""
+    first = next((i for i, (start, end) in enumerate(spans) if end > char_start), len(spans))
+    last = first
+    while last < len(spans) and spans[last][0] < char_end:
+        last += 1
+    return first, last
+
+
+def slice_pages(text: str, spans: list, first: int, last: int) -> str:
+    """Text of pages [first, last) cut out of the full document text"""
+    filled = [span for span in spans[first:last] if span[1] > span[0]]
+    return text[filled[0][0]:filled[-1][1]] if filled else ''
+
+
+def slice_chars(page_texts: List[str], spans: list, first: int, last: int, separator: str,
+                char_start: int, char_end: int) -> str:
+    """
+    Characters [char_start, char_end) of the full text, rebuilt from only the
+    page texts of [first, last) as returned by pages_for_chars
+    """
+    joined, _ = join_pages(page_texts, separator)
+    total = spans[-1][1] if spans else 0
+    # Where the window starts in the full text: the end of the last filled page before it
+    window_start = spans[first - 1][1] if first > 0 else 0
+    text_before = window_start > 0
+    text_after = total > window_start + (len(separator) if text_before and joined else 0) + len(joined)
+    if joined:
+        window = (separator if text_before else '') + joined + (separator if text_after else '')
+    else:
+        window = separator if text_before and text_after else ''
+    return window[char_start - window_start:max(char_end - window_start, 0)]
+
+
+class PageIndex:
+    def __init__(self, directory: str, max_entries: int = 1024, max_files: int = 20000):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_files = max_files
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Index files on disk, counted on the first put
+        self._files = None
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        # Cache keys contain ':' which Windows doesn't allow in file names
+        return os.path.join(self.directory, key.replace(':', '_') + '.json')
+
+    def get(self, key: str) -> Optional[list]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        try:
+            with open(self.path_for(key), 'r', encoding='utf-8') as file:
+                spans = json.load(file)["spans"]
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+        self._remember(key, spans)
+        return spans
+
+    def put(self, key: str, spans: list) -> None:
+        path = self.path_for(key)
+        added = not os.path.exists(path)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump({"spans": spans}, file, separators=(',', ':'))
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self._remember(key, spans)
+        if added:
+            self._added()
+
+    def _added(self) -> None:
+        with self._lock:
+            if self._files is None:
+                self._files = sum(1 for entry in os.scandir(self.directory) if entry.name.endswith('.json'))
+            else:
+                self._files += 1
+            over_budget = self._files > self.max_files
+        if over_budget:
+            self.evict()
+
+    def evict(self) -> None:
+        """Delete the least recently written index files until a tenth of the budget is free again"""
+        now = time.time()
+        files = []
+        for entry in os.scandir(self.directory):
+            try:
+                modified = entry.stat().st_mtime
+                if entry.name.endswith('.json'):
+                    files.append((modified, entry.path))
+                elif entry.name.endswith('.tmp') and now - modified > TEMP_MAX_AGE_SECONDS:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                # Replaced or removed by another process meanwhile
+                continue
+
+        files.sort()
+        removed = 0
+        for _, path in files[:max(len(files) - int(self.max_files * 0.9), 0)]:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._files = len(files) - removed
+            self.evictions += removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "files": self._files,
+                "maxFiles": self.max_files,
+                "evictions": self.evictions,
+            }
+
+    def _remember(self, key: str, spans: list) -> None:
+        with self._lock:
+            self._entries[key] = spans
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
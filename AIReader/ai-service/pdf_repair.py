@@ -0,0 +1,207 @@
+"""
+Compiled word-repair tables for PDF text extraction
+
+The fix tables are compiled once at import time into Aho-Corasick automata.
+Each table is applied with one scan that locates every candidate, and the
+ordered replacements are replayed only on short windows around the hits.
+The output is identical to calling str.replace for every pair in turn.
+"""
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# Aggressive specific fixes, applied before the regex repair passes
+SPECIFIC_FIXES = [
+    ('Det a iled', 'Detailed'),
+    ('det a iled', 'detailed'),
+    ('T ask', 'Task'),
+    ('t ask', 'task'),
+    ('Br e a kdown', 'Breakdown'),
+    ('br e a kdown', 'breakdown'),
+    ('Man a gement', 'Management'),
+    ('man a gement', 'management'),
+    ('F ullstack', 'Fullstack'),
+    ('f ullstack', 'fullstack'),
+    ('R eact', 'React'),
+    ('r eact', 'react'),
+    ('V ite', 'Vite'),
+    ('v ite', 'vite'),
+    ('e xpert', 'expert'),
+    ('po wered', 'powered'),
+    ('Git Hub', 'GitHub'),
+    ('git hub', 'github'),
+    ('Builda', 'Build a'),
+    ('builda', 'build a'),
+    ('needa', 'need a'),
+    ('whois', 'who is'),
+    ('Systemwith', 'System with'),
+    ('systemwith', 'system with')
+]
+
+
+# Common broken patterns, applied after the regex repair passes
+REPLACEMENTS = {
+    # Broken words with spaces
+    'Manag ement': 'Management',
+    'manag ement': 'management',
+    'Enquiry Manag ement': 'Enquiry Management',
+    'Authen tication': 'Authentication',
+    'authen tication': 'authentication',
+    'Authoriza tion': 'Authorization',
+    'authoriza tion': 'authorization',
+    'Deplo yment': 'Deployment',
+    'deplo yment': 'deployment',
+    'Documen tation': 'Documentation',
+    'documen tation': 'documentation',
+    'Deliv erables': 'Deliverables',
+    'deliv erables': 'deliverables',
+    'Con ﬁgure': 'Configure',
+    'con ﬁgure': 'configure',
+    'Workﬂow': 'Workflow',
+    'workﬂow': 'workflow',
+    'T esting': 'Testing',
+    't esting': 'testing',
+    'gener ating': 'generating',
+    'r efactoring': 'refactoring',
+    'collabor ator': 'collaborator',
+    'dev eloper': 'developer',
+    'dev elopment': 'development',
+    'elopmen t': 'elopment',
+    'middlew are': 'middleware',
+    'middlew ares': 'middlewares',
+    'con troller': 'controller',
+    'con trollers': 'controllers',
+    'environmen t': 'environment',
+    'notiﬁca tion': 'notification',
+    'notiﬁca tions': 'notifications',
+    'valida tion': 'validation',
+    'integra tion': 'integration',
+    'architec ture': 'architecture',
+    'diagr am': 'diagram',
+    'creden tials': 'credentials',
+    'def ault': 'default',
+
+    # Words stuck together
+    'BuildaFullstack': 'Build a Fullstack',
+    'needadev': 'need a dev',
+    'needadeveloper': 'need a developer',
+    'whoisane': 'who is an e',
+    'whoisanexpert': 'who is an expert',
+    'shouldbethe': 'should be the',
+    'shouldbe': 'should be',
+    'onlybedoneto': 'only be done to',
+    'onlybedone': 'only be done',
+    'shouldproactively': 'should proactively',
+    'throughoutthepr': 'throughout the pr',
+    'throughoutthe': 'throughout the',
+    'withfrontendandbackend': 'with frontend and backend',
+    'withfrontend': 'with frontend',
+    'andbackend': 'and backend',
+    'GitHubrepo': 'GitHub repo',
+    'Implementroutes': 'Implement routes',
+    'Handletokenstorage': 'Handle token storage',
+    'CreateAddEnquiry': 'Create Add Enquiry',
+    'ReminderforDeveloper': 'Reminder for Developer',
+    'AI-ﬁrst': 'AI-first',
+    'dev elopmenttoolsexpertly': 'development tools expertly',
+    'collabor atorindev': 'collaborator in dev',
+    'indev': 'in dev',
+    'ina': 'in a',
+    'ona': 'on a',
+    'fora': 'for a',
+    'witha': 'with a',
+    'toa': 'to a',
+    'asa': 'as a',
+
+    # Special characters
+    'ﬂ': 'fl',
+    'ﬁ': 'fi',
+    'ﬀ': 'ff',
+    'ﬃ': 'ffi',
+    'ﬄ': 'ffl',
+}
+
+
+def _can_overlap(a: str, b: str) -> bool:
+    """True when a and b can share characters somewhere in a text"""
+    if a in b or b in a:
+        return True
+    for size in range(1, min(len(a), len(b))):
+        if a.endswith(b[:size]) or b.endswith(a[:size]):
+            return True
+    return False
+
+
+class ReplacementChain:
+    """
+    Ordered list of (old, new) replacements compiled into one matcher
+
+    A replacement can only change text around an original match or extend a
+    match created by an earlier replacement's output. `reach` is the furthest
+    such a cascade can travel into untouched text, so replaying the chain on
+    hits padded by `reach` gives exactly the sequential result.
+    """
+
+    def __init__(self, pairs):
+        self.pairs = list(pairs)
+        self.reach = self._cascade_reach(self.pairs)
+        self._automaton = None
+        if ahocorasick is not None and self.pairs:
+            self._automaton = ahocorasick.Automaton()
+            for old, _ in self.pairs:
+                self._automaton.add_word(old, len(old))
+            self._automaton.make_automaton()
+
+    @staticmethod
+    def _cascade_reach(pairs) -> int:
+        reach = []
+        for index, (old, _) in enumerate(pairs):
+            best = 0
+            for earlier in range(index):
+                # A match of `old` can be created by an earlier output it overlaps
+                if _can_overlap(pairs[earlier][1], old):
+                    best = max(best, reach[earlier] + len(old) - 1)
+            reach.append(best)
+        return max(reach, default=0)
+
+    def apply_sequential(self, text: str) -> str:
+        """Reference implementation - one full scan per pair"""
+        for old, new in self.pairs:
+            text = text.replace(old, new)
+        return text
+
+    def apply(self, text: str) -> str:
+        if self._automaton is None:
+            return self.apply_sequential(text)
+        
+        # Single scan: collect every hit padded by the cascade reach
+        windows = []
+        for end, size in self._automaton.iter(text):
+            windows.append((max(end + 1 - size - self.reach, 0), end + 1 + self.reach))
+        if not windows:
+            return text
+        windows.sort()
+        
+        # Merge overlapping windows and replay the chain inside each one
+        parts = []
+        last = 0
+        start, stop = windows[0]
+        for next_start, next_stop in windows[1:]:
+            if next_start <= stop:
+                stop = max(stop, next_stop)
+                continue
+            parts.append(text[last:start])
+            parts.append(self.apply_sequential(text[start:stop]))
+            last = stop
+            start, stop = next_start, next_stop
+        parts.append(text[last:start])
+        parts.append(self.apply_sequential(text[start:stop]))
+        parts.append(text[stop:])
+        return ''.join(parts)
+
+
+SPECIFIC_FIXES_CHAIN = ReplacementChain(SPECIFIC_FIXES)
+REPLACEMENTS_CHAIN = ReplacementChain(REPLACEMENTS.items())
@@ -0,0 +1,106 @@
+"""
+Direct slide-XML PPTX extraction
+
+Reads only the presentation part (for slide order) and the requested
+ppt/slides/slideN.xml parts from the archive, so images, media, layouts and
+masters are never loaded. Text follows python-pptx's rules: every top-level
+p:sp shape of the slide's shape tree contributes its text frame, paragraphs
+joined with newlines, runs and fields concatenated and line breaks as "\\v".
+Packages this reader can't resolve raise UnsupportedPptx so the caller can
+fall back to python-pptx.
+"""
+
+import posixpath
+import xml.etree.ElementTree as ET
+import zipfile
+from typing import Optional
+
+A = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+P = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+R = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PACKAGE_RELS = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+
+class UnsupportedPptx(Exception):
+    """The package has a structure the slide-XML reader doesn't handle"""
+
+
+def _relationships(archive: zipfile.ZipFile, part: str) -> dict:
+    """Relationship id -> (type, target part name) for a part"""
+    directory, name = posixpath.split(part)
+    try:
+        rels = ET.fromstring(archive.read(posixpath.join(directory, '_rels', name + '.rels')))
+    except KeyError:
+        return {}
+    targets = {}
+    for relationship in rels.iter(PACKAGE_RELS):
+        if relationship.get('TargetMode') == 'External':
+            continue
+        target = relationship.get('Target', '')
+        target = target.lstrip('/') if target.startswith('/') else posixpath.join(directory, target)
+        targets[relationship.get('Id')] = (relationship.get('Type'), posixpath.normpath(target))
+    return targets
+
+
+def slide_parts(archive: zipfile.ZipFile) -> list:
+    """Part names of the slides in presentation order"""
+    main_part = next((target for kind, target in _relationships(archive, '').values()
+                      if kind == OFFICE_DOCUMENT), None)
+    if main_part is None:
+        raise UnsupportedPptx("package has no main presentation")
+    presentation = ET.fromstring(archive.read(main_part))
+    targets = _relationships(archive, main_part)
+    slide_ids = presentation.find(P + 'sldIdLst')
+    if slide_ids is None:
+        return []
+    try:
+        return [targets[slide_id.get(R + 'id')][1] for slide_id in slide_ids.iterfind(P + 'sldId')]
+    except KeyError:
+        raise UnsupportedPptx("slide relationship missing")
+
+
+def paragraph_text(paragraph) -> str:
+    parts = []
+    for child in paragraph:
+        if child.tag == A + 'r' or child.tag == A + 'fld':
+            text = child.find(A + 't')
+            parts.append((text.text or '') if text is not None else '')
+        elif child.tag == A + 'br':
+            parts.append('\v')
+    return ''.join(parts)
+
+
+def shape_texts(slide_xml: bytes) -> list:
+    """Stripped, non-empty text of every top-level text shape, in shape-tree order"""
+    slide = ET.fromstring(slide_xml)
+    tree = slide.find(f'{P}cSld/{P}spTree')
+    if tree is None:
+        return []
+    texts = []
+    for shape in tree.iterfind(P + 'sp'):
+        body = shape.find(P + 'txBody')
+        if body is None:
+            continue
+        text = '\n'.join(paragraph_text(paragraph) for paragraph in body.iterfind(A + 'p')).strip()
+        if text:
+            texts.append(text)
+    return texts
+
+
+def slide_text(slide_xml: bytes, slide_num: int) -> str:
+    """Slide text in the service's "Slide N: ..." format ('' for a slide without text)"""
+    texts = shape_texts(slide_xml)
+    return f"Slide {slide_num}: " + ' '.join(texts) if texts else ''
+
+
+def extract_slides(file_path: str, start: int = 0, stop: Optional[int] = None) -> tuple:
+    """Text of slides [start, stop) ('' for slides without text) plus the slide count"""
+    with zipfile.ZipFile(file_path) as archive:
+        parts = slide_parts(archive)
+        total = len(parts)
+        stop = total if stop is None else min(stop, total)
+        try:
+            return [slide_text(archive.read(parts[i]), i + 1) for i in range(start, stop)], total
+        except KeyError:
+            raise UnsupportedPptx("slide part missing")
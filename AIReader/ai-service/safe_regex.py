@@ -0,0 +1,59 @@
+"""
+Regex compilation with an optional linear-time engine
+
+Every pattern on the PDF repair and code analysis paths is written so that
+Python's backtracking engine stays linear in the input (bounded quantifiers,
+anchored runs, unambiguous repeats). Setting AI_REGEX_ENGINE=re2 additionally
+compiles them with RE2 (pip install google-re2), whose matching time is
+guaranteed linear for any input. Patterns RE2 can't express, such as
+lookarounds, fall back to the rewritten Python pattern.
+
+Note that RE2 treats \\w, \\s, \\d and \\b as ASCII-only, so text with accented
+letters or non-breaking spaces can be repaired slightly differently in re2 mode,
+and that the google-re2 binding has a high per-match cost, so re2 mode is slower
+on ordinary text with many matches. Use it where a hard bound matters more.
+"""
+
+import os
+import re
+from functools import lru_cache
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# 're' (default) or 're2'
+ENGINE = os.environ.get("AI_REGEX_ENGINE", "re").lower()
+
+if ENGINE not in ('re', 're2'):
+    raise ValueError(f"AI_REGEX_ENGINE must be 're' or 're2', got {ENGINE!r}")
+if ENGINE == 're2' and re2 is None:
+    raise ImportError("AI_REGEX_ENGINE=re2 requires the google-re2 package")
+
+# Python flags RE2 understands, as inline modifiers
+INLINE_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'))
+
+# Lookarounds are the Python-only syntax used here; skip RE2 for them instead of letting it log a parse error
+LOOKAROUND = re.compile(r'\(\?<?[=!]')
+
+# Patterns that were compiled with re although re2 mode is on
+fallbacks = []
+
+
+def compile(pattern: str, flags: int = 0):
+    """Compile with RE2 in re2 mode when the pattern allows it, otherwise with re"""
+    if ENGINE == 're2' and not LOOKAROUND.search(pattern):
+        inline = ''.join(letter for flag, letter in INLINE_FLAGS if flags & flag)
+        try:
+            return re2.compile(f"(?{inline}){pattern}" if inline else pattern)
+        except re2.error:
+            fallbacks.append(pattern)
+    return re.compile(pattern, flags)
+
+
+
+@lru_cache(maxsize=None)
+def cached(pattern: str, flags: int = 0):
+    """compile() memoized, for patterns written inline at their call site"""
+    return compile(pattern, flags)
@@ -0,0 +1,111 @@
+"""
+Sampled structured logging
+
+Log records are written as one JSON object per line by a background thread
+(QueueHandler -> QueueListener), so request handlers never block on stdout.
+Routine INFO/DEBUG records are sampled per request at AI_LOG_SAMPLE_RATE
+(every line of a sampled request is kept, the others are dropped); warnings,
+errors and records outside any request (startup, shutdown) are always logged.
+"""
+
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+
+SAMPLE_RATE = float(os.environ.get("AI_LOG_SAMPLE_RATE", 0.05))
+LOG_LEVEL = os.environ.get("AI_LOG_LEVEL", "INFO").upper()
+
+# Whether the current request's routine records are kept (None outside a request)
+_sampled = contextvars.ContextVar("log_sampled", default=None)
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SampleFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        sampled = _sampled.get()
+        return sampled if sampled is not None else True
+
+
+def sample_request() -> contextvars.Token:
+    """Decide once per request whether its routine log lines are kept"""
+    return _sampled.set(random.random() < SAMPLE_RATE)
+
+
+def end_request(token: contextvars.Token) -> None:
+    _sampled.reset(token)
+
+
+class SamplingMiddleware:
+    """ASGI middleware that makes the sampling decision at the start of every request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = sample_request()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            end_request(token)
+
+
+def setup_logging() -> None:
+    """Route the service's loggers through the sampled, non-blocking JSON handler (idempotent)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    records = queue.SimpleQueue()
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter())
+    _listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+
+    handler = logging.handlers.QueueHandler(records)
+    handler.addFilter(SampleFilter())
+    logger = logging.getLogger("ai_service")
+    logger.setLevel(LOG_LEVEL)
+    logger.addHandler(handler)
+    logger.propagate = False
+
+
+def shutdown_logging() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(f"ai_service.{name}")
+
+
+def log_fields(**fields) -> dict:
+    """extra= argument that adds fields to the JSON record: logger.info("msg", extra=log_fields(path=...))"""
+    return {"fields": fields}
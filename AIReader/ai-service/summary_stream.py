@@ -0,0 +1,147 @@
+"""
+Streaming summary input
+
+SummaryCollector consumes a document as text chunks (pages, file chunks or
+slices of one string) and keeps only what the summarizer actually reads: the
+leading meaningful sentences, the first few sentences matching the structure
+and technical vocabularies, the first context sentences past the lead, the
+document-level keyword hits and a few counters. Memory is bounded by those
+candidates plus the longest single sentence, not by the document.
+
+The result equals running the summarizer's preparation on the whole text at
+once: whitespace runs collapse to single spaces, slide/page markers and the
+noise phrases are removed, and the text is split into sentences on '.'. None
+of the removal patterns can match a '.', so text up to the last '.' seen is
+cleaned and split as soon as it arrives while the unfinished sentence waits
+for the next chunk.
+"""
+
+import re
+from typing import Iterable, Optional
+
+# Removed in this order, each pass over the result of the previous one
+CLEANUP_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in
+                    (r'slide \d+:', r'page \d+', 'roll no', 'session 20', 'semester')]
+
+# Sentences with at least this many words count as meaningful
+MIN_SENTENCE_WORDS = 3
+
+# Raw documents shorter than this are returned as they are
+MIN_SUMMARY_CHARS = 100
+
+# The summarizer never reads past these
+LEADING_SENTENCES = 20
+HEAD_CHARS = 1000
+PICKED_SENTENCES = 2
+
+
+def clean(text: str) -> str:
+    for pattern in CLEANUP_PATTERNS:
+        text = pattern.sub('', text)
+    return text
+
+
+class SummaryCollector:
+    """
+    Feed chunks in order (separators included: chunks are concatenated as
+    they are), then call finish(). Sentence picks follow summarize_text:
+    structure sentences need more than 20 characters, technical ones more
+    than 40, and context sentences start at the 11th meaningful sentence
+    and need more than 25.
+    """
+
+    def __init__(self, keywords, structure, technical, context_start: int = 10):
+        self.keywords = keywords
+        self.structure_matcher = structure
+        self.technical_matcher = technical
+        self.context_start = context_start
+
+        self.raw_chars = 0
+        self.raw_head = ''
+        self.length = 0
+        self.head = ''
+        self.keyword_hits = {}
+        self.sentence_count = 0
+        self.leading = []
+        self.structure = []
+        self.technical = []
+        self.context = []
+
+        self._started = False
+        self._pending_space = False
+        self._lower_length = 0
+        self._tail = ''
+
+    def feed(self, chunk: str) -> 'SummaryCollector':
+        if not chunk:
+            return self
+        self.raw_chars += len(chunk)
+        if len(self.raw_head) < MIN_SUMMARY_CHARS:
+            self.raw_head += chunk[:MIN_SUMMARY_CHARS - len(self.raw_head)]
+
+        # ' '.join(text.split()) across chunk boundaries: a whitespace run becomes
+        # one space once the next word arrives, and is dropped at either end
+        words = chunk.split()
+        if words:
+            separator = ' ' if self._started and (self._pending_space or chunk[0].isspace()) else ''
+            self._tail += separator + ' '.join(words)
+            self._started = True
+        self._pending_space = chunk[-1].isspace()
+
+        cut = self._tail.rfind('.')
+        if cut >= 0:
+            block, self._tail = self._tail[:cut + 1], self._tail[cut + 1:]
+            self._add_block(block, final=False)
+        return self
+
+    def finish(self) -> 'SummaryCollector':
+        if self._tail:
+            tail, self._tail = self._tail, ''
+            self._add_block(tail, final=True)
+        return self
+
+    @property
+    def raw_text(self) -> Optional[str]:
+        """The whole raw document when it is too short to summarize, else None"""
+        return self.raw_head if self.raw_chars < MIN_SUMMARY_CHARS else None
+
+    def _add_block(self, block: str, final: bool) -> None:
+        block = clean(block)
+        self.length += len(block)
+        if len(self.head) < HEAD_CHARS:
+            self.head += block[:HEAD_CHARS - len(self.head)]
+
+        lowered = block.lower()
+        for keyword, position in self.keywords.scan(lowered).items():
+            self.keyword_hits.setdefault(keyword, self._lower_length + position)
+        self._lower_length += len(lowered)
+
+        sentences = block.split('.')
+        if not final:
+            # The block ends with '.', so the last piece is the empty start of the next sentence
+            sentences.pop()
+        for sentence in sentences:
+            sentence = sentence.strip()
+            if sentence and len(sentence.split()) >= MIN_SENTENCE_WORDS:
+                self._add_sentence(sentence)
+
+    def _add_sentence(self, sentence: str) -> None:
+        index = self.sentence_count
+        self.sentence_count += 1
+        if index < LEADING_SENTENCES:
+            self.leading.append(sentence)
+        if (len(self.structure) < PICKED_SENTENCES and len(sentence) > 20
+                and self.structure_matcher.search(sentence.lower())):
+            self.structure.append(sentence)
+        if (len(self.technical) < PICKED_SENTENCES and len(sentence) > 40
+                and self.technical_matcher.search(sentence.lower())):
+            self.technical.append(sentence)
+        if index >= self.context_start and len(self.context) < PICKED_SENTENCES and len(sentence) > 25:
+            self.context.append(sentence)
+
+
+def collect(chunks: Iterable[str], keywords, structure, technical) -> SummaryCollector:
+    collector = SummaryCollector(keywords, structure, technical)
+    for chunk in chunks:
+        collector.feed(chunk)
+    return collector.finish()
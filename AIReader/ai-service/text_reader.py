@@ -0,0 +1,84 @@
+"""
+Large text and code file reading
+
+Files are memory-mapped and decoded straight from the mapping, so reading a
+file costs one decoded string instead of the raw bytes plus the string. The
+encoding is detected from a sampled prefix (byte order mark, then UTF-8,
+otherwise Windows-1252), undecodable bytes become U+FFFD instead of failing
+the request, and line endings are normalized to "\\n" like text-mode open().
+iter_text yields the same text in bounded chunks for consumers that can work
+incrementally: the summarizer reads text files through it, so summarizing a
+large file never builds the whole string. Files over AI_MAX_TEXT_BYTES are
+rejected with TextTooLarge.
+"""
+
+import codecs
+import io
+import mmap
+import os
+from typing import Iterator, Optional
+
+MAX_TEXT_BYTES = int(os.environ.get("AI_MAX_TEXT_BYTES", 256 * 1024 * 1024))
+
+# Prefix used for encoding detection and the chunk size of iter_text
+SAMPLE_BYTES = 64 * 1024
+CHUNK_CHARS = 1024 * 1024
+
+# UTF-32 first: its little-endian BOM starts with the UTF-16 one
+BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+class TextTooLarge(Exception):
+    def __init__(self, size: int, limit: int):
+        super().__init__(f"File is {size} bytes, the limit for text files is {limit} bytes")
+        self.size = size
+        self.limit = limit
+
+
+def detect_encoding(sample: bytes) -> str:
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        # Not final: a multi-byte character cut off by the end of the sample is fine
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp1252'
+
+
+def check_size(file_path: str, max_bytes: Optional[int] = None) -> int:
+    size = os.path.getsize(file_path)
+    limit = MAX_TEXT_BYTES if max_bytes is None else max_bytes
+    if size > limit:
+        raise TextTooLarge(size, limit)
+    return size
+
+
+def read_text(file_path: str, max_bytes: Optional[int] = None) -> str:
+    """Whole file as one string, decoded from a memory mapping"""
+    if check_size(file_path, max_bytes) == 0:
+        return ''
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+        encoding = detect_encoding(mapping[:SAMPLE_BYTES])
+        text = codecs.decode(mapping, encoding, 'replace')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def iter_text(file_path: str, chunk_chars: int = CHUNK_CHARS, max_bytes: Optional[int] = None) -> Iterator[str]:
+    """The text of read_text in chunks of at most chunk_chars characters"""
+    check_size(file_path, max_bytes)
+    with open(file_path, 'rb') as file:
+        encoding = detect_encoding(file.read(SAMPLE_BYTES))
+        file.seek(0)
+        with io.TextIOWrapper(file, encoding=encoding, errors='replace', newline=None) as text_file:
+            for chunk in iter(lambda: text_file.read(chunk_chars), ''):
+                yield chunk
@@ -0,0 +1,159 @@
+"""
+TF-IDF extractive summarization
+
+The alternative summary engine (AI_SUMMARIZER=tfidf). It uses no keyword
+lists and no fixed sentence positions. The document is split into sentences
+and every distinct sentence becomes a sparse TF-IDF row: sublinear term frequency
+times smoothed inverse sentence frequency, normalized to unit length. Each
+sentence is scored by its cosine similarity to the document centroid in one
+vectorized pass over the nonzero entries. The best sentences are popped from
+a heap until the summary reaches its target length, and are returned in
+document order. Repeated sentences are scored once, so boilerplate repeated
+on every page neither dominates the centroid nor fills the summary.
+
+summarize_batch puts many documents into one matrix, so a batch costs a
+fixed number of NumPy calls rather than a pass per document. Everything runs
+locally on NumPy; nothing is downloaded.
+"""
+
+import heapq
+import re
+from array import array
+
+import numpy as np
+
+from summary_stream import MIN_SUMMARY_CHARS, clean
+
+# Bump whenever the output changes so stale stored summaries are never served
+VERSION = 2
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n\s*\n')
+TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:['-][a-z0-9]+)*")
+
+# Shorter sentences are headings or fragments; longer ones are usually tables or run-together extraction output
+MIN_SENTENCE_WORDS = 4
+MAX_SENTENCE_CHARS = 400
+
+# Summary length by document length, like the rule-based engine: (documents shorter than, target chars)
+TARGET_LENGTHS = ((1000, 400), (3000, 700), (6000, 1000))
+MAX_TARGET_LENGTH = 1300
+
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have having
+he her here hers herself him himself his how i if in into is it its itself just me more most my myself no
+nor not now of off on once only or other our ours ourselves out over own same she should so some such than
+that the their theirs them themselves then there these they this those through to too under until up very
+was we were what when where which while who whom why will with would you your yours yourself yourselves
+""".split())
+
+
+def target_length(document_chars: int) -> int:
+    for limit, target in TARGET_LENGTHS:
+        if document_chars < limit:
+            return target
+    return MAX_TARGET_LENGTH
+
+
+def split_sentences(text: str) -> list:
+    """
+    Whitespace-collapsed sentences with slide/page markers and noise phrases removed,
+    each distinct one (ignoring case) once, where it first appears
+    """
+    sentences = []
+    seen = set()
+    for piece in SENTENCE_BOUNDARY.split(text):
+        sentence = clean(' '.join(piece.split())).strip()
+        if len(sentence) <= MAX_SENTENCE_CHARS and len(sentence.split()) >= MIN_SENTENCE_WORDS:
+            lowered = sentence.lower()
+            if lowered not in seen:
+                seen.add(lowered)
+                sentences.append(sentence)
+    return sentences
+
+
+def sentence_scores(documents: list) -> list:
+    """
+    Cosine similarity of every sentence to its document's TF-IDF centroid,
+    one array per document, for a list of sentence lists
+    """
+    vocabulary = {}
+    terms = array('q')
+    lengths = array('q')
+    for sentences in documents:
+        for sentence in sentences:
+            ids = [vocabulary.setdefault(token, len(vocabulary))
+                   for token in TOKEN.findall(sentence.lower()) if token not in STOP_WORDS]
+            terms.extend(ids)
+            lengths.append(len(ids))
+
+    counts = np.array([len(sentences) for sentences in documents], dtype=np.int64)
+    row_count = int(counts.sum())
+    document_of_row = np.repeat(np.arange(len(documents)), counts)
+    width = max(len(vocabulary), 1)
+
+    # Sparse sentence x term counts as (row, term) pairs
+    rows = np.repeat(np.arange(row_count), np.frombuffer(lengths, dtype=np.int64))
+    pairs, term_frequency = np.unique(rows * width + np.frombuffer(terms, dtype=np.int64), return_counts=True)
+    rows, columns = pairs // width, pairs % width
+
+    # Sentences per (document, term) pair, and the inverse of the entry -> pair mapping
+    documents_of_entries = document_of_row[rows]
+    document_terms, pair_index, sentence_frequency = np.unique(documents_of_entries * width + columns,
+                                                               return_inverse=True, return_counts=True)
+    sentences_in_document = counts[documents_of_entries]
+    inverse_frequency = np.log((1 + sentences_in_document) / (1 + sentence_frequency[pair_index])) + 1
+    weights = (1 + np.log(term_frequency)) * inverse_frequency
+    weights /= np.sqrt(np.bincount(rows, weights * weights, minlength=row_count))[rows]
+
+    # Each document's centroid, then every sentence's dot product with it
+    centroid = np.bincount(pair_index, weights)
+    centroid_norm = np.sqrt(np.bincount(document_terms // width, centroid * centroid, minlength=len(documents)))
+    centroid_norm[centroid_norm == 0] = 1
+    scores = np.bincount(rows, weights * centroid[pair_index], minlength=row_count) / centroid_norm[document_of_row]
+    return np.split(scores, np.cumsum(counts)[:-1])
+
+
+def select(sentences: list, scores, target: int) -> str:
+    """Highest scoring sentences up to the target length, in document order"""
+    # Popped lazily (ties go to the earlier sentence): usually only a handful are needed
+    heap = [(-score, index) for index, score in enumerate(scores.tolist())]
+    heapq.heapify(heap)
+    chosen = []
+    length = 0
+    while heap and length < target:
+        index = heapq.heappop(heap)[1]
+        sentence = sentences[index]
+        # The best sentence always goes in; later ones only while the summary stays within 1.2x the target
+        if chosen and length + len(sentence) + 1 > target * 1.2:
+            continue
+        chosen.append(index)
+        length += len(sentence) + 1
+    return ' '.join(sentence if sentence[-1] in '.!?' else sentence + '.'
+                    for sentence in (sentences[index] for index in sorted(chosen)))
+
+
+def summarize_batch(texts: list) -> list:
+    """Summaries of many documents, scored together in one matrix"""
+    summaries = [None] * len(texts)
+    pending = []
+    documents = []
+    for position, text in enumerate(texts):
+        if not text or len(text) < MIN_SUMMARY_CHARS:
+            summaries[position] = text
+            continue
+        sentences = split_sentences(text)
+        if not sentences:
+            summaries[position] = clean(' '.join(text[:2 * MAX_TARGET_LENGTH].split()))[:1000]
+            continue
+        pending.append(position)
+        documents.append(sentences)
+
+    if documents:
+        for position, sentences, scores in zip(pending, documents, sentence_scores(documents)):
+            summaries[position] = select(sentences, scores, target_length(len(texts[position])))
+    return summaries
+
+
+def summarize(text: str) -> str:
+    return summarize_batch([text])[0]
@@ -0,0 +1,158 @@
+"""
+Worker pools for blocking work
+
+CPU-bound extraction and analysis run in a process pool and network-bound
+TTS runs in a thread pool, so the event loop (and the / health check) stays
+responsive while documents are being processed. Each pool has a bounded
+number of pending jobs; once it is full new work is rejected with 503 so
+clients back off instead of piling up behind one slow document. CPU jobs
+also get a CPU-time budget (see deadline.py) so one hostile document can't
+pin a core indefinitely.
+
+Worker processes are started by a fork server (spawned where there is none),
+never forked from the service itself: by the time the first CPU job arrives
+the service already runs I/O, TTS and logging threads, and a child forked
+from a multi-threaded process can inherit a lock (logging, SQLite) that one
+of those threads held and deadlock on it.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException
+
+import metrics
+from deadline import DeadlineExceeded, cpu_budget
+
+
+class PoolBusy(HTTPException):
+    """A pool's pending-job limit was reached; callers that can wait may retry after a pause"""
+
+    def __init__(self, name: str):
+        super().__init__(
+            status_code=503,
+            detail=f"Service busy ({name} queue full), please retry",
+            headers={"Retry-After": "1"},
+        )
+
+
+def _call(func, args, budget_seconds=None):
+    """
+    Runs inside a worker - HTTPException doesn't pickle, so send it back as data,
+    together with the stage timings and counts the job recorded
+    """
+    with metrics.job_recording() as collector:
+        try:
+            with cpu_budget(budget_seconds):
+                return False, func(*args), collector
+        except HTTPException as e:
+            return True, (e.status_code, e.detail), collector
+        except DeadlineExceeded as e:
+            return True, (422, str(e)), collector
+
+
+class _BoundedExecutor:
+    """Executor wrapper that tracks pending jobs and rejects work past its limit"""
+
+    def __init__(self, name: str, factory, max_pending: int, budget_seconds: Optional[float] = None):
+        self.name = name
+        self.max_pending = max_pending
+        self.budget_seconds = budget_seconds
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._factory = factory
+        self._executor = None
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = self._factory()
+        return self._executor
+
+    async def run(self, func, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PoolBusy(self.name)
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            failed, value, collector = await loop.run_in_executor(self.executor, _call, func, args, self.budget_seconds)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+        metrics.record_job(collector)
+
+        if failed:
+            status_code, detail = value
+            raise HTTPException(status_code=status_code, detail=detail)
+        return value
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "maxPending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def process_context():
+    """Start method for worker processes: a clean fork server, or spawn where there is none (Windows)"""
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+class WorkerPool:
+    """
+    Process pool for CPU-bound work plus thread pool for I/O-bound work
+    Set cpu_workers to 0 to run CPU work on threads (e.g. under --reload on Windows)
+    Each CPU job may use at most cpu_budget seconds of CPU time (None for no limit)
+    """
+
+    def __init__(self, cpu_workers: Optional[int] = None, io_workers: int = 8,
+                 max_pending: Optional[int] = None, cpu_budget: Optional[float] = None):
+        if cpu_workers is None:
+            cpu_workers = os.cpu_count() or 1
+        self.cpu_workers = cpu_workers
+        self.io_workers = io_workers
+
+        if cpu_workers > 0:
+            cpu_factory = lambda: ProcessPoolExecutor(max_workers=cpu_workers, mp_context=process_context())
+        else:
+            cpu_factory = lambda: ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="cpu")
+        io_factory = lambda: ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="io")
+
+        self.cpu = _BoundedExecutor("cpu", cpu_factory, max_pending or max(cpu_workers, 1) * 4, cpu_budget)
+        self.io = _BoundedExecutor("io", io_factory, max_pending or io_workers * 4)
+
+    async def run_cpu(self, func, *args):
+        """Run a picklable module-level function in the process pool"""
+        return await self.cpu.run(func, *args)
+
+    async def run_io(self, func, *args):
+        """Run a blocking I/O function in the thread pool"""
+        return await self.io.run(func, *args)
+
+    def stats(self) -> dict:
+        return {
+            "cpuWorkers": self.cpu_workers,
+            "ioWorkers": self.io_workers,
+            "cpuBudgetSeconds": self.cpu.budget_seconds,
+            "cpu": self.cpu.stats(),
+            "io": self.io.stats(),
+        }
+
+    def shutdown(self):
+        self.cpu.shutdown()
+        self.io.shutdown()
@@ -13,7 +13,6 @@ const PORT = process.env.PORT || 5002;
 app.use(cors());
 app.use(express.json());
 app.use('/uploads', express.static('uploads'));
-app.use('/audio', express.static(path.join(__dirname, '../ai-service/audio')));
 
 // Serve static files from frontend build (for production)
 if (process.env.NODE_ENV === 'production') {
@@ -49,7 +48,79 @@ const upload = multer({
   }
 });
 
+// Long-running AI work is submitted as a job and polled until it finishes, so a big
+// document never holds one request open; resubmitting the same work reuses the job
+const AI_SERVICE_URL = 'http://localhost:8001';
+const JOB_POLL_INTERVAL_MS = 500;
+// A job that hasn't finished by then (or a service that stopped answering) fails the request
+const JOB_TIMEOUT_MS = Number(process.env.AI_JOB_TIMEOUT_MS) || 10 * 60 * 1000;
+const JOB_MAX_POLLS = Math.ceil(JOB_TIMEOUT_MS / JOB_POLL_INTERVAL_MS);
+
+async function runAiJob(endpoint, payload) {
+  const deadline = Date.now() + JOB_TIMEOUT_MS;
+  // Every request is bounded by what is left of the deadline, so a hung service can't outlast it
+  const remaining = () => Math.max(deadline - Date.now(), 1);
+  const { data: job } = await axios.post(`${AI_SERVICE_URL}/jobs/${endpoint}`, payload, { timeout: remaining() });
+  for (let poll = 0; poll < JOB_MAX_POLLS && Date.now() < deadline; poll++) {
+    let status;
+    try {
+      ({ data: status } = await axios.get(`${AI_SERVICE_URL}/jobs/${job.jobId}`, { timeout: remaining() }));
+    } catch (error) {
+      if (error.response && error.response.status === 404) {
+        // Purged, or the service lost its job database - it will never finish
+        throw new Error(`AI job ${job.jobId} no longer exists`);
+      }
+      throw error;
+    }
+    if (status.status === 'succeeded') {
+      return status.result;
+    }
+    if (status.status === 'failed') {
+      throw new Error(status.error || 'AI job failed');
+    }
+    await new Promise((resolve) => setTimeout(resolve, Math.min(JOB_POLL_INTERVAL_MS, remaining())));
+  }
+  throw new Error(`AI job ${job.jobId} did not finish within ${JOB_TIMEOUT_MS / 1000}s`);
+}
+
+// Headers passed through to and from the AI service's audio route, which tracks use
+// (so the cache sweeper keeps files being played) and answers conditional and range requests
+const AUDIO_REQUEST_HEADERS = ['range', 'if-none-match', 'if-range'];
+const AUDIO_RESPONSE_HEADERS = ['content-type', 'content-length', 'content-range', 'accept-ranges', 'etag', 'cache-control'];
+
 // Routes
+app.get('/audio/:name', async (req, res) => {
+  const headers = {};
+  for (const name of AUDIO_REQUEST_HEADERS) {
+    if (req.headers[name] !== undefined) {
+      headers[name] = req.headers[name];
+    }
+  }
+  try {
+    const upstream = await axios({
+      method: req.method === 'HEAD' ? 'head' : 'get',
+      url: `${AI_SERVICE_URL}/audio/${encodeURIComponent(req.params.name)}`,
+      headers,
+      responseType: 'stream',
+      decompress: false,
+      // 206, 304, 404 and 416 are passed on as they are
+      validateStatus: () => true,
+    });
+    res.status(upstream.status);
+    for (const name of AUDIO_RESPONSE_HEADERS) {
+      if (upstream.headers[name] !== undefined) {
+        res.set(name, upstream.headers[name]);
+      }
+    }
+    // Stop reading the file when the player goes away (seeking aborts the previous request)
+    res.on('close', () => upstream.data.destroy());
+    upstream.data.pipe(res);
+  } catch (error) {
+    console.error('Audio proxy error:', error.message);
+    res.status(502).json({ error: 'AI service unavailable' });
+  }
+});
+
 app.get('/', (req, res) => {
   res.json({ 
     message: 'AI Document Reader API is running!',
@@ -80,7 +151,7 @@ app.post('/api/upload', upload.single('file'), async (req, res) => {
       const absolutePath = path.resolve(req.file.path);
       console.log('Sending to AI service:', absolutePath);
       
-      const aiResponse = await axios.post('http://localhost:8001/process-file', {
+      const aiData = await runAiJob('process-file', {
         filePath: absolutePath,
         fileName: req.file.originalname,
         fileType: path.extname(req.file.originalname).toLowerCase()
@@ -91,7 +162,7 @@ app.post('/api/upload', upload.single('file'), async (req, res) => {
       res.json({
         success: true,
         file: fileInfo,
-        aiData: aiResponse.data
+        aiData
       });
     } catch (aiError) {
       console.error('AI service error:', aiError.message);
@@ -127,14 +198,14 @@ app.post('/api/get-content', async (req, res) => {
       const absolutePath = path.resolve(filePath);
       console.log('Getting content from:', absolutePath);
       
-      const response = await axios.post('http://localhost:8001/get-content', {
+      const content = await runAiJob('get-content', {
         filePath: absolutePath,
         contentType
       });
 
       console.log('Content retrieved successfully');
 
-      res.json(response.data);
+      res.json(content);
     } catch (aiError) {
       console.error('AI service error:', aiError.message);
       res.status(500).json({ error: 'Failed to process content with AI service' });
@@ -154,7 +225,7 @@ app.post('/api/generate-audio', async (req, res) => {
 
     // Call AI service to generate audio
     try {
-      const response = await axios.post('http://localhost:8001/generate-audio', {
+      const audio = await runAiJob('generate-audio', {
         text,
         language
       });
@@ -162,12 +233,12 @@ app.post('/api/generate-audio', async (req, res) => {
       console.log('Audio generated successfully');
 
       // Replace localhost URL with backend URL for production
-      if (response.data.audioUrl) {
-        const audioFileName = response.data.audioUrl.split('/').pop();
-        response.data.audioUrl = `/audio/${audioFileName}`;
+      if (audio.audioUrl) {
+        const audioFileName = audio.audioUrl.split('/').pop();
+        audio.audioUrl = `/audio/${audioFileName}`;
       }
 
-      res.json(response.data);
+      res.json(audio);
     } catch (aiError) {
       console.error('AI service error:', aiError.message);
       res.status(500).json({ error: 'Failed to generate audio with AI service' });